@@ -1,4 +1,6 @@
 import { Link } from 'wouter';
+import { canonicalImage } from '@/lib/imageCanonical';
+import { placeholderStyle } from '@/lib/imagePlaceholders';
 
 interface Category {
   name: string;
@@ -64,9 +66,10 @@ export function CategoriesCarousel({
                 <div className="flex flex-col items-center group cursor-pointer min-w-[140px] snap-center">
                   <div className="w-32 h-32 mb-4 overflow-hidden rounded-full border-4 border-white group-hover:border-blue-500 transition-all duration-300 bg-white">
                     <img
-                      src={`/images/${cat.img}`}
+                      src={canonicalImage(`/images/${cat.img}`)}
                       alt={cat.alt || cat.name}
                       loading="lazy"
+                      style={placeholderStyle(`/images/${cat.img}`)}
                       width="128"
                       height="128"
                       className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-500"
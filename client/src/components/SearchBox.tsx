@@ -0,0 +1,111 @@
+import { FormEvent, useEffect, useState } from "react";
+import { useLocation } from "wouter";
+import { Search } from "lucide-react";
+import { search, SearchResult } from "@/lib/searchIndex";
+
+interface SearchBoxProps {
+  placeholder?: string;
+  className?: string;
+  inputClassName?: string;
+  buttonClassName?: string;
+  autoFocus?: boolean;
+  /** Se llama al ir a un resultado (p. ej. para cerrar la barra móvil) */
+  onNavigate?: () => void;
+}
+
+const KIND_LABELS: Record<SearchResult["kind"], string> = {
+  category: "Categoría",
+  woo_category: "Categoría",
+  product: "Producto",
+};
+
+export function SearchBox({
+  placeholder = "Buscar...",
+  className = "",
+  inputClassName = "",
+  buttonClassName = "",
+  autoFocus = false,
+  onNavigate,
+}: SearchBoxProps) {
+  const [, setLocation] = useLocation();
+  const [query, setQuery] = useState("");
+  const [results, setResults] = useState<SearchResult[]>([]);
+  const [open, setOpen] = useState(false);
+
+  // El índice se carga la primera vez que se escribe algo; si llega una respuesta
+  // de una consulta anterior, se descarta
+  useEffect(() => {
+    if (!query.trim()) {
+      setResults([]);
+      return;
+    }
+    let current = true;
+    search(query, 12)
+      .then(found => {
+        // Las categorías de WooCommerce sin página propia no llevan a ningún sitio
+        if (current) setResults(found.filter(result => result.url).slice(0, 8));
+      })
+      .catch(error => console.error("Error en la búsqueda:", error));
+    return () => {
+      current = false;
+    };
+  }, [query]);
+
+  const go = (url: string) => {
+    setQuery("");
+    setOpen(false);
+    onNavigate?.();
+    setLocation(url);
+  };
+
+  const handleSubmit = (e: FormEvent) => {
+    e.preventDefault();
+    if (results.length > 0) go(results[0].url!);
+  };
+
+  return (
+    <form className={`relative flex items-center w-full ${className}`} onSubmit={handleSubmit} role="search">
+      <input
+        type="text"
+        name="search"
+        value={query}
+        placeholder={placeholder}
+        autoFocus={autoFocus}
+        autoComplete="off"
+        aria-label="Buscar"
+        onChange={e => {
+          setQuery(e.target.value);
+          setOpen(true);
+        }}
+        onFocus={() => setOpen(true)}
+        onBlur={() => setOpen(false)}
+        onKeyDown={e => e.key === "Escape" && setOpen(false)}
+        className={inputClassName}
+      />
+      <button type="submit" className={buttonClassName} aria-label="Buscar">
+        <Search size={16} />
+      </button>
+
+      {open && results.length > 0 && (
+        <ul className="absolute left-0 right-0 top-full mt-2 bg-white border border-slate-200 rounded-lg shadow-lg z-50 overflow-hidden text-left">
+          {results.map(result => (
+            <li key={result.url}>
+              {/* onMouseDown: se navega antes de que el blur cierre la lista */}
+              <button
+                type="button"
+                onMouseDown={e => {
+                  e.preventDefault();
+                  go(result.url!);
+                }}
+                className="w-full flex items-center justify-between gap-4 px-4 py-2 text-sm text-slate-700 hover:bg-slate-50"
+              >
+                <span className="truncate">{result.label}</span>
+                <span className="text-xs text-slate-400 shrink-0">{KIND_LABELS[result.kind]}</span>
+              </button>
+            </li>
+          ))}
+        </ul>
+      )}
+    </form>
+  );
+}
@@ -5,6 +5,7 @@ import { Phone, Mail, Menu, Search, ShoppingBag, X } from "lucide-react";
 import { useState } from "react";
 import { Button } from "@/components/ui/button";
 import { MegaMenu, menuData } from "@/components/MegaMenu";
+import { SearchBox } from "@/components/SearchBox";
 import { ChevronDown, ChevronUp } from "lucide-react";
 import { useExternalScripts } from "@/hooks/useExternalScripts";
 import { useAuth } from "@/context/AuthContext";
@@ -164,21 +165,13 @@ export function MainLayout({ children }: MainLayoutProps) {
         {/* Mobile Search Bar */}
         {isSearchOpen && (
           <div className="xl:hidden bg-white border-t border-slate-100 p-4 absolute w-full left-0 shadow-md z-40 animate-in slide-in-from-top-2">
-            <form className="relative flex items-center w-full" onSubmit={(e) => { e.preventDefault(); setIsSearchOpen(false); }}>
-              <input 
-                type="text" 
-                name="search" 
-                placeholder="Buscar productos..." 
-                autoFocus
-                className="w-full h-12 pl-4 pr-12 rounded-lg border border-slate-200 bg-slate-50 outline-none focus:border-blue-500 focus:ring-1 focus:ring-blue-500 transition-all"
-              />
-              <button 
-                type="submit" 
-                className="absolute right-2 top-2 bottom-2 w-8 h-8 bg-blue-500 text-white rounded-md flex items-center justify-center hover:bg-blue-600 transition-colors"
-              >
-                <Search size={16} />
-              </button>
-            </form>
+            <SearchBox
+              placeholder="Buscar productos..."
+              autoFocus
+              onNavigate={() => setIsSearchOpen(false)}
+              inputClassName="w-full h-12 pl-4 pr-12 rounded-lg border border-slate-200 bg-slate-50 outline-none focus:border-blue-500 focus:ring-1 focus:ring-blue-500 transition-all"
+              buttonClassName="absolute right-2 top-2 bottom-2 w-8 h-8 bg-blue-500 text-white rounded-md flex items-center justify-center hover:bg-blue-600 transition-colors"
+            />
           </div>
         )}
 
@@ -0,0 +1,52 @@
+/**
+ * Carga de páginas de categoría desde los bundles por sección
+ * (generados por scripts/category_bundles.py).
+ *
+ * Cada bundle agrupa las páginas de una sección y guarda una sola vez los
+ * bloques repetidos (ventajasEmpresa, faq...), referenciados como {"$shared": id}.
+ */
+
+import type { SeoCategoryData } from "@shared/types";
+import bundleIndex from "@/data/category-bundle-index.json";
+
+interface SharedRef {
+  $shared: string;
+}
+
+interface CategoryBundle {
+  shared: Record<string, unknown>;
+  pages: Record<string, Record<string, unknown>>;
+}
+
+const sectionBySlug = bundleIndex as Record<string, string>;
+const bundles = new Map<string, Promise<CategoryBundle>>();
+
+function isSharedRef(value: unknown): value is SharedRef {
+  return typeof value === "object" && value !== null && "$shared" in value;
+}
+
+function loadBundle(section: string): Promise<CategoryBundle> {
+  let bundle = bundles.get(section);
+  if (!bundle) {
+    bundle = import(`../data/category-bundles/${section}.json`).then(
+      module => module.default as CategoryBundle
+    );
+    bundles.set(section, bundle);
+  }
+  return bundle;
+}
+
+export async function loadCategoryPage(slug: string): Promise<SeoCategoryData | undefined> {
+  const section = sectionBySlug[slug];
+  if (!section) return undefined;
+
+  const bundle = await loadBundle(section);
+  const page = bundle.pages[slug];
+  if (!page) return undefined;
+
+  const resolved: Record<string, unknown> = {};
+  for (const [field, value] of Object.entries(page)) {
+    resolved[field] = isSharedRef(value) ? bundle.shared[value.$shared] : value;
+  }
+  return resolved as unknown as SeoCategoryData;
+}
@@ -0,0 +1,26 @@
+/**
+ * Tabla ruta completa -> JSON de categoría (generada por scripts/category_routes.py).
+ *
+ * Resuelve la URL con una sola búsqueda: dos páginas con el mismo último
+ * segmento (/camisetas/manga-corta, /polos/manga-corta) apuntan a archivos distintos.
+ * Las redirecciones (category-redirects.json) llevan las URLs de categorías que
+ * duplicaban una página existente a la ruta de esa página.
+ */
+
+import rawRoutes from "@/data/category-routes.json";
+import rawRedirects from "@/data/category-redirects.json";
+
+const routes = rawRoutes as Record<string, string>;
+const redirects = rawRedirects as Record<string, string>;
+
+export function normalizeRoute(path: string): string {
+  return "/" + path.split(/[?#]/)[0].replace(/^\/+|\/+$/g, "");
+}
+
+export function resolveCategoryRoute(path: string): string | undefined {
+  return routes[normalizeRoute(path)];
+}
+
+export function resolveCategoryRedirect(path: string): string | undefined {
+  return redirects[normalizeRoute(path)];
+}
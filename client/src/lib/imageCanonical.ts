@@ -0,0 +1,15 @@
+/**
+ * Mapa imagen duplicada -> original (generado por scripts/image_dedupe.py con
+ * generate_responsive_images.py --dedupe).
+ *
+ * Las copias de una misma foto se sirven desde la URL del original, así el
+ * navegador y la CDN guardan una sola versión.
+ */
+
+import rawCanonical from "@/data/image-canonical.json";
+
+const canonical = rawCanonical as Record<string, string>;
+
+export function canonicalImage(src: string): string {
+  return canonical[src] ?? src;
+}
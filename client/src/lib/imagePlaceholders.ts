@@ -0,0 +1,46 @@
+/**
+ * Marcadores de posición de imágenes (generados por
+ * scripts/generate_responsive_images.py, ver scripts/image_placeholders.py).
+ *
+ * Por ruta pública: dimensiones del original, proporción, color dominante y una
+ * miniatura WebP de 16 px como data URI. Las páginas de categoría referencian
+ * sus imágenes por ruta (/images/...), así que basta con buscarla aquí.
+ */
+
+import type { CSSProperties } from "react";
+import rawPlaceholders from "@/data/image-placeholders.json";
+
+export interface ImagePlaceholder {
+  width: number;
+  height: number;
+  aspect: number;
+  color: string;
+  lqip: string;
+}
+
+const placeholders = rawPlaceholders as Record<string, ImagePlaceholder>;
+const SOURCE_EXTENSIONS = [".jpg", ".jpeg", ".png"];
+
+export function imagePlaceholder(src: string): ImagePlaceholder | undefined {
+  if (placeholders[src]) return placeholders[src];
+  // foo.webp convertida a mano junto a foo.jpg: mismo marcador que el original
+  const base = src.replace(/\.webp$/i, "");
+  if (base === src) return undefined;
+  for (const ext of SOURCE_EXTENSIONS) {
+    if (placeholders[base + ext]) return placeholders[base + ext];
+  }
+  return undefined;
+}
+
+/** Fondo borroso + color dominante mientras carga y hueco reservado (sin saltos de layout) */
+export function placeholderStyle(src: string): CSSProperties | undefined {
+  const placeholder = imagePlaceholder(src);
+  if (!placeholder) return undefined;
+  return {
+    aspectRatio: `${placeholder.width} / ${placeholder.height}`,
+    backgroundColor: placeholder.color,
+    backgroundImage: `url(${placeholder.lqip})`,
+    backgroundSize: "cover",
+    backgroundPosition: "center",
+  };
+}
@@ -0,0 +1,131 @@
+/**
+ * Buscador local de categorías y productos sobre el índice estático
+ * generado por scripts/search_index.py (misma búsqueda que SearchIndex.search).
+ *
+ * Los términos están ordenados: los que empiezan por lo que se escribe son un
+ * rango contiguo (dos búsquedas binarias). Si una palabra no es prefijo de
+ * nada, se buscan términos con la mayoría de sus trigramas (erratas).
+ * El índice se carga en un chunk aparte la primera vez que se usa.
+ */
+
+interface SearchIndexData {
+  version: number;
+  kinds: SearchKind[];
+  labels: string[];
+  urls: (string | null)[];
+  docKinds: number[];
+  terms: string[];
+  postings: number[][];
+  trigrams: Record<string, number[]>;
+}
+
+export type SearchKind = "category" | "woo_category" | "product";
+
+export interface SearchResult {
+  label: string;
+  /** null en categorías de WooCommerce sin página propia */
+  url: string | null;
+  kind: SearchKind;
+}
+
+const INDEX_VERSION = 1;
+const STOPWORDS = new Set("a al con de del el en la las los o para por sin su un una y".split(" "));
+const EXACT = 3;
+const PREFIX = 2;
+const FUZZY_MIN = 0.5;
+
+let loading: Promise<SearchIndexData> | null = null;
+
+export function loadSearchIndex(): Promise<SearchIndexData> {
+  loading ??= import("@/data/search-index.json").then(module => {
+    const data = (module.default ?? module) as unknown as SearchIndexData;
+    if (data.version !== INDEX_VERSION) {
+      throw new Error(`Unsupported search index version: ${data.version}`);
+    }
+    return data;
+  });
+  return loading;
+}
+
+/** "Béisbol" -> "beisbol" */
+export function fold(text: string): string {
+  return text.toLowerCase().normalize("NFKD").replace(/\p{M}/gu, "");
+}
+
+function tokens(text: string): string[] {
+  return (fold(text).match(/[a-z0-9]+/g) ?? []).filter(token => !STOPWORDS.has(token));
+}
+
+function trigrams(token: string): Set<string> {
+  const padded = " " + token;
+  const grams = new Set<string>();
+  for (let i = 0; i < Math.max(1, padded.length - 2); i++) grams.add(padded.slice(i, i + 3));
+  return grams;
+}
+
+function lowerBound(terms: string[], value: string, start = 0): number {
+  let low = start;
+  let high = terms.length;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (terms[mid] < value) low = mid + 1;
+    else high = mid;
+  }
+  return low;
+}
+
+function matchingTerms(index: SearchIndexData, token: string): Map<number, number> {
+  const matches = new Map<number, number>();
+  const start = lowerBound(index.terms, token);
+  const end = lowerBound(index.terms, token + "\uffff", start);
+  for (let t = start; t < end; t++) matches.set(t, index.terms[t] === token ? EXACT : PREFIX);
+  if (matches.size || token.length < 3) return matches;
+
+  const grams = trigrams(token);
+  const shared = new Map<number, number>();
+  grams.forEach(gram => {
+    for (const t of index.trigrams[gram] ?? []) shared.set(t, (shared.get(t) ?? 0) + 1);
+  });
+  shared.forEach((hits, t) => {
+    const score = hits / grams.size;
+    if (score >= FUZZY_MIN && index.terms[t].length >= token.length - 2) matches.set(t, score);
+  });
+  return matches;
+}
+
+export function searchIndex(index: SearchIndexData, query: string, limit = 10): SearchResult[] {
+  // Primero los documentos que encajan con más palabras; luego puntuación,
+  // tipo (páginas antes que productos) y etiqueta más corta
+  const scores = new Map<number, [number, number]>();
+  for (const token of Array.from(new Set(tokens(query)))) {
+    const best = new Map<number, number>();
+    matchingTerms(index, token).forEach((score, t) => {
+      for (const doc of index.postings[t]) {
+        if (score > (best.get(doc) ?? 0)) best.set(doc, score);
+      }
+    });
+    best.forEach((score, doc) => {
+      const [matched, total] = scores.get(doc) ?? [0, 0];
+      scores.set(doc, [matched + 1, total + score]);
+    });
+  }
+  let most = 0;
+  scores.forEach(([matched]) => (most = Math.max(most, matched)));
+  const ranked = Array.from(scores.keys())
+    .filter(doc => scores.get(doc)![0] === most)
+    .sort((a, b) =>
+      scores.get(b)![1] - scores.get(a)![1] ||
+      index.docKinds[a] - index.docKinds[b] ||
+      index.labels[a].length - index.labels[b].length ||
+      a - b
+    );
+  return ranked.slice(0, limit).map(doc => ({
+    label: index.labels[doc],
+    url: index.urls[doc],
+    kind: index.kinds[index.docKinds[doc]],
+  }));
+}
+
+export async function search(query: string, limit = 10): Promise<SearchResult[]> {
+  return searchIndex(await loadSearchIndex(), query, limit);
+}
@@ -1,4 +1,4 @@
-import { useParams, Link } from "wouter";
+import { useParams, useLocation, Link, Redirect } from "wouter";
 import { DynamicProductBlock } from "@/components/DynamicProductBlock";
 import { RelatedCategories } from "@/components/RelatedCategories";
 import { ProductFilters } from "@/components/ProductFilters";
@@ -11,6 +11,8 @@ import { SeoContentBlock } from "@/components/SeoContentBlock";
 import { SeoCategoryData, SeoDataMap } from "@shared/types";
 // import seoDataRaw from "@/data/seo-data.json";
 import dynamicBlocks from "@/data/dynamic-blocks.json";
+import { loadCategoryPage } from "@/lib/categoryBundles";
+import { resolveCategoryRedirect, resolveCategoryRoute } from "@/lib/categoryRoutes";
 
 // Cast imported JSON to typed map
 // const seoData = seoDataRaw as SeoDataMap;
@@ -18,12 +20,17 @@ import { useState, useEffect } from "react";
 
 export default function CategoryPage() {
   const params = useParams();
+  const [location] = useLocation();
   
   // Determine current slug from URL params
   // Route: /:category, /:category/:subcategory, or /:category/:subcategory/:child
   // We need to match the slug key in seo-data.json
   // Priority: child > subcategory > category
   const categorySlug = params.child || params.subcategory || params.category;
+  // URL antigua de una categoría duplicada: se sustituye por la de la página canónica
+  const redirect = resolveCategoryRedirect(location);
+  // Archivo de datos de la ruta completa; el último segmento solo para rutas fuera de la tabla
+  const dataFile = redirect ? undefined : resolveCategoryRoute(location) ?? categorySlug;
   
   // Find category data
   const [categoryData, setCategoryData] = useState<SeoCategoryData | undefined>(undefined);
@@ -32,15 +39,20 @@ export default function CategoryPage() {
 
   useEffect(() => {
     async function loadCategoryData() {
-      if (!categorySlug) return;
+      if (!dataFile) return;
       
       setLoading(true);
       try {
-        // Intentar cargar el JSON específico de la categoría
-        const module = await import(`../data/categories/${categorySlug}.json`);
-        setCategoryData(module.default as SeoCategoryData);
+        // Primero el bundle de su sección; si no está empaquetada, el JSON específico
+        const bundled = await loadCategoryPage(dataFile);
+        if (bundled) {
+          setCategoryData(bundled);
+        } else {
+          const module = await import(`../data/categories/${dataFile}.json`);
+          setCategoryData(module.default as SeoCategoryData);
+        }
       } catch (error) {
-        console.error(`Error loading category data for ${categorySlug}:`, error);
+        console.error(`Error loading category data for ${dataFile}:`, error);
         setCategoryData(undefined);
       } finally {
         setLoading(false);
@@ -48,7 +60,11 @@ export default function CategoryPage() {
     }
 
     loadCategoryData();
-  }, [categorySlug]);
+  }, [dataFile]);
+
+  if (redirect) {
+    return <Redirect to={redirect} replace />;
+  }
 
   if (loading) {
     return (
@@ -1,6 +1,6 @@
 import { Button } from "@/components/ui/button";
-import { Input } from "@/components/ui/input";
-import { Search, ArrowRight, CheckCircle2, Star } from "lucide-react";
+import { SearchBox } from "@/components/SearchBox";
+import { ArrowRight, CheckCircle2, Star } from "lucide-react";
 import { Link } from "wouter";
 import { DynamicProductBlock } from "@/components/DynamicProductBlock";
 import { Helmet } from "react-helmet-async";
@@ -118,7 +118,7 @@ export default function Home() {
 
       <main className="min-h-screen bg-white">
         {/* Hero Section */}
-        <section className="relative h-[400px] md:h-[500px] bg-gradient-to-r from-slate-900 to-slate-800 overflow-hidden">
+        <section className="relative h-[400px] md:h-[500px] bg-gradient-to-r from-slate-900 to-slate-800">
           <HeroSlider />
           <div className="absolute inset-0 bg-black/40 z-10" />
           
@@ -131,15 +131,10 @@ export default function Home() {
             </p>
             
             <div className="w-full max-w-2xl">
-              <div className="flex gap-2">
-                <Input 
-                  placeholder="Buscar..." 
-                  className="rounded-full px-6 py-3 text-lg"
-                />
-                <Button className="rounded-full bg-blue-600 hover:bg-blue-700 px-8 py-3">
-                  <Search className="w-5 h-5" />
-                </Button>
-              </div>
+              <SearchBox
+                inputClassName="w-full h-14 pl-6 pr-20 rounded-full bg-white text-lg text-slate-900 border border-slate-200 outline-none focus:ring-2 focus:ring-blue-500"
+                buttonClassName="absolute right-1 top-1 bottom-1 px-6 rounded-full bg-blue-600 hover:bg-blue-700 text-white flex items-center justify-center transition-colors"
+              />
             </div>
           </div>
         </section>
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# python -m scripts: los módulos de scripts/ se importan entre sí por nombre
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pipeline import main
+
+main()
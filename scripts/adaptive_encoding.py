@@ -0,0 +1,215 @@
+import io
+import math
+
+from PIL import Image, ImageChops
+
+from instrumentation import count, span
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él solo está disponible PSNR
+    np = None
+
+# Codificación adaptativa de renditions: en vez de una calidad fija se busca,
+# por rendición y formato, la calidad más baja que mantiene la métrica (SSIM o
+# PSNR frente a la rendición sin comprimir) por encima del objetivo y/o que
+# cabe en el presupuesto de bytes del breakpoint. La calidad es casi monótona
+# en tamaño y en fidelidad, así que basta una búsqueda binaria (~6 codificaciones).
+MIN_QUALITY = 40
+MAX_QUALITY = 90
+
+# Mismos parámetros que la codificación fija de generate_responsive_images.py
+SAVE_OPTIONS = {
+    'jpeg': {'format': 'JPEG', 'optimize': True},
+    'webp': {'format': 'WEBP'},
+    'png': {'format': 'PNG', 'optimize': True},
+}
+LOSSY = ('jpeg', 'webp')
+
+# SSIM sobre la luminancia con ventana uniforme de 7x7 (como scikit-image)
+SSIM_WINDOW = 7
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+
+
+def encode(img, fmt, quality):
+    buffer = io.BytesIO()
+    with span(f"encode_{fmt}"):
+        img.save(buffer, quality=quality, **SAVE_OPTIONS[fmt])
+    count('encodes')
+    return buffer.getvalue()
+
+
+def psnr(reference, candidate):
+    # MSE exacto a partir del histograma de diferencias (sin NumPy)
+    histogram = ImageChops.difference(reference, candidate).histogram()
+    squared = sum(n * (i % 256) ** 2 for i, n in enumerate(histogram))
+    mse = squared / (reference.width * reference.height * len(reference.getbands()))
+    return math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def _window_means(values):
+    # Media de cada ventana SSIM_WINDOW x SSIM_WINDOW (solo ventanas completas)
+    # con una tabla de sumas acumuladas, operando en el sitio
+    w = SSIM_WINDOW
+    summed = np.zeros((values.shape[0] + 1, values.shape[1] + 1))
+    np.cumsum(values, axis=0, out=summed[1:, 1:])
+    np.cumsum(summed[1:, 1:], axis=1, out=summed[1:, 1:])
+    means = summed[w:, w:] - summed[:-w, w:]
+    means -= summed[w:, :-w]
+    means += summed[:-w, :-w]
+    means *= 1 / (w * w)
+    return means
+
+
+class PSNR:
+    def __init__(self, reference):
+        self.reference = reference
+
+    def __call__(self, candidate):
+        return psnr(self.reference, candidate)
+
+
+class SSIM:
+    # Las estadísticas de la referencia se calculan una vez por búsqueda;
+    # cada candidata solo necesita sus medias, su varianza y la covarianza
+    def __init__(self, reference):
+        self.x = np.asarray(reference.convert('L'), dtype=np.float64)
+        self.small = min(self.x.shape) < SSIM_WINDOW
+        if not self.small:
+            self.mx = _window_means(self.x)
+            self.vx = _window_means(self.x * self.x) - self.mx * self.mx
+            self.mx2 = self.mx * self.mx + SSIM_C1
+
+    def __call__(self, candidate):
+        y = np.asarray(candidate.convert('L'), dtype=np.float64)
+        if self.small:
+            return 1.0 if np.array_equal(self.x, y) else 0.0
+        # Varianzas y covarianza muestrales, como scikit-image
+        correction = SSIM_WINDOW ** 2 / (SSIM_WINDOW ** 2 - 1)
+        my = _window_means(y)
+        vy = _window_means(y * y)
+        vy -= my * my
+        cxy = _window_means(self.x * y)
+        cxy -= self.mx * my
+        numerator = (2 * correction) * cxy
+        numerator += SSIM_C2
+        numerator *= 2 * self.mx * my + SSIM_C1
+        vy += self.vx
+        vy *= correction
+        vy += SSIM_C2
+        my *= my
+        my += self.mx2
+        my *= vy
+        numerator /= my
+        return float(numerator.mean())
+
+
+def ssim(reference, candidate):
+    return SSIM(reference)(candidate)
+
+
+METRICS = {'ssim': SSIM, 'psnr': PSNR}
+
+
+class QualitySearch:
+    # Codificaciones y métricas por calidad, para no repetir ninguna
+    def __init__(self, img, fmt, metric=None):
+        self.img = img
+        self.fmt = fmt
+        self.metric = metric
+        self.measure = METRICS[metric](img) if metric else None
+        self.encoded = {}
+        self.scores = {}
+
+    def data(self, quality):
+        if quality not in self.encoded:
+            self.encoded[quality] = encode(self.img, self.fmt, quality)
+        return self.encoded[quality]
+
+    def size(self, quality):
+        return len(self.data(quality))
+
+    def score(self, quality):
+        if quality not in self.scores:
+            with Image.open(io.BytesIO(self.data(quality))) as decoded, span('metric'):
+                self.scores[quality] = self.measure(decoded.convert(self.img.mode))
+        return self.scores[quality]
+
+    def lowest(self, low, high, accept):
+        # Menor calidad en [low, high] que cumple `accept` (o None)
+        found = None
+        while low <= high:
+            middle = (low + high) // 2
+            if accept(middle):
+                found, high = middle, middle - 1
+            else:
+                low = middle + 1
+        return found
+
+    def highest(self, low, high, accept):
+        found = None
+        while low <= high:
+            middle = (low + high) // 2
+            if accept(middle):
+                found, low = middle, middle + 1
+            else:
+                high = middle - 1
+        return found
+
+
+def encode_adaptive(img, fmt, settings, budget=None, baseline_quality=None):
+    """Codifica `img` con la calidad elegida según `settings`.
+
+    ``settings`` es el dict de adaptive_settings(); ``budget`` es el máximo de
+    bytes de este breakpoint (o None). Devuelve (bytes, registro para el
+    manifiesto con la calidad, la métrica y el tamaño con la calidad fija).
+    """
+    if fmt not in LOSSY:
+        data = encode(img, fmt, baseline_quality)
+        return data, {'quality': None, 'bytes': len(data), 'baseline_bytes': len(data)}
+
+    search = QualitySearch(img, fmt, settings.get('metric'))
+    low, high = settings['min_quality'], settings['max_quality']
+    quality = high
+    target_met = True
+    if search.metric:
+        target = settings['target']
+        quality = search.lowest(low, high, lambda q: search.score(q) >= target)
+        if quality is None:
+            quality, target_met = high, False
+    within_budget = True
+    if budget and search.size(quality) > budget:
+        # El presupuesto manda: la mayor calidad que cabe, aunque no llegue a la métrica
+        fitting = search.highest(low, quality - 1, lambda q: search.size(q) <= budget)
+        within_budget = fitting is not None
+        quality = fitting if within_budget else low
+
+    data = search.data(quality)
+    record = {'quality': quality, 'bytes': len(data)}
+    if search.metric:
+        record[search.metric] = round(search.score(quality), 4)
+        record['target_met'] = target_met and search.score(quality) >= settings['target']
+    if budget:
+        record['budget'] = budget
+        record['within_budget'] = within_budget
+    if baseline_quality is not None:
+        record['baseline_bytes'] = search.size(baseline_quality)
+    count('adaptive_bytes_saved', record.get('baseline_bytes', len(data)) - len(data))
+    return data, record
+
+
+def adaptive_settings(metric=None, target=None, budgets=None,
+                      min_quality=MIN_QUALITY, max_quality=MAX_QUALITY):
+    # Ajustes serializables (van a los workers y a settings_key)
+    if metric == 'ssim' and np is None:
+        raise ValueError('SSIM needs NumPy; install it or use a PSNR target')
+    if not 1 <= min_quality <= max_quality <= 100:
+        raise ValueError(f"Invalid quality range {min_quality}-{max_quality}")
+    return {
+        'metric': metric,
+        'target': target,
+        'budgets': dict(sorted((budgets or {}).items())),
+        'min_quality': min_quality,
+        'max_quality': max_quality,
+    }
@@ -0,0 +1,286 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from incremental_output import atomic_write
+from project_paths import project_path
+
+# Benchmark del pipeline de contenidos/imágenes sobre fixtures sintéticos.
+# Cada etapa se ejecuta como subproceso con IMPACTO33_ROOT apuntando a un
+# directorio temporal; se mide tiempo real, CPU, pico de RSS y archivos escritos.
+# Cada tamaño se ejecuta dos veces: "cold" (salida vacía) y "warm" (incremental).
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = project_path('.build-cache', 'benchmarks')
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+CHILDREN_PER_PARENT = 50
+IMAGE_SIZE = (6000, 4000)
+
+# Diferencias absolutas por debajo de esto son ruido, aunque el ratio sea alto
+MIN_DELTA = {'wall_s': 0.25, 'peak_rss_mb': 10}
+
+
+def write_categorias(path, n):
+    # Mismo formato que categorias.txt: "Nombre https://impacto33.com/ruta/"
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(n):
+            parent = i // CHILDREN_PER_PARENT
+            if i % CHILDREN_PER_PARENT == 0:
+                f.write(f"Categoría {parent} https://impacto33.com/madre-{parent}/\n")
+            else:
+                f.write(f"Hija {i} https://impacto33.com/madre-{parent}/hija-{i}/\n")
+
+
+def seo_entry(slug, url, parent_slug, title):
+    # Estructura y longitud de textos parecidas a las entradas reales de seo-data.json
+    return {
+        "url": url,
+        "slug": slug,
+        "parent_slug": parent_slug,
+        "search_intent": f"{title.lower()} personalizadas",
+        "siblings_intents": [f"{title.lower()} baratas", f"{title.lower()} con logo"],
+        "hero_tituloPrincipal": f"{title} Personalizadas",
+        "hero_intro": f"{title} personalizadas con tu logo para empresas, eventos y regalos. " * 3,
+        "hub_subcategorias_texto": f"Encuentra el modelo de {title.lower()} perfecto para tu proyecto:",
+        "ventajasEmpresa": {
+            "titulo": "Impacto Garantizado",
+            "items": ["Envío rápido", "Sin pedido mínimo", "Impresión a todo color", "Presupuesto en 24h"],
+        },
+        "casosUso": [
+            {"titulo": "Eventos", "descripcion": f"{title} para ferias y congresos.", "image_alt": title},
+            {"titulo": "Empresas", "descripcion": f"{title} para uniformar equipos.", "image_alt": title},
+        ],
+        "faq": [
+            {"pregunta": "¿Cuál es el pedido mínimo?", "respuesta": "Desde una unidad en la mayoría de productos."},
+            {"pregunta": "¿Cuánto tarda el envío?", "respuesta": "Entre 5 y 7 días laborables desde la aprobación."},
+        ],
+        "texto_final_refuerzo": f"Personaliza tus {title.lower()} hoy mismo.",
+        "cta_textoCta": "Pide presupuesto",
+        "meta_title": f"{title} Personalizadas | Impacto33",
+        "meta_description": f"Compra {title.lower()} personalizadas con tu logo al mejor precio.",
+    }
+
+
+def write_seo_data(path, n):
+    # Una entrada por línea de categorias.txt (mismas rutas). Se escribe entrada a
+    # entrada: el pico de RSS del benchmark lo heredan los subprocesos (ru_maxrss
+    # se conserva tras fork+exec), así que el proceso padre debe quedarse pequeño.
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n')
+        for i in range(n):
+            parent = i // CHILDREN_PER_PARENT
+            if i % CHILDREN_PER_PARENT == 0:
+                slug, entry = f"madre-{parent}", seo_entry(f"madre-{parent}", f"/madre-{parent}/", "", f"Categoría {parent}")
+            else:
+                slug, entry = f"hija-{i}", seo_entry(f"hija-{i}", f"/madre-{parent}/hija-{i}/", f"madre-{parent}", f"Hija {i}")
+            separator = ',\n' if i < n - 1 else '\n'
+            f.write(f"  {json.dumps(slug)}: {json.dumps(entry, ensure_ascii=False)}{separator}")
+        f.write('}\n')
+
+
+def write_images(directory, count, size=IMAGE_SIZE):
+    # Fuentes grandes JPEG y PNG; devuelve False si no hay Pillow
+    try:
+        from PIL import Image
+    except ImportError:
+        return False
+    os.makedirs(directory, exist_ok=True)
+    base = Image.linear_gradient('L').resize(size).convert('RGB')
+    for i in range(count):
+        img = base.rotate(i * 7, expand=False)
+        if i % 2:
+            img.save(os.path.join(directory, f"source-{i}.png"))
+        else:
+            img.save(os.path.join(directory, f"source-{i}.jpg"), quality=90)
+    return True
+
+
+def snapshot(directory):
+    # Los manifiestos de .build-cache no cuentan como archivos generados
+    state = {}
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d != '.build-cache']
+        for name in files:
+            path = os.path.join(root, name)
+            st = os.stat(path)
+            state[path] = (st.st_size, st.st_mtime_ns)
+    return state
+
+
+def run_stage(name, command, workdir):
+    # os.wait4 da el rusage del hijo concreto (incluye los procesos que él espera)
+    before = snapshot(workdir)
+    env = dict(os.environ, IMPACTO33_ROOT=workdir)
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=SCRIPTS_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    stderr = process.stderr.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - start
+    returncode = os.waitstatus_to_exitcode(status)
+    after = snapshot(workdir)
+
+    changed = [path for path, state in after.items() if before.get(path) != state]
+    result = {
+        'stage': name,
+        'wall_s': round(wall, 4),
+        'user_s': round(usage.ru_utime, 4),
+        'sys_s': round(usage.ru_stime, 4),
+        'cpu_s': round(usage.ru_utime + usage.ru_stime, 4),
+        # ru_maxrss: KB en Linux, bytes en macOS
+        'peak_rss_mb': round(usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1),
+        'files_written': len(changed),
+        'bytes_written': sum(after[path][0] for path in changed),
+        'returncode': returncode,
+    }
+    if returncode:
+        result['error'] = stderr.decode('utf-8', 'replace')[-2000:]
+    return result
+
+
+def stage_commands(workdir, jobs, with_images):
+    python = sys.executable
+    data = os.path.join(workdir, 'client', 'src', 'data')
+    stages = [
+        ('generate_json', [
+            python, 'generate_json.py',
+            '--input', os.path.join(workdir, 'categorias.txt'),
+            '--seo-sitemap', os.path.join(data, 'seo-sitemap.json'),
+            '--dynamic-blocks', os.path.join(data, 'dynamic-blocks.json'),
+            # Lineal; con --siblings related (por defecto) el coste crece con los pares
+            # que comparten términos: unos 0,5 s a 10k pero más de 30 s a 100k
+            '--siblings', 'first',
+        ]),
+        ('split_seo_data', [
+            python, os.path.join(os.path.dirname(SCRIPTS_DIR), 'split_seo_data.py'),
+            '--source', os.path.join(data, 'seo-data.json'),
+            '--output-dir', os.path.join(data, 'categories'),
+        ]),
+        ('generate_category_pages', [
+            python, 'generate_category_pages.py', '--jobs', str(jobs),
+            '--output-dir', os.path.join(data, 'categories'),
+        ]),
+    ]
+    if with_images:
+        images = os.path.join(workdir, 'client', 'public', 'images')
+        stages.append(('generate_responsive_images', [
+            python, 'generate_responsive_images.py', '--all', '--jobs', str(jobs),
+            '--input-dir', images, '--output-dir', images,
+        ]))
+    return stages
+
+
+def run_size(size, images, jobs, keep=False):
+    workdir = tempfile.mkdtemp(prefix=f"impacto33-bench-{size}-")
+    try:
+        data = os.path.join(workdir, 'client', 'src', 'data')
+        os.makedirs(os.path.join(data, 'categories'))
+        write_categorias(os.path.join(workdir, 'categorias.txt'), size)
+        write_seo_data(os.path.join(data, 'seo-data.json'), size)
+        with_images = images > 0 and write_images(os.path.join(workdir, 'client', 'public', 'images'), images)
+        if images and not with_images:
+            print("  Pillow no está instalado: se omite generate_responsive_images")
+
+        results = []
+        for run in ('cold', 'warm'):
+            for name, command in stage_commands(workdir, jobs, with_images):
+                result = dict(run_stage(name, command, workdir), size=size, run=run)
+                results.append(result)
+                print(f"  {size:>7} {run:<4} {name:<27} {result['wall_s']:>8.2f}s wall "
+                      f"{result['cpu_s']:>8.2f}s cpu {result['peak_rss_mb']:>7.1f} MB "
+                      f"{result['files_written']:>7} files"
+                      + (f"  (exit {result['returncode']})" if result['returncode'] else ''))
+        return results
+    finally:
+        if keep:
+            print(f"  Fixtures conservados en {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    # Compara tiempo real y pico de RSS con otra ejecución (p. ej. de otro commit)
+    previous = {(r['stage'], r['size'], r['run']): r for r in baseline['results']}
+    regressions = []
+    print(f"Comparación con {baseline.get('commit') or 'baseline'}:")
+    for result in results:
+        key = (result['stage'], result['size'], result['run'])
+        old = previous.get(key)
+        if not old:
+            continue
+        for metric in ('wall_s', 'peak_rss_mb'):
+            if not old[metric]:
+                continue
+            ratio = result[metric] / old[metric]
+            flag = ''
+            if ratio > threshold and result[metric] - old[metric] > MIN_DELTA[metric]:
+                flag = '  <-- regresión'
+                regressions.append((key, metric, ratio))
+            print(f"  {key[1]:>7} {key[2]:<4} {key[0]:<27} {metric:<12} "
+                  f"{old[metric]:>9} -> {result[metric]:>9} ({ratio:.2f}x){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del pipeline de generación con fixtures sintéticos')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Líneas de categorias.txt / entradas de seo-data.json')
+    parser.add_argument('--images', type=int, default=4, help='Imágenes fuente grandes (0 para omitir)')
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--output', help='JSON de resultados (por defecto .build-cache/benchmarks/<commit>.json)')
+    parser.add_argument('--compare', help='JSON de resultados anterior con el que comparar')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Ratio a partir del cual se considera regresión (con --compare)')
+    parser.add_argument('--keep', action='store_true', help='No borrar los directorios temporales')
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        print(f"Tamaño {size}:")
+        # Las imágenes no dependen del tamaño del catálogo: solo en el primero
+        results.extend(run_size(size, args.images if size == args.sizes[0] else 0, args.jobs, args.keep))
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'jobs': args.jobs,
+        'results': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit or 'results'}.json")
+    atomic_write(output, json.dumps(report, indent=2, ensure_ascii=False).encode('utf-8'))
+    print(f"Resultados en {output}")
+
+    failed = [r for r in results if r['returncode']]
+    for result in failed:
+        print(f"Error en {result['stage']} ({result['size']}, {result['run']}):\n{result.get('error', '')}")
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+import argparse
+import datetime
+import filecmp
+import glob
+import gzip
+import json
+import os
+import re
+import tempfile
+from urllib.parse import urlencode
+from xml.sax.saxutils import escape, unescape
+
+from catalog_dump import iter_products
+from catalog_store import SNAPSHOT_FILE, CatalogStore
+from incremental_output import atomic_write
+from instrumentation import add_profile_argument, count, profiling, span
+from project_paths import categories_dir, data_dir, project_path
+
+BASE_URL = 'https://impacto33.com'
+
+# Límites del protocolo sitemaps.org por archivo (tamaño sin comprimir)
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024
+
+URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"\n'
+    '        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">\n'
+).encode('utf-8')
+URLSET_CLOSE = b'</urlset>\n'
+LOC_RE = re.compile(r'<loc>(.*?)</loc>', re.S)
+
+
+def url_entry(loc, lastmod=None, changefreq=None, priority=None, images=()):
+    parts = ['  <url>\n', f'    <loc>{escape(loc)}</loc>\n']
+    if lastmod:
+        parts.append(f'    <lastmod>{lastmod}</lastmod>\n')
+    if changefreq:
+        parts.append(f'    <changefreq>{changefreq}</changefreq>\n')
+    if priority:
+        parts.append(f'    <priority>{priority}</priority>\n')
+    for image_loc, title in images:
+        parts.append('    <image:image>\n')
+        parts.append(f'      <image:loc>{escape(image_loc)}</image:loc>\n')
+        if title:
+            parts.append(f'      <image:title>{escape(title)}</image:title>\n')
+        parts.append('    </image:image>\n')
+    parts.append('  </url>\n')
+    return ''.join(parts).encode('utf-8')
+
+
+class SitemapWriter:
+    """Escribe <url> en streaming y parte en shards sitemap-{name}-N.xml(.gz).
+
+    Solo hay una entrada en memoria a la vez; cada shard se escribe en un
+    temporal y se renombra al cerrarse.
+    """
+
+    def __init__(self, output_dir, name, compress=True, max_urls=MAX_URLS, max_bytes=MAX_BYTES, skip=()):
+        self.output_dir = output_dir
+        self.name = name
+        self.compress = compress
+        # URLs que ya están en otro sitemap del índice (ver listed_urls)
+        self.skip = skip
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.shards = []
+        self.total = 0
+        self._file = None
+
+    def _shard_name(self, number):
+        return f"sitemap-{self.name}-{number}{shard_extension(self.compress)}"
+
+    def _open_shard(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=self.output_dir, prefix='.sitemap-', suffix='.tmp')
+        raw = os.fdopen(fd, 'wb')
+        self._file = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=9, mtime=0) if self.compress else raw
+        self._raw = raw
+        self._file.write(URLSET_OPEN)
+        self._count = 0
+        self._bytes = len(URLSET_OPEN)
+
+    def _close_shard(self):
+        self._file.write(URLSET_CLOSE)
+        self._file.close()
+        if self._raw is not self._file:
+            self._raw.close()
+        name = self._shard_name(len(self.shards) + 1)
+        path = os.path.join(self.output_dir, name)
+        if os.path.exists(path) and filecmp.cmp(self._tmp_path, path, shallow=False):
+            # Sin cambios: se conserva el archivo (y su mtime, que es el lastmod del índice)
+            os.unlink(self._tmp_path)
+        else:
+            os.chmod(self._tmp_path, 0o644)
+            os.replace(self._tmp_path, path)
+        self.shards.append(name)
+        count('files_written')
+        count('bytes_out', os.path.getsize(os.path.join(self.output_dir, name)))
+        self._file = None
+
+    def add(self, loc, **kwargs):
+        if loc.rstrip('/') in self.skip:
+            count('urls_skipped')
+            return
+        entry = url_entry(loc, **kwargs)
+        if self._file is not None and (
+            self._count >= self.max_urls or self._bytes + len(entry) + len(URLSET_CLOSE) > self.max_bytes
+        ):
+            self._close_shard()
+        if self._file is None:
+            self._open_shard()
+        self._file.write(entry)
+        self._count += 1
+        self._bytes += len(entry)
+        self.total += 1
+        count('urls')
+
+    def close(self):
+        if self._file is not None:
+            self._close_shard()
+        # Borrar shards de ejecuciones anteriores (en cualquiera de los dos modos)
+        # que ya no existen. Con shards .xml, el .gz de un shard actual es su
+        # variante precomprimida (precompress.py) y se deja
+        shard_re = re.compile(rf"sitemap-{re.escape(self.name)}-\d+\.xml(\.gz)?")
+        for filename in os.listdir(self.output_dir):
+            if not shard_re.fullmatch(filename) or filename in self.shards:
+                continue
+            if filename.endswith('.gz') and filename[:-len('.gz')] in self.shards:
+                continue
+            os.unlink(os.path.join(self.output_dir, filename))
+        return self.shards
+
+
+def shard_extension(compress):
+    return '.xml.gz' if compress else '.xml'
+
+
+def existing_shards(output_dir, name, compress=True):
+    # Solo la extensión del modo activo: sitemap-products-1.xml.gz / .xml.br
+    # junto a un shard .xml son variantes de precompress.py, no shards
+    shard_re = re.compile(rf"sitemap-{re.escape(name)}-(\d+){re.escape(shard_extension(compress))}")
+    matches = [shard_re.fullmatch(os.path.basename(path))
+               for path in glob.glob(os.path.join(output_dir, f"sitemap-{name}-*"))]
+    return [m.group(0) for m in sorted(filter(None, matches), key=lambda m: int(m.group(1)))]
+
+
+def listed_urls(paths):
+    # <loc> de los sitemaps existentes que van en el índice, sin la barra final
+    urls = set()
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                urls.update(unescape(loc).strip().rstrip('/') for loc in LOC_RE.findall(f.read()))
+    return urls
+
+
+def write_sitemap_index(path, sitemaps, base_url=BASE_URL):
+    # lastmod: fecha de modificación de cada archivo (hoy si no existe)
+    directory = os.path.dirname(path)
+    today = datetime.date.today().isoformat()
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for name in sitemaps:
+        sitemap_path = os.path.join(directory, name)
+        lastmod = today
+        if os.path.exists(sitemap_path):
+            lastmod = datetime.datetime.fromtimestamp(os.path.getmtime(sitemap_path),
+                                                      datetime.timezone.utc).date().isoformat()
+        lines.append('  <sitemap>')
+        lines.append(f'    <loc>{escape(base_url)}/{escape(name)}</loc>')
+        lines.append(f'    <lastmod>{lastmod}</lastmod>')
+        lines.append('  </sitemap>')
+    lines.append('</sitemapindex>')
+    atomic_write(path, '\n'.join(lines).encode('utf-8'))
+
+
+def iter_category_urls(seo_sitemap_file, pages_dir):
+    # Categorías de seo-sitemap.json y de los JSON de client/src/data/categories
+    seen = set()
+    if os.path.exists(seo_sitemap_file):
+        with open(seo_sitemap_file, 'r', encoding='utf-8') as f:
+            for item in json.load(f):
+                if item.get('url') and item['url'] not in seen:
+                    seen.add(item['url'])
+                    yield item['url']
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            url = json.load(f).get('url')
+        if url and url not in seen:
+            seen.add(url)
+            yield url
+
+
+def variation_query(variation):
+    # WooCommerce preselecciona la variación con ?attribute_pa_color=rojo&...
+    attributes = (variation.get('attributes') or {}).get('nodes') or []
+    params = [(f"attribute_{a['name']}", a['value']) for a in attributes if a.get('name') and a.get('value')]
+    return urlencode(params)
+
+
+def write_product_urls(writer, products, base_url, include_variations):
+    for product in products:
+        slug = product.get('slug')
+        if not slug:
+            continue
+        loc = f"{base_url}/producto/{slug}"
+        lastmod = (product.get('modified') or '')[:10] or None
+        image = product.get('image') or {}
+        images = [(image['sourceUrl'], product.get('name'))] if image.get('sourceUrl') else []
+        writer.add(loc, lastmod=lastmod, changefreq='daily', priority='1.0', images=images)
+
+        if include_variations:
+            for variation in (product.get('variations') or {}).get('nodes') or []:
+                query = variation_query(variation)
+                if not query:
+                    continue
+                variation_image = variation.get('image') or {}
+                variation_images = (
+                    [(variation_image['sourceUrl'], variation.get('name'))]
+                    if variation_image.get('sourceUrl') else []
+                )
+                writer.add(f"{loc}?{query}", lastmod=lastmod, changefreq='daily', priority='0.8',
+                           images=variation_images)
+
+
+def build(args):
+    base_url = args.base_url.rstrip('/')
+    compress = not args.no_gzip
+    extra = args.extra_sitemap if args.extra_sitemap is not None else ['sitemap.xml']
+    # sitemap.xml (a mano) ya lista la mayoría de categorías: no se repiten en los shards
+    listed = listed_urls(os.path.join(args.output_dir, name) for name in extra)
+
+    with span('categories'):
+        categories = SitemapWriter(args.output_dir, 'categories', compress, skip=listed)
+        for url in iter_category_urls(args.seo_sitemap, args.categories_dir):
+            url = url if url.startswith('/') else f"/{url}"
+            categories.add(f"{base_url}{url}", changefreq='weekly', priority='0.9')
+        category_shards = categories.close()
+    print(f"Categories: {categories.total} URLs in {len(category_shards)} shard(s)")
+
+    if args.products or args.catalog:
+        with span('products'):
+            products = SitemapWriter(args.output_dir, 'products', compress, skip=listed)
+            if args.catalog:
+                with CatalogStore(args.catalog) as store:
+                    write_product_urls(products, store.iter_products(args.variations), base_url, args.variations)
+            else:
+                write_product_urls(products, iter_products(args.products), base_url, args.variations)
+            product_shards = products.close()
+        print(f"Products: {products.total} URLs in {len(product_shards)} shard(s)")
+    else:
+        # Sin volcado de productos se mantienen los shards (o el sitemap-products.xml) existentes
+        product_shards = existing_shards(args.output_dir, 'products', compress)
+        if not product_shards and os.path.exists(os.path.join(args.output_dir, 'sitemap-products.xml')):
+            product_shards = ['sitemap-products.xml']
+        print(f"Products: no dump given, keeping {', '.join(product_shards) or 'none'}")
+
+    index_path = os.path.join(args.output_dir, 'sitemap-index.xml')
+    write_sitemap_index(index_path, extra + category_shards + product_shards, base_url)
+    print(f"Sitemap index written to {index_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build sharded, gzip-compressed sitemaps and sitemap-index.xml')
+    parser.add_argument('--products', action='append', default=[],
+                        help='GraphQL product dump (JSON/NDJSON file or directory, repeatable)')
+    parser.add_argument('--catalog', nargs='?', const=SNAPSHOT_FILE, default=None, metavar='SNAPSHOT',
+                        help=f"Read products from the SQLite catalog snapshot (default: {SNAPSHOT_FILE})")
+    parser.add_argument('--variations', action='store_true', help='Also emit one URL per product variation')
+    parser.add_argument('--output-dir', default=project_path('client', 'public'))
+    parser.add_argument('--seo-sitemap', default=data_dir('seo-sitemap.json'))
+    parser.add_argument('--categories-dir', default=categories_dir())
+    parser.add_argument('--extra-sitemap', action='append', default=None,
+                        help='Existing sitemap to keep in the index (default: sitemap.xml)')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--no-gzip', action='store_true', help='Write plain .xml shards')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profiling('build_sitemaps', args.profile):
+        build(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import glob
+import gzip
+import json
+import os
+
+# Lectura en streaming de volcados paginados de la API GraphQL de WooCommerce.
+# Cada archivo puede ser:
+#   - .json: una página ({"data": {"products": {"nodes": [...]}}}) o una lista de páginas
+#   - .ndjson / .jsonl: una página o un nodo por línea
+# Cualquiera de ellos puede ir comprimido (.gz). Un directorio se lee entero en orden.
+
+DUMP_EXTENSIONS = ('.json', '.ndjson', '.jsonl')
+
+
+def expand_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            found = []
+            for ext in DUMP_EXTENSIONS:
+                found.extend(glob.glob(os.path.join(path, f'*{ext}')))
+                found.extend(glob.glob(os.path.join(path, f'*{ext}.gz')))
+            yield from sorted(found)
+        else:
+            yield path
+
+
+def _open(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def iter_documents(paths):
+    # Devuelve los objetos JSON de nivel superior, una página o nodo cada vez
+    for path in expand_paths(paths):
+        name = path[:-3] if path.endswith('.gz') else path
+        with _open(path) as f:
+            if name.endswith(('.ndjson', '.jsonl')):
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+            else:
+                document = json.load(f)
+                if isinstance(document, list):
+                    yield from document
+                else:
+                    yield document
+
+
+def page_nodes(document, connection):
+    # Nodos de `connection` ("products", "productCategories"...) dentro de una página
+    if 'data' in document and isinstance(document['data'], dict):
+        document = document['data']
+    value = document.get(connection)
+    if isinstance(value, dict):
+        return value.get('nodes') or []
+    if isinstance(value, list):
+        return value
+    return None
+
+
+def iter_products(paths):
+    for document in iter_documents(paths):
+        nodes = page_nodes(document, 'products')
+        if nodes is not None:
+            yield from nodes
+        elif 'slug' in document:
+            # NDJSON con un producto por línea
+            yield document
@@ -0,0 +1,343 @@
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+from catalog_dump import iter_documents, page_nodes
+from instrumentation import add_profile_argument, count, profiling, span
+from project_paths import project_path
+
+# Instantánea local del catálogo de WooCommerce en SQLite, cargada desde volcados
+# paginados de GraphQL (ver catalog_dump.py). Las páginas pueden traer:
+#   - products: {"data": {"products": {"nodes": [...]}}} (con o sin variations)
+#   - variaciones de un producto: {"data": {"product": {"databaseId": N, "variations": {"nodes": [...]}}}}
+#   - productCategories: {"data": {"productCategories": {"nodes": [...]}}}
+# Los generadores (sitemaps, feed) la leen con CatalogStore sin tocar la red.
+SNAPSHOT_FILE = project_path('.build-cache', 'catalog.sqlite')
+SCHEMA_VERSION = 1
+BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE products (
+    id INTEGER PRIMARY KEY,
+    slug TEXT,
+    name TEXT,
+    type TEXT,
+    status TEXT,
+    sku TEXT,
+    modified TEXT,
+    price TEXT,
+    stock_status TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE variations (
+    id INTEGER PRIMARY KEY,
+    product_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    sku TEXT,
+    price TEXT,
+    stock_status TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE categories (
+    slug TEXT PRIMARY KEY,
+    name TEXT,
+    parent_slug TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE product_categories (
+    category_slug TEXT NOT NULL,
+    product_id INTEGER NOT NULL,
+    PRIMARY KEY (category_slug, product_id)
+) WITHOUT ROWID;
+"""
+
+# Se crean al final de la carga: indexar al insertar es bastante más lento
+INDEXES = """
+CREATE INDEX idx_products_slug ON products (slug);
+CREATE INDEX idx_products_modified ON products (modified);
+CREATE INDEX idx_variations_product ON variations (product_id, position);
+CREATE INDEX idx_product_categories_product ON product_categories (product_id);
+CREATE INDEX idx_categories_parent ON categories (parent_slug);
+"""
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def _nodes(connection):
+    return (connection or {}).get('nodes') or []
+
+
+class Ingester:
+    """Carga páginas en una base nueva, en lotes y en una sola transacción."""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+        self.products = []
+        self.variations = []
+        self.categories = []
+        self.links = []
+        self.next_id = -1
+
+    def _product_id(self, product):
+        # Volcados sin databaseId (fixtures a mano): ids negativos para no chocar
+        if product.get('databaseId') is not None:
+            return int(product['databaseId'])
+        self.next_id -= 1
+        return self.next_id
+
+    def add_product(self, product):
+        product_id = self._product_id(product)
+        variations = _nodes(product.get('variations'))
+        base = {key: value for key, value in product.items() if key != 'variations'}
+        self.products.append((
+            product_id, product.get('slug'), product.get('name'), product.get('type'), product.get('status'),
+            product.get('sku'), product.get('modified'), product.get('price'), product.get('stockStatus'),
+            _dumps(base),
+        ))
+        for category in _nodes(product.get('productCategories')):
+            if category.get('slug'):
+                self.links.append((category['slug'], product_id))
+        self.add_variations(product_id, variations)
+        count('products')
+        if len(self.products) >= BATCH_SIZE:
+            self.flush()
+
+    def add_variations(self, product_id, variations):
+        for position, variation in enumerate(variations):
+            variation_id = variation.get('databaseId')
+            self.variations.append((
+                int(variation_id) if variation_id is not None else None, product_id, position,
+                variation.get('sku'), variation.get('price'), variation.get('stockStatus'), _dumps(variation),
+            ))
+        count('variations', len(variations))
+        if len(self.variations) >= BATCH_SIZE:
+            self.flush()
+
+    def add_category(self, category, parent_slug=None):
+        parent = (category.get('parent') or {}).get('node') or {}
+        children = _nodes(category.get('children'))
+        base = {key: value for key, value in category.items() if key != 'children'}
+        self.categories.append((category.get('slug'), category.get('name'),
+                                parent.get('slug') or parent_slug, _dumps(base)))
+        count('categories')
+        for child in children:
+            self.add_category(child, category.get('slug'))
+
+    def add_document(self, document):
+        products = page_nodes(document, 'products')
+        if products is not None:
+            for product in products:
+                self.add_product(product)
+            return
+        categories = page_nodes(document, 'productCategories')
+        if categories is not None:
+            for category in categories:
+                self.add_category(category)
+            return
+        data = document.get('data') if isinstance(document.get('data'), dict) else document
+        product = data.get('product')
+        if isinstance(product, dict) and product.get('databaseId') is not None:
+            # Página de PRODUCT_VARIATIONS_QUERY: sustituye las variaciones del producto
+            self.flush()
+            product_id = int(product['databaseId'])
+            self.db.execute("DELETE FROM variations WHERE product_id = ?", (product_id,))
+            self.add_variations(product_id, _nodes(product.get('variations')))
+            return
+        if 'slug' in document:
+            # NDJSON con un producto por línea
+            self.add_product(document)
+
+    def flush(self):
+        with span('insert'):
+            # Un producto repetido en dos páginas: prevalece el último
+            self.db.executemany("INSERT OR REPLACE INTO products VALUES (?,?,?,?,?,?,?,?,?,?)", self.products)
+            self.db.executemany("INSERT OR REPLACE INTO variations VALUES (?,?,?,?,?,?,?)", self.variations)
+            # Una categoría aparece como nodo raíz y como hija: se conserva el padre conocido
+            self.db.executemany(
+                "INSERT INTO categories VALUES (?,?,?,?) ON CONFLICT (slug) DO UPDATE SET "
+                "name = excluded.name, parent_slug = COALESCE(excluded.parent_slug, parent_slug), "
+                "data = excluded.data", self.categories)
+            self.db.executemany("INSERT OR IGNORE INTO product_categories VALUES (?,?)", self.links)
+        self.products, self.variations, self.categories, self.links = [], [], [], []
+
+    def finish(self, sources):
+        self.flush()
+        with span('index'):
+            self.db.executescript(INDEXES)
+        meta = {
+            'schema_version': str(SCHEMA_VERSION),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'sources': _dumps(sources),
+        }
+        self.db.executemany("INSERT INTO meta VALUES (?, ?)", meta.items())
+        self.db.commit()
+        self.db.execute("ANALYZE")
+        self.db.close()
+
+
+def ingest(paths, output=None):
+    # Se construye en un temporal y se renombra: los lectores nunca ven una base a medias
+    output = output or SNAPSHOT_FILE
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(output)}.", suffix='.tmp')
+    os.close(fd)
+    os.unlink(tmp_path)
+    try:
+        ingester = Ingester(tmp_path)
+        with span('parse'):
+            for document in iter_documents(paths):
+                ingester.add_document(document)
+        ingester.finish([os.path.abspath(p) for p in paths])
+        os.replace(tmp_path, output)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return output
+
+
+class CatalogStore:
+    def __init__(self, path=None):
+        self.path = path or SNAPSHOT_FILE
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"No catalog snapshot at {self.path} (run catalog_store.py first)")
+        self.db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        version = self.meta().get('schema_version')
+        if version != str(SCHEMA_VERSION):
+            raise ValueError(f"Unsupported catalog snapshot version: {version}")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def meta(self):
+        return dict(self.db.execute("SELECT key, value FROM meta"))
+
+    def count(self, table='products'):
+        if table not in ('products', 'variations', 'categories'):
+            raise ValueError(table)
+        return self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def _with_variations(self, rows):
+        # Productos en orden de id junto con sus variaciones: dos cursores
+        # ordenados por product_id que se recorren a la par (memoria constante)
+        variations = self.db.execute(
+            "SELECT product_id, data FROM variations ORDER BY product_id, position")
+        pending = variations.fetchone()
+        for product_id, data in rows:
+            product = json.loads(data)
+            nodes = []
+            while pending is not None and pending[0] < product_id:
+                pending = variations.fetchone()
+            while pending is not None and pending[0] == product_id:
+                nodes.append(json.loads(pending[1]))
+                pending = variations.fetchone()
+            if nodes:
+                product['variations'] = {'nodes': nodes}
+            yield product
+
+    def iter_products(self, with_variations=True):
+        # Mismo formato que los nodos de GraphQL (ver catalog_dump.iter_products)
+        rows = self.db.execute("SELECT id, data FROM products ORDER BY id")
+        if with_variations:
+            yield from self._with_variations(rows)
+        else:
+            for _, data in rows:
+                yield json.loads(data)
+
+    def _product(self, row):
+        if row is None:
+            return None
+        product = json.loads(row[1])
+        nodes = self.variations(row[0])
+        if nodes:
+            product['variations'] = {'nodes': nodes}
+        return product
+
+    def product(self, slug):
+        return self._product(self.db.execute("SELECT id, data FROM products WHERE slug = ?", (slug,)).fetchone())
+
+    def product_by_id(self, product_id):
+        return self._product(self.db.execute("SELECT id, data FROM products WHERE id = ?", (product_id,)).fetchone())
+
+    def variations(self, product_id):
+        # Todas las variaciones de un item group (el producto padre)
+        rows = self.db.execute(
+            "SELECT data FROM variations WHERE product_id = ? ORDER BY position", (product_id,))
+        return [json.loads(data) for data, in rows]
+
+    def in_category(self, category_slug):
+        rows = self.db.execute(
+            "SELECT p.data FROM product_categories pc JOIN products p ON p.id = pc.product_id "
+            "WHERE pc.category_slug = ? ORDER BY p.id", (category_slug,))
+        return [json.loads(data) for data, in rows]
+
+    def modified_since(self, timestamp):
+        rows = self.db.execute(
+            "SELECT data FROM products WHERE modified > ? ORDER BY modified", (timestamp,))
+        return [json.loads(data) for data, in rows]
+
+    def changes_since(self, old_path):
+        # Diferencias con una instantánea anterior por id y `modified`. Un producto
+        # también cambia si se añade, quita o modifica alguna de sus variaciones.
+        # Devuelve listas de ids de producto ordenadas.
+        self.db.execute("ATTACH DATABASE ? AS old", (f"file:{old_path}?mode=ro",))
+        try:
+            added = [row[0] for row in self.db.execute(
+                "SELECT id FROM products WHERE id NOT IN (SELECT id FROM old.products) ORDER BY id")]
+            removed = [row[0] for row in self.db.execute(
+                "SELECT id FROM old.products WHERE id NOT IN (SELECT id FROM main.products) ORDER BY id")]
+            changed = [row[0] for row in self.db.execute("""
+                SELECT n.id FROM main.products n JOIN old.products o ON o.id = n.id
+                WHERE n.modified IS NOT o.modified OR (n.modified IS NULL AND n.data != o.data)
+                UNION
+                SELECT n.product_id FROM main.variations n LEFT JOIN old.variations o
+                ON o.product_id = n.product_id AND o.position = n.position
+                WHERE o.data IS NULL OR o.data != n.data
+                UNION
+                SELECT o.product_id FROM old.variations o LEFT JOIN main.variations n
+                ON n.product_id = o.product_id AND n.position = o.position
+                WHERE n.data IS NULL
+                INTERSECT
+                SELECT n.id FROM main.products n JOIN old.products o ON o.id = n.id
+                ORDER BY 1""")]
+        finally:
+            self.db.execute("DETACH DATABASE old")
+        return {'added': added, 'changed': changed, 'removed': removed}
+
+    def categories(self):
+        rows = self.db.execute("SELECT slug, name, parent_slug FROM categories ORDER BY slug")
+        return [{'slug': slug, 'name': name, 'parent_slug': parent} for slug, name, parent in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load paginated GraphQL catalog dumps into a SQLite snapshot')
+    parser.add_argument('dumps', nargs='+', help='JSON/NDJSON dump files or directories (optionally .gz)')
+    parser.add_argument('--output', default=SNAPSHOT_FILE, help=f"Snapshot path (default: {SNAPSHOT_FILE})")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profiling('catalog_store', args.profile):
+        start = time.perf_counter()
+        output = ingest(args.dumps, args.output)
+        with CatalogStore(output) as store:
+            print(f"{store.count('products')} products, {store.count('variations')} variations, "
+                  f"{store.count('categories')} categories -> {output} "
+                  f"({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import argparse
+import glob
+import json
+import os
+
+from incremental_output import IncrementalWriter, print_report
+from instrumentation import add_profile_argument, profiling, span
+from project_paths import categories_dir, data_dir
+
+# Empaqueta los JSON de client/src/data/categories en un bundle por sección
+# (primer segmento de la URL) para que el cliente cargue un chunk por sección.
+COMPACT = (',', ':')
+
+# Bloques de nivel superior (ventajasEmpresa, faq...) más cortos que esto no se comparten
+MIN_SHARED_BYTES = 64
+
+
+def bundles_dir():
+    return data_dir('category-bundles')
+
+
+def bundle_index_file():
+    return data_dir('category-bundle-index.json')
+
+
+def bundles_client_pages(pages_dir):
+    # Los bundles del cliente se construyen desde client/src/data/categories: si
+    # las páginas se escriben ahí, su bundle tiene que reescribirse a la vez
+    return os.path.abspath(pages_dir) == os.path.abspath(categories_dir())
+
+
+def section_of(page):
+    parts = page.get('url', '').strip('/').split('/')
+    return parts[0] or 'otros'
+
+
+def load_pages(pages_dir):
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.json'))):
+        with span('parse'), open(path, 'r', encoding='utf-8') as f:
+            pages[os.path.splitext(os.path.basename(path))[0]] = json.load(f)
+    return pages
+
+
+def pack_section(pages):
+    # Los bloques que se repiten literalmente en varias páginas se guardan una vez
+    # en "shared" y en la página quedan como {"$shared": id}
+    usage = {}
+    for page in pages.values():
+        for value in page.values():
+            if isinstance(value, (dict, list)):
+                key = json.dumps(value, ensure_ascii=False, separators=COMPACT, sort_keys=True)
+                if len(key) >= MIN_SHARED_BYTES:
+                    usage[key] = usage.get(key, 0) + 1
+
+    shared = {}
+    ids = {}
+    packed = {}
+    for slug, page in pages.items():
+        packed_page = {}
+        for field, value in page.items():
+            if isinstance(value, (dict, list)):
+                key = json.dumps(value, ensure_ascii=False, separators=COMPACT, sort_keys=True)
+                if usage.get(key, 0) > 1:
+                    if key not in ids:
+                        ids[key] = format(len(ids), 'x')
+                        shared[ids[key]] = value
+                    value = {'$shared': ids[key]}
+            packed_page[field] = value
+        packed[slug] = packed_page
+    return {'shared': shared, 'pages': packed}
+
+
+def load_index(index_file):
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_bundles(pages, only=None):
+    # only: secciones a empaquetar (por defecto, todas); el índice siempre es completo
+    sections = {}
+    for slug, page in pages.items():
+        if only is None or section_of(page) in only:
+            sections.setdefault(section_of(page), {})[slug] = page
+    bundles = {section: pack_section(section_pages) for section, section_pages in sorted(sections.items())}
+    index = {slug: section_of(page) for slug, page in sorted(pages.items())}
+    return bundles, index
+
+
+def affected_sections(changed, pages, previous_index):
+    # Sección actual y anterior de cada página escrita o borrada (una página
+    # que cambia de URL sale de un bundle y entra en otro)
+    sections = set()
+    for name in changed:
+        slug = os.path.splitext(os.path.basename(name))[0]
+        if slug in pages:
+            sections.add(section_of(pages[slug]))
+        if slug in previous_index:
+            sections.add(previous_index[slug])
+    return sections
+
+
+def write_bundles(pages_dir=None, output_dir=None, index_file=None, changed=None):
+    # changed: archivos de página escritos o borrados; si se indica, solo se
+    # reempaquetan sus secciones y el resto de bundles se deja como está
+    pages = load_pages(pages_dir or categories_dir())
+    index_file = index_file or bundle_index_file()
+    only = None if changed is None else affected_sections(changed, pages, load_index(index_file))
+    with span('pack'):
+        bundles, index = build_bundles(pages, only)
+
+    writer = IncrementalWriter('category-bundles', output_dir or bundles_dir())
+    for section, bundle in bundles.items():
+        writer.write_json(f"{section}.json", bundle, separators=COMPACT)
+    for section in sorted((only or set()) - set(bundles)):
+        writer.delete(f"{section}.json")
+    report = writer.finish(prune=only is None)
+
+    index_writer = IncrementalWriter('category-bundle-index', os.path.dirname(index_file))
+    index_writer.write_json(os.path.basename(index_file), index, separators=COMPACT)
+    index_report = index_writer.finish()
+    for key in report:
+        report[key].extend(index_report[key])
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Empaqueta los JSON de categorías en un bundle por sección')
+    parser.add_argument('--pages-dir', default=None)
+    parser.add_argument('--output-dir', default=None)
+    parser.add_argument('--index-file', default=None)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profiling('category_bundles', args.profile):
+        report = write_bundles(args.pages_dir, args.output_dir, args.index_file)
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import argparse
+import json
+from collections import Counter
+
+from incremental_output import atomic_write
+from instrumentation import add_profile_argument, count, profiling, span
+from project_paths import data_dir, project_path
+
+# Índice compacto del árbol de categorías de WooCommerce.
+# Los nodos se guardan en preorden, así los descendientes de i son el rango
+# contiguo i+1 .. end[i]-1 y todas las consultas son O(1) (o O(k) en la salida).
+# Lo lee search_index.py; el cliente no carga el árbol.
+INDEX_VERSION = 1
+
+
+def index_file():
+    return data_dir('category-index.json')
+
+
+def load_sources(real_categories_file, all_categories_file):
+    with open(real_categories_file, 'r', encoding='utf-8') as f:
+        tree = json.load(f)['data']['productCategories']['nodes']
+    with open(all_categories_file, 'r', encoding='utf-8') as f:
+        flat = json.load(f)
+    return tree, flat
+
+
+def build_index(tree, flat):
+    # Nombres: all_categories_full.json es la lista completa; el árbol añade padres/hijos
+    names = {}
+    for category in flat:
+        names.setdefault(category['slug'], category['name'])
+
+    children = {}
+    parent_of = {}
+    for node in tree:
+        names.setdefault(node['slug'], node['name'])
+        for child in (node.get('children') or {}).get('nodes') or []:
+            names.setdefault(child['slug'], child['name'])
+            if child['slug'] in parent_of or child['slug'] == node['slug']:
+                continue
+            parent_of[child['slug']] = node['slug']
+            children.setdefault(node['slug'], []).append(child['slug'])
+
+    # Raíces: las que no cuelgan de nadie, en el orden alfabético de la fuente
+    order = list(names)
+    roots = [slug for slug in order if slug not in parent_of]
+
+    slugs = []
+    parent = []
+    depth = []
+    end = []
+    position = {}
+
+    # Recorrido en preorden iterativo (sin recursión, apto para árboles profundos).
+    # Los nodos que no se alcanzan desde una raíz (ciclos en la fuente) se tratan como raíces.
+    for root in roots + order:
+        if root in position:
+            continue
+        stack = [(root, -1, 0)]
+        pending_ends = []
+        while stack:
+            slug, parent_index, level = stack.pop()
+            if slug in position:
+                continue
+            while pending_ends and depth[pending_ends[-1]] >= level:
+                end[pending_ends.pop()] = len(slugs)
+            index = len(slugs)
+            position[slug] = index
+            slugs.append(slug)
+            parent.append(parent_index)
+            depth.append(level)
+            end.append(index + 1)
+            pending_ends.append(index)
+            for child in reversed(children.get(slug, [])):
+                stack.append((child, index, level + 1))
+        for index in pending_ends:
+            end[index] = len(slugs)
+
+    node_names = [names[slug] for slug in slugs]
+    ancestors = []
+    for index in range(len(slugs)):
+        path = [] if parent[index] < 0 else ancestors[parent[index]] + [parent[index]]
+        ancestors.append(path)
+
+    labels = disambiguate(node_names, parent, slugs)
+    duplicates = {}
+    for index, name in enumerate(node_names):
+        duplicates.setdefault(name, []).append(index)
+    duplicates = {name: indexes for name, indexes in duplicates.items() if len(indexes) > 1}
+
+    return {
+        'version': INDEX_VERSION,
+        'slugs': slugs,
+        'names': node_names,
+        'labels': labels,
+        'parent': parent,
+        'depth': depth,
+        'end': end,
+        'ancestors': ancestors,
+        'duplicates': duplicates,
+    }
+
+
+def disambiguate(names, parent, slugs):
+    # "Abrigos" x3 -> "Abrigos (w_coats)", "Abrigos (coats)", "Abrigos (subcoats)":
+    # nombre del padre cuando aporta algo, si no el slug
+    counts = Counter(names)
+    labels = []
+    for index, name in enumerate(names):
+        if counts[name] == 1:
+            labels.append(name)
+        elif parent[index] >= 0 and names[parent[index]] != name:
+            labels.append(f"{name} ({names[parent[index]]})")
+        else:
+            labels.append(f"{name} ({slugs[index]})")
+    # Si aun así chocan, el slug resuelve cualquier empate
+    label_counts = Counter(labels)
+    return [
+        label if label_counts[label] == 1 else f"{names[index]} ({slugs[index]})"
+        for index, label in enumerate(labels)
+    ]
+
+
+class CategoryIndex:
+    def __init__(self, data):
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported category index version: {data.get('version')}")
+        self.data = data
+        self.slugs = data['slugs']
+        self.position = {slug: index for index, slug in enumerate(self.slugs)}
+        self.name_map = {}
+        for slug, name in zip(self.slugs, data['names']):
+            self.name_map.setdefault(name, []).append(slug)
+
+    @classmethod
+    def load(cls, path=None):
+        with open(path or index_file(), 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __contains__(self, slug):
+        return slug in self.position
+
+    def node(self, slug):
+        index = self.position[slug]
+        data = self.data
+        return {
+            'slug': slug,
+            'name': data['names'][index],
+            'label': data['labels'][index],
+            'parent': self.slugs[data['parent'][index]] if data['parent'][index] >= 0 else None,
+            'depth': data['depth'][index],
+        }
+
+    def ancestors(self, slug):
+        return [self.slugs[i] for i in self.data['ancestors'][self.position[slug]]]
+
+    def descendants(self, slug):
+        index = self.position[slug]
+        return self.slugs[index + 1:self.data['end'][index]]
+
+    def children(self, slug):
+        index = self.position[slug]
+        depth = self.data['depth'][index] + 1
+        return [s for i, s in enumerate(self.descendants(slug), index + 1) if self.data['depth'][i] == depth]
+
+    def depth(self, slug):
+        return self.data['depth'][self.position[slug]]
+
+    def by_name(self, name):
+        # Todas las categorías con ese nombre (varias si está duplicado)
+        return list(self.name_map.get(name, ()))
+
+
+def build(args):
+    with span('parse'):
+        tree, flat = load_sources(args.real_categories, args.all_categories)
+    with span('render'):
+        index = build_index(tree, flat)
+    output = args.output or index_file()
+    with span('serialize'):
+        data = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with span('write'):
+        atomic_write(output, data)
+    count('files_written')
+    count('bytes_out', len(data))
+    print(f"Índice de {len(index['slugs'])} categorías ({len(index['duplicates'])} nombres duplicados) en {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compila real_categories.json + all_categories_full.json en un índice')
+    parser.add_argument('--real-categories', default=project_path('real_categories.json'))
+    parser.add_argument('--all-categories', default=project_path('all_categories_full.json'))
+    parser.add_argument('--output', default=None)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profiling('category_index', args.profile):
+        build(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import argparse
+import glob
+import json
+import os
+
+from incremental_output import IncrementalWriter, manifest_files, print_report
+from instrumentation import add_profile_argument, profiling, span
+from project_paths import categories_dir, data_dir
+
+# Tabla ruta completa -> archivo de datos (stem de client/src/data/categories).
+# El cliente resuelve la URL con una sola búsqueda en vez de adivinar por el
+# último segmento, así /camisetas/manga-corta y /polos/manga-corta no chocan.
+COMPACT = (',', ':')
+
+
+class RouteCollisionError(ValueError):
+    pass
+
+
+def routes_file(pages_dir=None):
+    # La tabla va junto al directorio de páginas (client/src/data/category-routes.json)
+    if pages_dir is None:
+        return data_dir('category-routes.json')
+    return os.path.join(os.path.dirname(os.path.abspath(pages_dir)), 'category-routes.json')
+
+
+def redirects_file(pages_dir=None):
+    # Junto a la tabla de rutas (client/src/data/category-redirects.json)
+    if pages_dir is None:
+        return data_dir('category-redirects.json')
+    return os.path.join(os.path.dirname(os.path.abspath(pages_dir)), 'category-redirects.json')
+
+
+def normalize_route(url):
+    return '/' + url.strip('/')
+
+
+def scan_pages(pages_dir):
+    # {stem: url} de los JSON que ya hay en el directorio
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.json'))):
+        with span('parse'), open(path, 'r', encoding='utf-8') as f:
+            url = json.load(f).get('url')
+        if url:
+            pages[os.path.splitext(os.path.basename(path))[0]] = url
+    return pages
+
+
+def build_route_table(pages):
+    # pages: {stem: url}. Dos archivos con la misma ruta es un error de build.
+    routes = {}
+    collisions = []
+    for stem, url in sorted(pages.items()):
+        route = normalize_route(url)
+        if route in routes:
+            collisions.append(f"{route}: {routes[route]}.json y {stem}.json")
+        else:
+            routes[route] = stem
+    if collisions:
+        raise RouteCollisionError("Rutas duplicadas:\n  " + "\n  ".join(collisions))
+    return dict(sorted(routes.items()))
+
+
+def check_routes(pages_dir, planned, owner):
+    # Comprueba el directorio tal como quedará tras escribir `planned` [(stem, url)],
+    # antes de tocar nada en disco. Un archivo que ya existe con otra ruta y que no
+    # escribió `owner` (una página mantenida a mano o de otro productor) es una colisión.
+    pages = scan_pages(pages_dir) if os.path.isdir(pages_dir) else {}
+    owned = manifest_files(owner, pages_dir)
+    stems = {}
+    collisions = []
+    for stem, url in planned:
+        route = normalize_route(url)
+        if stem in stems and stems[stem] != route:
+            collisions.append(f"{stem}.json: {stems[stem]} y {route}")
+        elif stem in pages and f"{stem}.json" not in owned and normalize_route(pages[stem]) != route:
+            collisions.append(f"{stem}.json: {normalize_route(pages[stem])} (existente) y {route}")
+        stems[stem] = route
+    if collisions:
+        raise RouteCollisionError("Archivos de datos con dos rutas:\n  " + "\n  ".join(collisions))
+    pages.update(stems)
+    with span('routes'):
+        return build_route_table(pages)
+
+
+def write_route_table(pages_dir=None, output_file=None):
+    pages_dir = pages_dir or categories_dir()
+    pages = scan_pages(pages_dir)
+    with span('routes'):
+        routes = build_route_table(pages)
+    output_file = output_file or routes_file(pages_dir)
+    writer = IncrementalWriter('category-routes', os.path.dirname(output_file))
+    writer.write_json(os.path.basename(output_file), routes, separators=COMPACT)
+    return writer.finish()
+
+
+def build_redirect_table(routes, redirects):
+    # redirects: {ruta antigua: stem de la página canónica}. La ruta antigua no puede
+    # tener página propia y la canónica tiene que existir.
+    urls = {stem: route for route, stem in routes.items()}
+    table = {}
+    errors = []
+    for url, stem in sorted(redirects.items()):
+        route = normalize_route(url)
+        if route in routes:
+            errors.append(f"{route}: es la ruta de {routes[route]}.json")
+        elif stem not in urls:
+            errors.append(f"{route}: {stem}.json no existe")
+        else:
+            table[route] = urls[stem]
+    if errors:
+        raise RouteCollisionError("Redirecciones no válidas:\n  " + "\n  ".join(errors))
+    return table
+
+
+def write_redirect_table(redirects, pages_dir=None, output_file=None):
+    pages_dir = pages_dir or categories_dir()
+    with span('routes'):
+        table = build_redirect_table(build_route_table(scan_pages(pages_dir)), redirects)
+    output_file = output_file or redirects_file(pages_dir)
+    writer = IncrementalWriter('category-redirects', os.path.dirname(output_file))
+    writer.write_json(os.path.basename(output_file), table, separators=COMPACT)
+    return writer.finish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Genera la tabla ruta -> JSON de categoría')
+    parser.add_argument('--pages-dir', default=None)
+    parser.add_argument('--output', default=None)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profiling('category_routes', args.profile):
+        try:
+            report = write_route_table(args.pages_dir, args.output)
+        except RouteCollisionError as e:
+            raise SystemExit(f"Error: {e}")
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
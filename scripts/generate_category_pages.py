@@ -0,0 +1,225 @@
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from category_bundles import bundles_client_pages, write_bundles
+from category_routes import RouteCollisionError, check_routes, write_redirect_table, write_route_table
+from incremental_output import IncrementalWriter, print_report, save_report
+from instrumentation import add_profile_argument, collect, merge, profiling, span
+from project_paths import categories_dir
+from related_categories import related_categories
+
+# Definiciones de cada vertical (prefijo de URL, bloques de texto, FAQ y categorías).
+# "redirects" ([slug, parent_slug, página canónica]) lleva la URL que tendría esa
+# categoría a una página que ya existe, en vez de generar un duplicado
+DEFINITIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'category_pages')
+
+# Por defecto siblings_intents se calcula (las páginas más parecidas de todas las
+# verticales); con --siblings definition se usa la lista de la definición
+RELATED_SIBLINGS = 5
+
+def load_definitions(names=None):
+    definitions = []
+    for path in sorted(glob.glob(os.path.join(DEFINITIONS_DIR, '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            definition = json.load(f)
+        if names and definition['prefix'] not in names:
+            continue
+        definitions.append(definition)
+    return definitions
+
+
+def with_related_siblings(definitions, k=RELATED_SIBLINGS):
+    # Sustituye la lista fija de hermanos de cada categoría por las intenciones de
+    # búsqueda de las k páginas más parecidas de todas las verticales (si ninguna
+    # llega a MIN_SCORE, se queda la lista de la definición)
+    entries = [(d_index, e_index, entry) for d_index, definition in enumerate(definitions)
+               for e_index, entry in enumerate(definition['categories'])]
+    related = related_categories([f"{entry[1]} {entry[3]}" for _, _, entry in entries],
+                                 [(definitions[d]['prefix'], entry[2]) for d, _, entry in entries], k)
+    updated = [dict(definition, categories=list(definition['categories'])) for definition in definitions]
+    for (d_index, e_index, entry), indices in zip(entries, related):
+        siblings = [entries[j][2][3] for j in indices] or entry[4]
+        updated[d_index]['categories'][e_index] = [*entry[:4], siblings, *entry[5:]]
+    return updated
+
+
+def compile_template(node):
+    # Convierte la plantilla en una función que recibe los valores de la página.
+    # Los subárboles sin marcadores se reutilizan tal cual en todas las páginas.
+    if isinstance(node, str):
+        if '{' not in node:
+            return None
+        return lambda values: node.format_map(values)
+    if isinstance(node, dict):
+        parts = [(key, value, compile_template(value)) for key, value in node.items()]
+        if all(render is None for _, _, render in parts):
+            return None
+        return lambda values: {
+            key: (value if render is None else render(values)) for key, value, render in parts
+        }
+    if isinstance(node, list):
+        parts = [(value, compile_template(value)) for value in node]
+        if all(render is None for _, render in parts):
+            return None
+        return lambda values: [
+            value if render is None else render(values) for value, render in parts
+        ]
+    return None
+
+
+def page_url(definition, slug, parent_slug):
+    prefix = definition['prefix']
+    if definition.get('url_style') == 'flat' or parent_slug == prefix:
+        return f"/{prefix}/{slug}/"
+    return f"/{prefix}/{parent_slug}/{slug}/"
+
+
+def definition_redirects(definitions):
+    # {URL que tendría la página: stem de la página canónica}
+    return {page_url(definition, slug, parent_slug): stem
+            for definition in definitions
+            for slug, parent_slug, stem in definition.get('redirects', [])}
+
+
+def compile_definition(definition):
+    template = definition['template']
+    renderers = [(key, value, compile_template(value)) for key, value in template.items()]
+
+    def create_category_data(slug, title, parent_slug, search_intent, siblings):
+        values = {'title': title, 'title_lower': title.lower(), 'slug': slug}
+        data = {
+            "url": page_url(definition, slug, parent_slug),
+            "slug": slug,
+            "parent_slug": parent_slug,
+            "search_intent": search_intent,
+            "siblings_intents": siblings,
+            "hero_tituloPrincipal": title,
+        }
+        for key, value, render in renderers:
+            data[key] = value if render is None else render(values)
+        return data
+
+    return create_category_data
+
+
+def render_pages(definitions):
+    # Devuelve (nombre de archivo, URL, JSON serializado) para cada página.
+    # El sexto elemento opcional de cada categoría es el nombre del archivo
+    # (por defecto el slug), para que dos páginas con el mismo slug no se pisen.
+    rendered = []
+    for definition in definitions:
+        create_category_data = compile_definition(definition)
+        for entry in definition['categories']:
+            with span('render'):
+                page = create_category_data(*entry[:5])
+            stem = entry[5] if len(entry) > 5 else page['slug']
+            with span('serialize'):
+                text = json.dumps(page, indent=2, ensure_ascii=False)
+            rendered.append((f"{stem}.json", page['url'], text))
+    return rendered
+
+
+def _render_chunk(args):
+    definition, entries = args
+    return render_pages([dict(definition, categories=entries)])
+
+
+def render_pages_parallel(definitions, jobs):
+    # Reparte las categorías de todas las verticales en bloques entre procesos
+    chunks = []
+    for definition in definitions:
+        entries = definition['categories']
+        size = max(1, len(entries) // (jobs * 4))
+        for start in range(0, len(entries), size):
+            chunks.append((definition, entries[start:start + size]))
+
+    rendered = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(collect, _render_chunk, chunk) for chunk in chunks]
+        for future in futures:
+            result, timings = future.result()
+            merge(timings)
+            rendered.extend(result)
+    return rendered
+
+
+def generate(args):
+    output_dir = args.output_dir or categories_dir()
+
+    with span('parse'):
+        # Los relacionados se buscan en todas las verticales aunque se genere solo una
+        definitions = load_definitions(None if args.siblings == 'related' else args.vertical)
+    if args.siblings == 'related':
+        definitions = with_related_siblings(definitions)
+        if args.vertical:
+            definitions = [d for d in definitions if d['prefix'] in args.vertical]
+    if args.jobs > 1:
+        rendered = render_pages_parallel(definitions, args.jobs)
+    else:
+        rendered = render_pages(definitions)
+
+    # Antes de escribir nada: cada ruta debe ir a un único archivo y viceversa
+    try:
+        check_routes(output_dir, [(os.path.splitext(filename)[0], url) for filename, url, _ in rendered],
+                     'category-pages')
+    except RouteCollisionError as e:
+        raise SystemExit(f"Error: {e}")
+
+    pages = {}
+    for filename, url, text in rendered:
+        if filename in pages:
+            print(f"Aviso: {filename} se genera más de una vez; prevalece la última versión")
+        pages[filename] = text
+
+    writer = IncrementalWriter('category-pages', output_dir)
+    for filename, text in pages.items():
+        writer.write_text(filename, text)
+
+    # Con --vertical solo se genera una parte: no se borra lo de las demás verticales
+    report = writer.finish(prune=not args.vertical)
+    print_report(report, verbose=args.verbose)
+    if args.report:
+        save_report(report, args.report)
+
+    print("Tabla de rutas:")
+    print_report(write_route_table(output_dir), verbose=args.verbose)
+
+    # Las redirecciones de todas las verticales, aunque se genere solo una
+    print("Redirecciones:")
+    try:
+        report = write_redirect_table(definition_redirects(load_definitions()), output_dir)
+    except RouteCollisionError as e:
+        raise SystemExit(f"Error: {e}")
+    print_report(report, verbose=args.verbose)
+
+    if args.bundle or bundles_client_pages(output_dir):
+        print("Bundles por sección:")
+        print_report(write_bundles(output_dir), verbose=args.verbose)
+
+    print(f"Generación completada: {len(rendered)} páginas de {len(definitions)} verticales.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Genera los JSON de categorías de todas las verticales')
+    parser.add_argument('--vertical', action='append', help='Prefijo de la vertical a generar (por defecto, todas)')
+    parser.add_argument('--output-dir', default=None, help='Directorio de destino de los JSON')
+    parser.add_argument('--jobs', type=int, default=1, help='Número de procesos para renderizar')
+    parser.add_argument('--report', help='Guarda el informe de archivos escritos/omitidos/borrados en JSON')
+    parser.add_argument('--verbose', action='store_true', help='Lista también los archivos sin cambios')
+    parser.add_argument('--bundle', action='store_true',
+                        help='Empaqueta las páginas en un bundle por sección (category-bundles/) aunque '
+                             'se escriban fuera de client/src/data/categories')
+    parser.add_argument('--siblings', choices=('related', 'definition'), default='related',
+                        help='siblings_intents: las páginas más parecidas (por defecto) o la lista fija de la definición')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profiling('generate_category_pages', args.profile):
+        generate(args)
+
+
+if __name__ == "__main__":
+    main()
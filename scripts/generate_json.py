@@ -1,41 +1,49 @@
+import argparse
 import json
 import re
 from urllib.parse import urlparse
 
-# Leer el archivo de texto
-with open('/home/ubuntu/upload/categorias.txt', 'r') as f:
-    lines = f.readlines()
+from instrumentation import add_profile_argument, count, profiling, span
+from project_paths import data_dir, project_path
+from related_categories import related_categories
+
+# Rutas por defecto
+INPUT_FILE = project_path('categorias.txt')
+SEO_SITEMAP_FILE = data_dir('seo-sitemap.json')
+DYNAMIC_BLOCKS_FILE = data_dir('dynamic-blocks.json')
+
+# Número máximo de hermanos por categoría (para no saturar)
+MAX_SIBLINGS = 5
+
+URL_PATTERN = re.compile(r'(https://impacto33\.com/[^\s]+)')
 
-# Estructuras de datos
-seo_sitemap = []
-dynamic_blocks = []
 
 # Función para limpiar y extraer datos de cada línea
 def parse_line(line):
     # Buscar URL (empieza por https://)
-    match = re.search(r'(https://impacto33\.com/[^\s]+)', line)
+    match = URL_PATTERN.search(line)
     if not match:
         return None
-    
+
     full_url = match.group(1)
-    
+
     # Extraer el nombre (todo lo que hay antes de la URL)
     name = line[:match.start()].strip()
-    
+
     # Parsear URL para obtener path y slug
     parsed_url = urlparse(full_url)
     path = parsed_url.path
-    
+
     # Eliminar slashes iniciales y finales para procesar
     clean_path = path.strip('/')
     parts = clean_path.split('/')
-    
+
     slug = parts[-1] if parts else ""
     parent_slug = parts[-2] if len(parts) > 1 else ""
-    
+
     # Determinar tipo
     tipo = "categoria_hija" if parent_slug else "categoria_madre"
-    
+
     return {
         "name": name,
         "url": path, # Guardamos el path relativo como pide el sistema (/categoria/)
@@ -45,84 +53,131 @@ def parse_line(line):
         "full_url": full_url
     }
 
-# Procesar líneas
-items = []
-for line in lines:
-    item = parse_line(line)
-    if item:
-        items.append(item)
-
-# Construir estructura jerárquica para identificar hijos
-# Primero, crear un diccionario de padres para fácil acceso
-parents_map = {item['slug']: item for item in items if item['tipo'] == 'categoria_madre'}
-
-# Segundo paso: Construir el JSON final
-for item in items:
-    # Generar search_intent (usamos el nombre como base)
-    search_intent = item['name'].lower()
-    
-    # Generar siblings (hermanos)
-    siblings_intents = []
-    if item['parent_slug']:
-        # Si es hija, sus hermanos son los que tienen el mismo padre
-        siblings = [s['name'].lower() for s in items if s['parent_slug'] == item['parent_slug'] and s['slug'] != item['slug']]
-        siblings_intents = siblings[:5] # Limitamos a 5 para no saturar
-    else:
-        # Si es madre, sus hermanos son otras madres
-        siblings = [s['name'].lower() for s in items if not s['parent_slug'] and s['slug'] != item['slug']]
-        siblings_intents = siblings[:5]
-
-    # Construir objeto SEO
-    seo_entry = {
-        "url": item['url'],
-        "slug": item['slug'],
-        "parent_slug": item['parent_slug'],
-        "search_intent": search_intent,
-        "siblings_intents": siblings_intents,
-        "tipo": item['tipo'],
-        "anchor": item['name'] # Añadido para facilitar visualización
-    }
 
-    # Si es madre, buscar sus hijos
-    if item['tipo'] == 'categoria_madre':
-        children = []
-        for child in items:
-            if child['parent_slug'] == item['slug']:
-                children.append({
-                    "url": child['url'],
-                    "anchor": child['name']
-                })
-        if children:
-            seo_entry['children'] = children
-
-    # Si es hija, añadir referencia al padre
-    if item['tipo'] == 'categoria_hija':
-        seo_entry['parent'] = f"/{item['parent_slug']}/"
-
-    seo_sitemap.append(seo_entry)
-
-    # Construir objeto Dynamic Block
-    # Asumimos que el slug de catálogo es similar al slug de la URL
-    # En un caso real, esto podría requerir un mapeo manual si difieren mucho
-    catalog_slug = item['slug']
-    
-    # Ajustes manuales comunes si fuera necesario (ej: 'camisetas-personalizadas' -> 'camisetas')
-    # Por ahora usamos el slug directo
-    
-    block_entry = {
-        "url": item['url'],
-        "catalog_category_slug": catalog_slug,
-        "limit": 12, # Aumentamos un poco el límite por defecto
-        "columns": 4
-    }
-    dynamic_blocks.append(block_entry)
+# Procesar líneas sin cargar el archivo entero en memoria
+def parse_lines(lines):
+    for line in lines:
+        item = parse_line(line)
+        if item:
+            yield item
+
+
+def first_siblings(group, slug):
+    # Los primeros MAX_SIBLINGS del grupo, excluyendo la propia categoría
+    siblings = []
+    for s in group:
+        if s['slug'] != slug:
+            siblings.append(s['name'].lower())
+            if len(siblings) == MAX_SIBLINGS:
+                break
+    return siblings
+
+
+def related_items(items):
+    # Las MAX_SIBLINGS categorías más parecidas de todo el catálogo, con extra
+    # para las del mismo padre (ver related_categories.py)
+    related = related_categories([item['name'] for item in items],
+                                 [item['parent_slug'] for item in items], MAX_SIBLINGS)
+    return [[items[j] for j in indices] for indices in related]
+
+
+def build_structures(items, siblings='related'):
+    # siblings='first': los primeros hermanos en orden del archivo;
+    # 'related': las categorías más parecidas (y enlaces internos en 'related')
+    items = list(items)
+    related = related_items(items) if siblings == 'related' else None
+
+    # Índice padre -> hijos en una sola pasada (las madres cuelgan de "")
+    children_by_parent = {}
+    for item in items:
+        children_by_parent.setdefault(item['parent_slug'], []).append(item)
+
+    seo_sitemap = []
+    dynamic_blocks = []
+
+    for index, item in enumerate(items):
+        # Generar search_intent (usamos el nombre como base)
+        search_intent = item['name'].lower()
+
+        if related is not None:
+            siblings_intents = [other['name'].lower() for other in related[index]]
+        else:
+            # Hermanos: los que tienen el mismo padre (si es madre, las otras madres)
+            siblings_intents = first_siblings(children_by_parent[item['parent_slug']], item['slug'])
+
+        # Construir objeto SEO
+        seo_entry = {
+            "url": item['url'],
+            "slug": item['slug'],
+            "parent_slug": item['parent_slug'],
+            "search_intent": search_intent,
+            "siblings_intents": siblings_intents,
+            "tipo": item['tipo'],
+            "anchor": item['name'] # Añadido para facilitar visualización
+        }
+        if related is not None and related[index]:
+            seo_entry['related'] = [{"url": other['url'], "anchor": other['name']} for other in related[index]]
+
+        # Si es madre, añadir sus hijos
+        if item['tipo'] == 'categoria_madre':
+            children = [
+                {"url": child['url'], "anchor": child['name']}
+                for child in children_by_parent.get(item['slug'], ())
+            ]
+            if children:
+                seo_entry['children'] = children
+
+        # Si es hija, añadir referencia al padre
+        if item['tipo'] == 'categoria_hija':
+            seo_entry['parent'] = f"/{item['parent_slug']}/"
+
+        seo_sitemap.append(seo_entry)
+
+        # Construir objeto Dynamic Block
+        # Asumimos que el slug de catálogo es similar al slug de la URL
+        # En un caso real, esto podría requerir un mapeo manual si difieren mucho
+        block_entry = {
+            "url": item['url'],
+            "catalog_category_slug": item['slug'],
+            "limit": 12, # Aumentamos un poco el límite por defecto
+            "columns": 4
+        }
+        dynamic_blocks.append(block_entry)
+
+    return seo_sitemap, dynamic_blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Genera seo-sitemap.json y dynamic-blocks.json desde categorias.txt')
+    parser.add_argument('--input', default=INPUT_FILE)
+    parser.add_argument('--seo-sitemap', default=SEO_SITEMAP_FILE)
+    parser.add_argument('--dynamic-blocks', default=DYNAMIC_BLOCKS_FILE)
+    parser.add_argument('--siblings', choices=('related', 'first'), default='related',
+                        help='siblings_intents: the most similar categories (default) or the first siblings '
+                             'in file order')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profiling('generate_json', args.profile):
+        # Leer el archivo de texto línea a línea
+        with span('parse'), open(args.input, 'r') as f:
+            items = list(parse_lines(f))
+
+        with span('render'):
+            seo_sitemap, dynamic_blocks = build_structures(items, args.siblings)
+
+        # Guardar archivos
+        for path, data in ((args.seo_sitemap, seo_sitemap), (args.dynamic_blocks, dynamic_blocks)):
+            with span('serialize'):
+                text = json.dumps(data, indent=2, ensure_ascii=False)
+            with span('write'), open(path, 'w') as f:
+                f.write(text)
+            count('files_written')
+            count('bytes_out', len(text.encode('utf-8')))
 
-# Guardar archivos
-with open('/home/ubuntu/impacto33-mvp/client/src/data/seo-sitemap.json', 'w') as f:
-    json.dump(seo_sitemap, f, indent=2, ensure_ascii=False)
+        print(f"Generados {len(seo_sitemap)} entradas en seo-sitemap.json")
+        print(f"Generados {len(dynamic_blocks)} entradas en dynamic-blocks.json")
 
-with open('/home/ubuntu/impacto33-mvp/client/src/data/dynamic-blocks.json', 'w') as f:
-    json.dump(dynamic_blocks, f, indent=2, ensure_ascii=False)
 
-print(f"Generados {len(seo_sitemap)} entradas en seo-sitemap.json")
-print(f"Generados {len(dynamic_blocks)} entradas en dynamic-blocks.json")
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,48 @@
+import argparse
+import fnmatch
+import hashlib
+import json
 import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
 from PIL import Image
 
+from adaptive_encoding import MAX_QUALITY, MIN_QUALITY, adaptive_settings, encode_adaptive
+from image_dedupe import CANONICAL_MAP_FILE, THRESHOLD, canonical_map, find_clusters, hash_images, write_canonical_map
+from image_placeholders import PLACEHOLDERS_FILE, image_placeholder, write_placeholders
+from incremental_output import atomic_write, file_hash
+from instrumentation import add_profile_argument, collect, count, merge, profiling, span
+from project_paths import data_dir, project_path
+
 # Configuración
-INPUT_DIR = '/home/ubuntu/impacto33-mvp/client/public/images'
-OUTPUT_DIR = '/home/ubuntu/impacto33-mvp/client/public/images'
+INPUT_DIR = project_path('client', 'public', 'images')
+OUTPUT_DIR = project_path('client', 'public', 'images')
 SIZES = {
     'mobile': 480,
     'tablet': 768,
     'desktop': 1200
 }
+QUALITY = 85
+# Sube al cambiar cómo se generan las renditions (sin ampliar, con alfa)
+RENDITIONS_VERSION = 2
+NOT_FOUND = "File not found"
+FORMATS = ('source', 'webp')
+
+# Manifiesto de renditions ya generadas (hash del original + ajustes)
+MANIFEST_FILE = project_path('.build-cache', 'responsive-images.json')
+
+# Manifiesto para el cliente (srcset, sizes y dimensiones intrínsecas)
+SRCSET_MANIFEST_FILE = data_dir('responsive-images.json')
+PUBLIC_PREFIX = '/images'
+
+# Descubrimiento de imágenes con --all (patrones fnmatch sobre rutas relativas)
+DEFAULT_INCLUDE = ['*.jpg', '*.jpeg', '*.png']
+DEFAULT_EXCLUDE = []
+
+# Filas de salida por franja en reduce_in_strips()
+REDUCE_STRIP_ROWS = 64
+
+EXTENSION_FORMATS = {'.jpg': 'jpeg', '.jpeg': 'jpeg', '.png': 'png', '.webp': 'webp'}
 
 # Imágenes clave a procesar (rutas relativas a INPUT_DIR)
 KEY_IMAGES = [
@@ -23,52 +57,521 @@ KEY_IMAGES = [
     'services/transfer-dtf.jpg'
 ]
 
-def process_image(image_path):
+
+def target_sizes(width, height):
+    # De mayor a menor: la primera se genera desde el original y el resto en cascada.
+    # Nunca se amplía: los breakpoints más anchos que el original no se generan y,
+    # si el original es más estrecho que todos (iconos, logos), queda una sola
+    # rendición del breakpoint más pequeño a su tamaño
+    aspect_ratio = height / width
+    sizes = [(name, w, max(1, int(w * aspect_ratio))) for name, w in SIZES.items() if w <= width]
+    if not sizes:
+        sizes = [(min(SIZES, key=SIZES.get), width, height)]
+    return sorted(sizes, key=lambda size: size[1], reverse=True)
+
+
+def has_alpha(img):
+    # RGBA/LA/PA, o paleta / RGB con color transparente (tRNS)
+    return img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+
+
+def rendition(filename, img):
+    fmt = EXTENSION_FORMATS.get(os.path.splitext(filename)[1].lower(), 'jpeg')
+    return {'file': filename, 'format': fmt, 'width': img.width, 'height': img.height}
+
+
+def save_adaptive(img, fmt, path, size_name, encoding):
+    # Calidad elegida por rendición (ver adaptive_encoding.py); el registro va al manifiesto
+    data, record = encode_adaptive(img, fmt, encoding, encoding['budgets'].get(size_name), QUALITY)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return record
+
+
+def save_renditions(img, base_name, ext, size_name, output_dir, encoding=None):
+    generated = []
+
+    # Guardar versión optimizada
+    output_filename = f"{base_name}-{size_name}{ext}"
+    output_path = os.path.join(output_dir, output_filename)
+
+    # Asegurar que el directorio de salida existe
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    if encoding:
+        fmt = EXTENSION_FORMATS.get(ext.lower(), 'jpeg')
+        record = save_adaptive(img, fmt, output_path, size_name, encoding)
+        generated.append(dict(rendition(output_filename, img), **record))
+    else:
+        with span('encode'):
+            img.save(output_path, quality=QUALITY, optimize=True)
+        generated.append(rendition(output_filename, img))
+
+    # También generar versión WebP
+    webp_filename = f"{base_name}-{size_name}.webp"
+    webp_path = os.path.join(output_dir, webp_filename)
+    if encoding:
+        record = save_adaptive(img, 'webp', webp_path, size_name, encoding)
+        generated.append(dict(rendition(webp_filename, img), **record))
+    else:
+        with span('encode_webp'):
+            img.save(webp_path, format='WEBP', quality=QUALITY)
+        generated.append(rendition(webp_filename, img))
+
+    count('files_written', 2)
+    count('bytes_out', os.path.getsize(output_path) + os.path.getsize(webp_path))
+
+    return generated
+
+
+def reduce_factor(width, height, target_width, target_height):
+    # Mayor factor entero que sigue cubriendo la rendición más grande
+    return max(1, min(width // max(target_width, 1), height // max(target_height, 1)))
+
+
+def reduce_in_strips(img, factor):
+    # Image.reduce() hace una copia del tamaño del original (en RGBA, para
+    # premultiplicar el alfa); por franjas la copia es solo de una franja.
+    # Las franjas son múltiplos de `factor`, así que el resultado es idéntico.
+    if img.mode == 'P':
+        return img.reduce(factor)
+    width, height = img.size
+    reduced = Image.new(img.mode, (-(-width // factor), -(-height // factor)))
+    strip = factor * REDUCE_STRIP_ROWS
+    for top in range(0, height, strip):
+        with img.crop((0, top, width, min(height, top + strip))) as part, part.reduce(factor) as small:
+            reduced.paste(small, (0, top // factor))
+    return reduced
+
+
+def decode_source(img, largest_width, largest_height, low_memory):
+    # JPEG: decodificar directamente a 1/2, 1/4 o 1/8 si sigue cubriendo
+    # la rendición más grande (mucho más rápido y con menos memoria)
+    if img.format == 'JPEG':
+        img.draft('RGB', (largest_width, largest_height))
+    # Antes de reduce(): la copia reducida no conserva el color transparente de img.info
+    alpha = has_alpha(img)
+
+    if low_memory:
+        # Formatos sin decodificación reducida: Image.reduce() (box filter, barato)
+        # antes del LANCZOS final, liberando el original en cuanto deja de hacer falta
+        factor = reduce_factor(img.width, img.height, largest_width, largest_height)
+        if factor > 1:
+            reduced = reduce_in_strips(img, factor)
+            img.close()
+            img = reduced
+
+    # Paleta a RGB; con transparencia a RGBA, para que PNG y WebP conserven el alfa
+    if alpha:
+        target_mode = 'RGBA'
+    elif img.mode == 'P':
+        target_mode = 'RGB'
+    else:
+        target_mode = img.mode
+    if img.mode != target_mode:
+        converted = img.convert(target_mode)
+        if low_memory:
+            img.close()
+        img = converted
+
+    return img
+
+
+def process_image(image_path, input_dir=INPUT_DIR, output_dir=OUTPUT_DIR, low_memory=False, encoding=None):
+    # Devuelve (ruta, dimensiones y renditions generadas, error) para que el
+    # proceso principal informe y actualice los manifiestos
+    full_path = os.path.join(input_dir, image_path)
+    if not os.path.exists(full_path):
+        return image_path, None, NOT_FOUND
+
+    generated = []
+    info = {'renditions': generated}
+    img = None
+    source = None
     try:
-        full_path = os.path.join(INPUT_DIR, image_path)
-        if not os.path.exists(full_path):
-            print(f"Skipping {image_path}: File not found")
-            return
-
-        with Image.open(full_path) as img:
-            # Convertir a RGB si es necesario
-            if img.mode in ('RGBA', 'P'):
-                img = img.convert('RGB')
-
-            base_name, ext = os.path.splitext(image_path)
-            
-            for size_name, width in SIZES.items():
-                # Calcular altura proporcional
-                aspect_ratio = img.height / img.width
-                height = int(width * aspect_ratio)
-                
-                # Redimensionar
-                resized_img = img.resize((width, height), Image.Resampling.LANCZOS)
-                
-                # Guardar versión optimizada
-                output_filename = f"{base_name}-{size_name}{ext}"
-                output_path = os.path.join(OUTPUT_DIR, output_filename)
-                
-                # Asegurar que el directorio de salida existe
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                
-                resized_img.save(output_path, quality=85, optimize=True)
-                print(f"Generated {output_filename}")
-
-                # También generar versión WebP
-                webp_filename = f"{base_name}-{size_name}.webp"
-                webp_path = os.path.join(OUTPUT_DIR, webp_filename)
-                resized_img.save(webp_path, format='WEBP', quality=85)
-                print(f"Generated {webp_filename}")
+        with span('decode'):
+            img = Image.open(full_path)
+            info['width'], info['height'] = img.size
+            sizes = target_sizes(img.width, img.height)
+            _, largest_width, largest_height = sizes[0]
+
+            img = decode_source(img, largest_width, largest_height, low_memory)
+            # decode_source solo prepara la decodificación; load() la hace aquí
+            img.load()
+        base_name, ext = os.path.splitext(image_path)
+
+        # La mayor se redimensiona desde el original; las demás desde esa
+        # rendición ya reducida, salvo que el original sea más pequeño
+        source = img
+        for size_name, width, height in sizes:
+            with span('resize'):
+                resized_img = source.resize((width, height), Image.Resampling.LANCZOS)
+            generated.extend(save_renditions(resized_img, base_name, ext, size_name, output_dir, encoding))
+            if size_name == sizes[-1][0]:
+                # La rendición más pequeña ya está en memoria: LQIP, color y proporción sin decodificar otra vez
+                info['placeholder'] = image_placeholder(resized_img, info['width'], info['height'])
+            if source is img and width <= img.width:
+                source = resized_img
+                if low_memory:
+                    img.close()
+            elif resized_img is not source:
+                resized_img.close()
 
     except Exception as e:
-        print(f"Error processing {image_path}: {str(e)}")
+        return image_path, info, str(e)
 
-def main():
+    finally:
+        for opened in (source, img):
+            if opened is not None:
+                opened.close()
+
+    return image_path, info, None
+
+
+def estimate_memory(full_path, low_memory=False):
+    # Bytes aproximados en memoria para procesar una imagen (solo lee la cabecera)
+    with Image.open(full_path) as img:
+        width, height = img.size
+        bands = max(3, len(img.getbands()))
+        _, largest_width, largest_height = target_sizes(width, height)[0]
+        if img.format == 'JPEG':
+            # draft() reduce por potencias de 2 hasta 1/8
+            scale = 1
+            while scale < 8 and width // (scale * 2) >= largest_width and height // (scale * 2) >= largest_height:
+                scale *= 2
+            width, height = width // scale, height // scale
+        elif low_memory:
+            factor = reduce_factor(width, height, largest_width, largest_height)
+            # El original se decodifica entero, pero se libera tras reduce()
+            return width * height * bands + (width // factor) * (height // factor) * bands
+    decoded = width * height * bands
+    rendition_bytes = largest_width * largest_height * bands
+    # Original + copia convertida (si hay conversión) + rendición más grande
+    return (decoded if low_memory else 2 * decoded) + rendition_bytes
+
+
+def run_tasks(tasks, jobs, memory_limit=None):
+    # Lanza las tareas en paralelo sin superar `memory_limit` bytes por worker
+    # (estimados) entre todas las imágenes en vuelo; siempre admite al menos una
+    if jobs <= 1 or len(tasks) <= 1:
+        return [process_image(*task) for task in tasks]
+
+    jobs = min(jobs, len(tasks))
+    budget = memory_limit * jobs if memory_limit else None
+    results = []
+    pending = list(tasks)
+    in_flight = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        while pending or in_flight:
+            while pending and len(in_flight) < jobs:
+                task = pending[0]
+                cost = 0
+                if budget:
+                    try:
+                        cost = estimate_memory(os.path.join(task[1], task[0]), task[3])
+                    except (OSError, Image.DecompressionBombError):
+                        # Ilegible o corrupta: process_image la dará como error
+                        cost = 0
+                    if in_flight and sum(in_flight.values()) + cost > budget:
+                        break
+                pending.pop(0)
+                in_flight[executor.submit(collect, process_image, *task)] = cost
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                del in_flight[future]
+                result, timings = future.result()
+                merge(timings)
+                results.append(result)
+    return results
+
+
+def settings_key(encoding=None):
+    # Cambiar tamaños, calidad, formatos o la codificación adaptativa invalida todas las renditions
+    settings = {'sizes': SIZES, 'quality': QUALITY, 'formats': FORMATS, 'version': RENDITIONS_VERSION}
+    if encoding:
+        settings['encoding'] = encoding
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def load_manifest(input_dir, output_dir):
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get('input_dir') != input_dir or manifest.get('output_dir') != output_dir:
+        manifest = {}
+    return manifest.get('images', {})
+
+
+def save_manifest(images, input_dir, output_dir):
+    manifest = {
+        'input_dir': input_dir,
+        'output_dir': output_dir,
+        'images': dict(sorted(images.items())),
+    }
+    atomic_write(MANIFEST_FILE, json.dumps(manifest, indent=2).encode('utf-8'))
+
+
+def source_state(full_path, entry):
+    # Usa tamaño + mtime como atajo y solo recalcula el hash si han cambiado
+    st = os.stat(full_path)
+    if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+        digest = entry['sha256']
+    else:
+        digest = file_hash(full_path)
+    return {'sha256': digest, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def is_fresh(entry, state, settings, output_dir):
+    if not entry or entry.get('settings') != settings or entry['sha256'] != state['sha256']:
+        return False
+    if 'renditions' not in entry or 'placeholder' not in entry:
+        return False
+    return all(os.path.exists(os.path.join(output_dir, name)) for name in entry['outputs'])
+
+
+def prune_deleted(images, output_dir):
+    # Borra las renditions de originales que ya no existen
+    pruned = []
+    for image_path, entry in list(images.items()):
+        if os.path.exists(entry['source']):
+            continue
+        for name in entry['outputs']:
+            path = os.path.join(output_dir, name)
+            if os.path.exists(path):
+                os.unlink(path)
+                pruned.append(name)
+        del images[image_path]
+    return pruned
+
+
+def is_rendition(image_path):
+    base_name = os.path.splitext(image_path)[0]
+    return any(base_name.endswith(f"-{size_name}") for size_name in SIZES)
+
+
+def discover_images(input_dir, include, exclude):
+    # Recorre todo el árbol y devuelve las rutas relativas de los originales
+    found = []
+    for root, dirs, files in os.walk(input_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            rel_path = os.path.relpath(os.path.join(root, filename), input_dir).replace(os.sep, '/')
+            if is_rendition(rel_path):
+                continue
+            if not any(fnmatch.fnmatch(rel_path.lower(), pattern) for pattern in include):
+                continue
+            if any(fnmatch.fnmatch(rel_path, pattern) for pattern in exclude):
+                continue
+            found.append(rel_path)
+    return found
+
+
+def drop_duplicates(images, duplicates, output_dir):
+    # Las copias ya no tienen renditions propias: se borran las de builds anteriores
+    removed = []
+    for image_path in duplicates:
+        entry = images.pop(image_path, None)
+        for name in (entry or {}).get('outputs', []):
+            path = os.path.join(output_dir, name)
+            if os.path.exists(path):
+                os.unlink(path)
+                removed.append(name)
+    return removed
+
+
+def build_srcset_manifest(images, output_dir, public_prefix, canonical=None):
+    # { "/images/foo.jpg": {width, height, renditions: [{src, format, width, height, bytes}]} }
+    # Las imágenes duplicadas (canonical: {copia: original}) reutilizan las
+    # renditions de su original
+    srcset = {}
+    for image_path, entry in sorted(images.items()):
+        renditions = []
+        for item in entry['renditions']:
+            path = os.path.join(output_dir, item['file'])
+            if not os.path.exists(path):
+                continue
+            renditions.append({
+                'src': f"{public_prefix}/{item['file']}",
+                'format': item['format'],
+                'width': item['width'],
+                'height': item['height'],
+                'bytes': os.path.getsize(path),
+            })
+        renditions.sort(key=lambda r: (r['format'], r['width']))
+        srcset[f"{public_prefix}/{image_path}"] = {
+            'width': entry['width'],
+            'height': entry['height'],
+            'renditions': renditions,
+        }
+    for duplicate, original in sorted((canonical or {}).items()):
+        if f"{public_prefix}/{original}" in srcset:
+            srcset[f"{public_prefix}/{duplicate}"] = srcset[f"{public_prefix}/{original}"]
+    return srcset
+
+
+def parse_budgets(values):
+    # ["mobile=40", "desktop=150"] (KB) -> {"mobile": 40960, "desktop": 153600}
+    budgets = {}
+    for value in values:
+        size_name, _, kilobytes = value.partition('=')
+        if size_name not in SIZES or not kilobytes:
+            raise ValueError(f"Invalid budget {value!r} (expected one of {', '.join(SIZES)}=KB)")
+        budgets[size_name] = int(float(kilobytes) * 1024)
+    return budgets
+
+
+def adaptive_encoding(args):
+    # None si no se pide ningún objetivo: calidad fija QUALITY como siempre
+    metric, target = ('ssim', args.target_ssim) if args.target_ssim is not None else ('psnr', args.target_psnr)
+    if target is None:
+        metric = None
+    if metric is None and not args.budget:
+        return None
+    return adaptive_settings(metric, target, parse_budgets(args.budget), args.min_quality, args.max_quality)
+
+
+def report_savings(images):
+    renditions = [item for entry in images.values() for item in entry['renditions'] if 'baseline_bytes' in item]
+    total = sum(item['bytes'] for item in renditions)
+    baseline = sum(item['baseline_bytes'] for item in renditions)
+    missed = sum(1 for item in renditions if item.get('target_met') is False or item.get('within_budget') is False)
+    if baseline:
+        print(f"Adaptive encoding: {total / 1024:.0f} KB instead of {baseline / 1024:.0f} KB at quality {QUALITY} "
+              f"({(total - baseline) / baseline:+.1%}); {missed} renditions missed their target or budget")
+
+
+def generate(args):
     print("Starting image optimization...")
-    for image_path in KEY_IMAGES:
-        process_image(image_path)
+    input_dir = os.path.abspath(args.input_dir)
+    output_dir = os.path.abspath(args.output_dir)
+    encoding = adaptive_encoding(args)
+    settings = settings_key(encoding)
+    images = {} if args.force else load_manifest(input_dir, output_dir)
+
+    for name in prune_deleted(images, output_dir):
+        print(f"Removed stale {name}")
+
+    if args.all:
+        image_paths = discover_images(input_dir, args.include or DEFAULT_INCLUDE, DEFAULT_EXCLUDE + args.exclude)
+    else:
+        image_paths = KEY_IMAGES
+
+    canonical = {}
+    if args.dedupe:
+        # Cada grupo de casi duplicados se codifica una sola vez (su canónica)
+        existing = [p for p in image_paths if os.path.exists(os.path.join(input_dir, p))]
+        canonical = canonical_map(find_clusters(hash_images(input_dir, existing), args.dedupe_threshold))
+        for duplicate, original in sorted(canonical.items()):
+            print(f"Duplicate {duplicate} -> {original}")
+        for name in drop_duplicates(images, canonical, output_dir):
+            print(f"Removed stale {name}")
+        image_paths = [p for p in image_paths if p not in canonical]
+
+    tasks = []
+    states = {}
+    for image_path in image_paths:
+        full_path = os.path.join(input_dir, image_path)
+        if not os.path.exists(full_path):
+            print(f"Skipping {image_path}: File not found")
+            continue
+        entry = images.get(image_path)
+        state = source_state(full_path, entry)
+        if is_fresh(entry, state, settings, output_dir):
+            # Actualiza mtime por si el archivo se tocó sin cambiar
+            entry.update(state)
+            print(f"Up to date {image_path}")
+            continue
+        states[image_path] = dict(state, source=full_path, settings=settings)
+        tasks.append((image_path, input_dir, output_dir, args.low_memory, encoding))
+
+    memory_limit = args.memory_limit_mb * 1024 * 1024 if args.memory_limit_mb else None
+    results = run_tasks(tasks, args.jobs, memory_limit)
+
+    for image_path, info, error in results:
+        generated = [item['file'] for item in info['renditions']] if info else []
+        for filename in generated:
+            print(f"Generated {filename}")
+        if error == NOT_FOUND:
+            print(f"Skipping {image_path}: File not found")
+        elif error:
+            print(f"Error processing {image_path}: {error}")
+            images.pop(image_path, None)
+        else:
+            # Si cambian los tamaños, las renditions que ya no se generan sobran
+            previous = images.get(image_path, {}).get('outputs', [])
+            for name in set(previous) - set(generated):
+                path = os.path.join(output_dir, name)
+                if os.path.exists(path):
+                    os.unlink(path)
+                    print(f"Removed stale {name}")
+            images[image_path] = dict(states[image_path], outputs=generated, **info)
+
+    save_manifest(images, input_dir, output_dir)
+    if encoding:
+        report_savings(images)
+
+    public_prefix = args.public_prefix.rstrip('/')
+    srcset = build_srcset_manifest(images, output_dir, public_prefix, canonical)
+    atomic_write(args.srcset_manifest, json.dumps(srcset, indent=2, ensure_ascii=False).encode('utf-8'))
+    print(f"Wrote srcset manifest for {len(srcset)} images to {args.srcset_manifest}")
+    placeholders = write_placeholders(images, args.placeholders, public_prefix, canonical)
+    print(f"Wrote placeholders for {len(placeholders)} images to {args.placeholders}")
+    if args.dedupe:
+        write_canonical_map(canonical, args.canonical_map, public_prefix)
+        print(f"Wrote {len(canonical)} duplicate -> canonical entries to {args.canonical_map}")
     print("Done!")
 
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate mobile/tablet/desktop renditions (JPEG + WebP)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: one per core)')
+    parser.add_argument('--input-dir', default=INPUT_DIR)
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--force', action='store_true', help='Regenerate every rendition, ignoring the manifest')
+    parser.add_argument('--all', action='store_true',
+                        help='Process every raster image under --input-dir instead of KEY_IMAGES')
+    parser.add_argument('--include', action='append',
+                        help=f"fnmatch pattern for --all (repeatable, default: {' '.join(DEFAULT_INCLUDE)})")
+    parser.add_argument('--exclude', action='append', default=[], help='fnmatch pattern to skip with --all (repeatable)')
+    parser.add_argument('--srcset-manifest', default=SRCSET_MANIFEST_FILE,
+                        help='Where to write the srcset manifest for the client')
+    parser.add_argument('--public-prefix', default=PUBLIC_PREFIX, help='Public URL of --output-dir')
+    parser.add_argument('--placeholders', default=PLACEHOLDERS_FILE,
+                        help='Where to write the LQIP / dominant color / aspect ratio manifest for the client')
+    parser.add_argument('--low-memory', action='store_true',
+                        help='Reduce sources before resizing and release intermediates as soon as possible')
+    parser.add_argument('--memory-limit-mb', type=int, default=None,
+                        help='Per-worker memory ceiling; limits how many images are decoded at once')
+    parser.add_argument('--dedupe', action='store_true',
+                        help='Encode near-duplicate sources once and point the copies at the canonical renditions')
+    parser.add_argument('--dedupe-threshold', type=int, default=THRESHOLD,
+                        help=f"Maximum differing perceptual-hash bits for --dedupe (default: {THRESHOLD})")
+    parser.add_argument('--canonical-map', default=CANONICAL_MAP_FILE,
+                        help='Where --dedupe writes the duplicate -> canonical map for the client')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--target-ssim', type=float, default=None, metavar='SSIM',
+                        help='Lowest quality whose SSIM against the unencoded rendition is at least this (e.g. 0.98)')
+    target.add_argument('--target-psnr', type=float, default=None, metavar='DB',
+                        help='Lowest quality whose PSNR is at least this many dB (e.g. 38)')
+    parser.add_argument('--budget', action='append', default=[], metavar='SIZE=KB',
+                        help=f"Byte budget per rendition for a breakpoint ({', '.join(SIZES)}; repeatable)")
+    parser.add_argument('--min-quality', type=int, default=MIN_QUALITY,
+                        help=f"Lowest quality the adaptive search may pick (default: {MIN_QUALITY})")
+    parser.add_argument('--max-quality', type=int, default=MAX_QUALITY,
+                        help=f"Highest quality the adaptive search may pick (default: {MAX_QUALITY})")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    try:
+        adaptive_encoding(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    with profiling('generate_responsive_images', args.profile):
+        generate(args)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+
+from PIL import Image
+
+from incremental_output import atomic_write, file_hash
+from instrumentation import add_profile_argument, count, profiling, span
+from project_paths import data_dir, project_path
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usa la versión en Python puro
+    np = None
+
+# Detección de imágenes casi idénticas (la misma foto de proveedor subida con
+# otro nombre, recomprimida o reescalada) con hashes perceptuales de 64 bits:
+#   - aHash: cada píxel de la miniatura 8x8 en gris frente a la media
+#   - dHash: cada píxel de la miniatura 9x8 frente a su vecino de la derecha
+# Dos imágenes son duplicadas si ambos hashes están a <= THRESHOLD bits y tienen
+# la misma proporción. De cada grupo se queda la de mayor resolución (canónica).
+HASH_SIZE = 8
+THRESHOLD = 4
+MAX_ASPECT_DIFF = 0.02
+
+# Hashes por archivo (sha256 + tamaño + mtime) para no decodificar en cada build
+HASH_CACHE_FILE = project_path('.build-cache', 'image-hashes.json')
+HASH_VERSION = 1
+
+# Para el cliente: {"/images/copia.jpg": "/images/original.jpg"}
+CANONICAL_MAP_FILE = data_dir('image-canonical.json')
+
+
+def _to_int(bits):
+    value = 0
+    for bit in bits:
+        value = (value << 1) | bool(bit)
+    return value
+
+
+def perceptual_hashes(img):
+    # Devuelve (ahash, dhash) como enteros de 64 bits
+    if img.mode in ('RGBA', 'LA', 'P'):
+        # Lo transparente cuenta como fondo blanco, no negro
+        rgba = img.convert('RGBA')
+        background = Image.new('RGBA', rgba.size, (255, 255, 255, 255))
+        background.alpha_composite(rgba)
+        img = background
+    gray = img.convert('L')
+    average = gray.resize((HASH_SIZE, HASH_SIZE), Image.Resampling.BOX)
+    gradient = gray.resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BOX)
+    if np is not None:
+        a = np.asarray(average, dtype=np.float32)
+        d = np.asarray(gradient, dtype=np.int16)
+        a_bits = (a > a.mean()).ravel()
+        d_bits = (d[:, 1:] > d[:, :-1]).ravel()
+        return (int.from_bytes(np.packbits(a_bits).tobytes(), 'big'),
+                int.from_bytes(np.packbits(d_bits).tobytes(), 'big'))
+    a = list(average.getdata())
+    mean = sum(a) / len(a)
+    d = list(gradient.getdata())
+    width = HASH_SIZE + 1
+    d_bits = [d[row * width + col + 1] > d[row * width + col]
+              for row in range(HASH_SIZE) for col in range(HASH_SIZE)]
+    return _to_int(p > mean for p in a), _to_int(d_bits)
+
+
+def image_hashes(full_path):
+    with Image.open(full_path) as img:
+        width, height = img.size
+        if img.format == 'JPEG':
+            # Basta una decodificación a 1/8 para una miniatura de 9x8
+            img.draft('RGB', (HASH_SIZE * 8, HASH_SIZE * 8))
+        ahash, dhash = perceptual_hashes(img)
+    return {'width': width, 'height': height, 'ahash': f"{ahash:016x}", 'dhash': f"{dhash:016x}"}
+
+
+def load_cache():
+    try:
+        with open(HASH_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != HASH_VERSION:
+        return {}
+    return cache.get('images', {})
+
+
+def save_cache(images):
+    images = {path: entry for path, entry in images.items() if os.path.exists(path)}
+    cache = {'version': HASH_VERSION, 'images': dict(sorted(images.items()))}
+    atomic_write(HASH_CACHE_FILE, json.dumps(cache, indent=2).encode('utf-8'))
+
+
+def hash_images(input_dir, image_paths):
+    # {ruta relativa: {width, height, ahash, dhash}}; solo decodifica lo que ha cambiado
+    cache = load_cache()
+    hashes = {}
+    for image_path in image_paths:
+        full_path = os.path.join(input_dir, image_path)
+        st = os.stat(full_path)
+        entry = cache.get(full_path)
+        if entry and (entry['size'], entry['mtime_ns']) == (st.st_size, st.st_mtime_ns):
+            hashes[image_path] = entry
+            count('hash_cached')
+            continue
+        digest = file_hash(full_path)
+        if not entry or entry['sha256'] != digest:
+            try:
+                with span('hash'):
+                    entry = dict(image_hashes(full_path), sha256=digest)
+            except Exception as e:
+                print(f"Cannot hash {image_path}: {e}")
+                continue
+            count('hashed')
+        entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+        cache[full_path] = hashes[image_path] = entry
+    save_cache(cache)
+    return hashes
+
+
+def _popcount(values):
+    # Bits a 1 de cada elemento de un array uint64
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def duplicate_pairs(hashes, threshold=THRESHOLD):
+    # Pares (i, j) de índices en `hashes` (lista de entradas) que son casi iguales
+    n = len(hashes)
+    ratios = [entry['width'] / entry['height'] for entry in hashes]
+    if np is not None and n:
+        ahashes = np.array([int(entry['ahash'], 16) for entry in hashes], dtype=np.uint64)
+        dhashes = np.array([int(entry['dhash'], 16) for entry in hashes], dtype=np.uint64)
+        aspect = np.array(ratios)
+        for i in range(n - 1):
+            # Una fila de la matriz de distancias cada vez: memoria O(n)
+            near = ((_popcount(ahashes[i + 1:] ^ ahashes[i]) <= threshold)
+                    & (_popcount(dhashes[i + 1:] ^ dhashes[i]) <= threshold)
+                    & (np.abs(aspect[i + 1:] / aspect[i] - 1) <= MAX_ASPECT_DIFF))
+            for j in np.flatnonzero(near):
+                yield i, i + 1 + int(j)
+        return
+    ahashes = [int(entry['ahash'], 16) for entry in hashes]
+    dhashes = [int(entry['dhash'], 16) for entry in hashes]
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            if (bin(ahashes[i] ^ ahashes[j]).count('1') <= threshold
+                    and bin(dhashes[i] ^ dhashes[j]).count('1') <= threshold
+                    and abs(ratios[j] / ratios[i] - 1) <= MAX_ASPECT_DIFF):
+                yield i, j
+
+
+def find_clusters(hashes, threshold=THRESHOLD):
+    # Grupos (unión de pares, transitiva) con la canónica primero: mayor
+    # resolución, luego la ruta más corta y luego orden alfabético
+    paths = sorted(hashes)
+    parent = list(range(len(paths)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    with span('compare'):
+        for i, j in duplicate_pairs([hashes[path] for path in paths], threshold):
+            parent[root(j)] = root(i)
+
+    groups = {}
+    for i, path in enumerate(paths):
+        groups.setdefault(root(i), []).append(path)
+
+    def preference(path):
+        entry = hashes[path]
+        return (-entry['width'] * entry['height'], len(path), path)
+
+    clusters = [sorted(group, key=preference) for group in groups.values() if len(group) > 1]
+    return sorted(clusters)
+
+
+def canonical_map(clusters):
+    # {duplicada: canónica}
+    return {path: cluster[0] for cluster in clusters for path in cluster[1:]}
+
+
+def write_canonical_map(canonical, path=CANONICAL_MAP_FILE, public_prefix='/images'):
+    data = {f"{public_prefix}/{dup}": f"{public_prefix}/{original}" for dup, original in sorted(canonical.items())}
+    atomic_write(path, (json.dumps(data, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+
+
+def main():
+    # Importación diferida: generate_responsive_images importa este módulo
+    from generate_responsive_images import DEFAULT_EXCLUDE, DEFAULT_INCLUDE, INPUT_DIR, PUBLIC_PREFIX, discover_images
+
+    parser = argparse.ArgumentParser(description='Find near-duplicate source images with perceptual hashes')
+    parser.add_argument('--input-dir', default=INPUT_DIR)
+    parser.add_argument('--include', action='append',
+                        help=f"fnmatch pattern (repeatable, default: {' '.join(DEFAULT_INCLUDE)})")
+    parser.add_argument('--exclude', action='append', default=[], help='fnmatch pattern to skip (repeatable)')
+    parser.add_argument('--threshold', type=int, default=THRESHOLD,
+                        help=f"Maximum differing bits in both aHash and dHash (default: {THRESHOLD})")
+    parser.add_argument('--canonical-map', default=None, metavar='PATH',
+                        help=f"Also write the duplicate -> canonical map (e.g. {CANONICAL_MAP_FILE})")
+    parser.add_argument('--public-prefix', default=PUBLIC_PREFIX)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profiling('image_dedupe', args.profile):
+        input_dir = os.path.abspath(args.input_dir)
+        image_paths = discover_images(input_dir, args.include or DEFAULT_INCLUDE, DEFAULT_EXCLUDE + args.exclude)
+        hashes = hash_images(input_dir, image_paths)
+        clusters = find_clusters(hashes, args.threshold)
+        for cluster in clusters:
+            print(f"{cluster[0]} ({hashes[cluster[0]]['width']}x{hashes[cluster[0]]['height']})")
+            for path in cluster[1:]:
+                print(f"  = {path} ({hashes[path]['width']}x{hashes[path]['height']})")
+        duplicates = sum(len(cluster) - 1 for cluster in clusters)
+        print(f"{len(hashes)} images, {len(clusters)} groups of near-duplicates, {duplicates} redundant"
+              + ('' if np is not None else ' (without NumPy)'))
+        if args.canonical_map:
+            write_canonical_map(canonical_map(clusters), args.canonical_map, args.public_prefix.rstrip('/'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import base64
+import io
+import json
+
+from PIL import Image
+
+from incremental_output import atomic_write
+from instrumentation import span
+from project_paths import data_dir
+
+# Marcadores de posición mientras llega la rendición: una miniatura WebP de
+# PLACEHOLDER_SIZE px como data URI (el navegador la escala con desenfoque),
+# el color dominante y la proporción para reservar el hueco sin saltos de layout.
+# Se calculan desde la rendición más pequeña, que ya está decodificada.
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+COLOR_SAMPLE = 64
+PALETTE_COLORS = 5
+# Fondo de la página (--background del tema claro): las imágenes con
+# transparencia se componen sobre él antes de muestrear, porque el RGB de los
+# píxeles transparentes no se ve y daría colores inventados
+PAGE_BACKGROUND = (255, 255, 255)
+
+# Para el cliente: {"/images/foo.jpg": {width, height, aspect, color, lqip}}
+PLACEHOLDERS_FILE = data_dir('image-placeholders.json')
+
+
+def scaled(img, longest):
+    scale = longest / max(img.width, img.height)
+    if scale >= 1:
+        img = img.copy()
+    else:
+        size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        img = img.resize(size, Image.Resampling.BOX)
+    return flattened(img)
+
+
+def flattened(img):
+    # Como se ve en la página: RGB, con el alfa compuesto sobre PAGE_BACKGROUND
+    if img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info:
+        with img.convert('RGBA') as rgba:
+            background = Image.new('RGBA', rgba.size, PAGE_BACKGROUND + (255,))
+            background.alpha_composite(rgba)
+        img.close()
+        img = background
+    if img.mode == 'RGB':
+        return img
+    with img:
+        return img.convert('RGB')
+
+
+def lqip(img):
+    with scaled(img, PLACEHOLDER_SIZE) as thumb:
+        buffer = io.BytesIO()
+        thumb.save(buffer, format='WEBP', quality=PLACEHOLDER_QUALITY)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def dominant_color(img):
+    # El color más frecuente tras reducir a PALETTE_COLORS (la media daría un gris sucio)
+    with scaled(img, COLOR_SAMPLE) as sample:
+        quantized = sample.quantize(PALETTE_COLORS, method=Image.Quantize.MEDIANCUT)
+    _, index = max(quantized.getcolors())
+    red, green, blue = quantized.getpalette()[index * 3:index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def image_placeholder(img, width, height):
+    # width/height: dimensiones del original (img puede ser una rendición)
+    with span('placeholder'):
+        return {'aspect': round(width / height, 4), 'color': dominant_color(img), 'lqip': lqip(img)}
+
+
+def write_placeholders(images, path=PLACEHOLDERS_FILE, public_prefix='/images', canonical=None):
+    # `images`: entradas del manifiesto de renditions; las copias (canonical:
+    # {copia: original}) comparten el marcador de su original
+    data = {}
+    for image_path, entry in sorted(images.items()):
+        if 'placeholder' in entry:
+            data[f"{public_prefix}/{image_path}"] = dict(width=entry['width'], height=entry['height'],
+                                                        **entry['placeholder'])
+    for duplicate, original in sorted((canonical or {}).items()):
+        if f"{public_prefix}/{original}" in data:
+            data[f"{public_prefix}/{duplicate}"] = data[f"{public_prefix}/{original}"]
+    atomic_write(path, (json.dumps(data, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+    return data
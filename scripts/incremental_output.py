@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from instrumentation import count, span
+from project_paths import project_path
+
+# Los manifiestos viven fuera de client/ para no disparar la caché de Vite
+MANIFEST_DIR = '.build-cache'
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def atomic_write(path, data):
+    # Escribe en un temporal del mismo directorio y lo renombra encima del destino,
+    # así nunca queda un archivo a medias visible para el servidor de desarrollo
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def default_manifest_path(name, output_dir):
+    # {name}-<hash corto del directorio>.json
+    directory = hashlib.sha256(os.path.abspath(output_dir).encode('utf-8')).hexdigest()[:12]
+    return project_path(MANIFEST_DIR, f"{name}-{directory}.json")
+
+
+class IncrementalWriter:
+    """Escribe solo los archivos cuyo contenido serializado ha cambiado.
+
+    Cada productor (``name``) mantiene su propio manifiesto de hashes por
+    directorio de salida, de modo que varios scripts pueden compartir el mismo
+    directorio y una ejecución con otro --output-dir no pisa el manifiesto.
+    """
+
+    def __init__(self, name, output_dir, manifest_path=None):
+        self.name = name
+        self.output_dir = output_dir
+        self.manifest_path = manifest_path or default_manifest_path(name, output_dir)
+        self.previous = self._load_manifest()
+        if not self.previous and manifest_path is None:
+            # Manifiestos anteriores, uno por productor ({name}.json)
+            self.previous = self._load_manifest(project_path(MANIFEST_DIR, f"{name}.json"))
+        self.current = {}
+        self.report = {'written': [], 'skipped': [], 'deleted': []}
+
+    def _load_manifest(self, path=None):
+        try:
+            with open(path or self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('output_dir') != os.path.abspath(self.output_dir):
+            return {}
+        return manifest.get('files', {})
+
+    def _is_fresh(self, path, entry, digest, size):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_size != size:
+            return False
+        if entry and entry['sha256'] == digest and entry['mtime_ns'] == st.st_mtime_ns:
+            return True
+        # Sin manifiesto (o desactualizado) comparamos con lo que hay en disco
+        return file_hash(path) == digest
+
+    def write_bytes(self, relpath, data):
+        path = os.path.join(self.output_dir, relpath)
+        digest = content_hash(data)
+        entry = self.previous.get(relpath)
+        if self._is_fresh(path, entry, digest, len(data)):
+            self.report['skipped'].append(relpath)
+            count('files_skipped')
+        else:
+            with span('write'):
+                atomic_write(path, data)
+            self.report['written'].append(relpath)
+            count('files_written')
+            count('bytes_out', len(data))
+        st = os.stat(path)
+        self.current[relpath] = {'sha256': digest, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+        return path
+
+    def write_text(self, relpath, text):
+        return self.write_bytes(relpath, text.encode('utf-8'))
+
+    def write_json(self, relpath, data, **kwargs):
+        kwargs.setdefault('ensure_ascii', False)
+        with span('serialize'):
+            text = json.dumps(data, **kwargs)
+        return self.write_text(relpath, text)
+
+    def _owns(self, path, entry):
+        # Solo borramos archivos que siguen siendo exactamente lo que escribimos
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_size != entry['size']:
+            return False
+        return st.st_mtime_ns == entry['mtime_ns'] or file_hash(path) == entry['sha256']
+
+    def delete(self, relpath):
+        # Borra un archivo que ya no se genera (solo si sigue siendo nuestro)
+        entry = self.previous.pop(relpath, None)
+        self.current.pop(relpath, None)
+        path = os.path.join(self.output_dir, relpath)
+        if entry and self._owns(path, entry):
+            os.unlink(path)
+            self.report['deleted'].append(relpath)
+            count('files_deleted')
+
+    def finish(self, prune=True):
+        for relpath, entry in self.previous.items():
+            if relpath in self.current:
+                continue
+            if not prune:
+                self.current[relpath] = entry
+                continue
+            path = os.path.join(self.output_dir, relpath)
+            if self._owns(path, entry):
+                os.unlink(path)
+                self.report['deleted'].append(relpath)
+                count('files_deleted')
+
+        manifest = {
+            'output_dir': os.path.abspath(self.output_dir),
+            'files': dict(sorted(self.current.items())),
+        }
+        atomic_write(self.manifest_path, json.dumps(manifest, indent=2).encode('utf-8'))
+        return self.report
+
+
+def manifest_files(name, output_dir, manifest_path=None):
+    # Archivos que el productor `name` escribió en output_dir en su última ejecución
+    return set(IncrementalWriter(name, output_dir, manifest_path).previous)
+
+
+def print_report(report, verbose=False):
+    for key in ('written', 'deleted'):
+        for relpath in report[key]:
+            print(f"  {key}: {relpath}")
+    if verbose:
+        for relpath in report['skipped']:
+            print(f"  skipped: {relpath}")
+    print(
+        f"{len(report['written'])} written, {len(report['skipped'])} skipped, "
+        f"{len(report['deleted'])} deleted"
+    )
+
+
+def save_report(report, path):
+    atomic_write(path, json.dumps(report, indent=2, ensure_ascii=False).encode('utf-8'))
@@ -0,0 +1,107 @@
+import contextlib
+import cProfile
+import json
+import os
+import time
+
+from project_paths import project_path
+
+# Medición común para los scripts de build: tiempos por etapa (parse, render,
+# serialize, write, decode, resize, encode...) y contadores (archivos escritos,
+# omitidos, bytes de salida). Siempre activa y barata; con --profile además se
+# guarda un volcado de cProfile y un JSON con los tiempos.
+PROFILE_DIR = project_path('.build-cache', 'profile')
+
+_spans = {}
+_counters = {}
+
+
+@contextlib.contextmanager
+def span(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry = _spans.setdefault(stage, [0.0, 0])
+        entry[0] += time.perf_counter() - start
+        entry[1] += 1
+
+
+def count(name, amount=1):
+    _counters[name] = _counters.get(name, 0) + amount
+
+
+def reset():
+    _spans.clear()
+    _counters.clear()
+
+
+def snapshot():
+    return {'spans': {stage: list(entry) for stage, entry in _spans.items()}, 'counters': dict(_counters)}
+
+
+def merge(data):
+    # Suma lo medido en otro proceso (ver collect)
+    for stage, (seconds, calls) in data['spans'].items():
+        entry = _spans.setdefault(stage, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += calls
+    for name, amount in data['counters'].items():
+        count(name, amount)
+
+
+def collect(function, *args):
+    # Para ProcessPoolExecutor: ejecuta en el worker y devuelve también sus medidas,
+    # que el proceso principal incorpora con merge()
+    reset()
+    result = function(*args)
+    return result, snapshot()
+
+
+def timings():
+    spans = sorted(_spans.items(), key=lambda item: item[1][0], reverse=True)
+    return {
+        'spans': {stage: {'seconds': round(seconds, 6), 'calls': calls} for stage, (seconds, calls) in spans},
+        'counters': dict(sorted(_counters.items())),
+    }
+
+
+def print_summary(wall=None):
+    data = timings()
+    if wall is not None:
+        print(f"Total: {wall:.3f}s")
+    for stage, entry in data['spans'].items():
+        print(f"  {stage:<14} {entry['seconds']:>10.3f}s  {entry['calls']:>8} calls")
+    for name, amount in data['counters'].items():
+        print(f"  {name:<14} {amount:>10}")
+
+
+def add_profile_argument(parser):
+    parser.add_argument('--profile', nargs='?', const=PROFILE_DIR, default=None, metavar='DIR',
+                        help='Write a cProfile dump (<script>.pstats) and stage timings (<script>.timings.json) '
+                             f'to DIR (default: {PROFILE_DIR}). With several worker processes the cProfile '
+                             'dump only covers the main process; the stage timings cover all of them.')
+
+
+@contextlib.contextmanager
+def profiling(name, directory):
+    if not directory:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        wall = time.perf_counter() - start
+        os.makedirs(directory, exist_ok=True)
+        stats_path = os.path.join(directory, f"{name}.pstats")
+        profiler.dump_stats(stats_path)
+        timings_path = os.path.join(directory, f"{name}.timings.json")
+        with open(timings_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(script=name, wall_s=round(wall, 6), **timings()), f, indent=2)
+        print_summary(wall)
+        print(f"Profile: {stats_path} (python -m pstats), timings: {timings_path}")
@@ -0,0 +1,373 @@
+import argparse
+import datetime
+import functools
+import gzip
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+from catalog_dump import iter_products
+from catalog_store import SNAPSHOT_FILE, CatalogStore
+from instrumentation import add_profile_argument, count, profiling, span
+from project_paths import project_path
+
+# Feed RSS 2.0 de Google Merchant Center generado en streaming desde un volcado
+# de productos o desde la instantánea SQLite (catalog_store.py). Mismos campos y
+# formato que server/services/merchantFeedService.ts: un <item> por variación de
+# cada producto VARIABLE, con g:item_group_id = databaseId del producto padre.
+# Solo hay en memoria el producto que se está escribiendo.
+FEED_FILE = project_path('client', 'public', 'feeds', 'google-merchant.xml.gz')
+# Modo delta: feed suplementario con lo añadido/cambiado/eliminado desde la
+# instantánea de referencia, que se actualiza tras cada ejecución
+DELTA_FILE = project_path('client', 'public', 'feeds', 'google-merchant-supplemental.xml.gz')
+BASELINE_FILE = project_path('.build-cache', 'merchant-feed-baseline.sqlite')
+CHANGELOG_FILE = project_path('.build-cache', 'merchant-feed-changes.jsonl')
+SITE_URL = 'https://impacto33.com'
+BRAND = 'IMPACTO33'
+MAX_DESCRIPTION = 5000
+
+FEED_OPEN = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:g="http://base.google.com/ns/1.0">
+  <channel>
+    <title>IMPACTO33 - Regalos Publicitarios y Ropa Personalizada</title>
+    <link>https://impacto33.com</link>
+    <description>Catálogo completo de productos personalizados: ropa, merchandising, regalos publicitarios y artículos promocionales</description>
+    <lastBuildDate>{now}</lastBuildDate>
+"""
+FEED_CLOSE = """  </channel>
+</rss>
+"""
+
+TAG_RE = re.compile(r'<[^>]*>')
+SPACES_RE = re.compile(r'\s+')
+EUR_RE = re.compile('eur', re.IGNORECASE)
+# Prefijo numérico que aceptaría parseFloat ("1.50 - 3.00" -> 1.50)
+NUMBER_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+STOCK_STATUS = {'IN_STOCK': 'in stock', 'OUT_OF_STOCK': 'out of stock', 'ON_BACKORDER': 'preorder'}
+
+
+def escape_xml(text):
+    if not text:
+        return ''
+    return (text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            .replace('"', '&quot;').replace("'", '&apos;'))
+
+
+def clean_description(html):
+    if not html:
+        return ''
+    text = TAG_RE.sub('', html)
+    text = (text.replace('&nbsp;', ' ').replace('&amp;', '&').replace('&lt;', '<')
+            .replace('&gt;', '>').replace('&quot;', '"').replace('&#039;', "'"))
+    text = SPACES_RE.sub(' ', text).strip()
+    if len(text) > MAX_DESCRIPTION:
+        text = text[:MAX_DESCRIPTION - 3] + '...'
+    return text
+
+
+# Hay pocos precios y valores de atributo distintos: se formatean una vez
+@functools.lru_cache(maxsize=4096)
+def format_price(price):
+    if not price:
+        return '0.00 EUR'
+    clean = price.replace('&nbsp;', '').replace('€', '')
+    clean = EUR_RE.sub('', clean).replace(',', '.').strip()
+    match = NUMBER_RE.match(clean)
+    if not match:
+        return '0.00 EUR'
+    return f"{float(match.group()):.2f} EUR"
+
+
+def stock_status(status):
+    # Por defecto se asume disponible, como en el servicio
+    return STOCK_STATUS.get((status or '').upper(), 'in stock')
+
+
+def attribute_value(attributes, name):
+    for attribute in attributes:
+        if name in (attribute.get('name') or '').lower():
+            return attribute.get('value')
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_attribute(value):
+    # "azul-marino" -> "Azul Marino"
+    if not value:
+        return ''
+    return ' '.join(word[:1].upper() + word[1:] for word in value.replace('-', ' ').split(' '))
+
+
+def image_link(image):
+    if image and image.get('sourceUrl'):
+        return f"      <g:image_link>{escape_xml(image['sourceUrl'])}</g:image_link>\n"
+    return ''
+
+
+def feed_item(product, base, variation=None, item_group_id=None):
+    # base: campos del producto ya escapados, compartidos por todas sus variaciones
+    source = variation or product
+    sku = base['sku']
+    image = base['image']
+    description = base['description']
+    title = base['name']
+    color = size = None
+    if variation:
+        if variation.get('sku'):
+            sku = escape_xml(variation['sku'])
+        if variation.get('image'):
+            image = image_link(variation['image'])
+        if variation.get('description'):
+            description = escape_xml(clean_description(variation['description']))
+        attributes = (variation.get('attributes') or {}).get('nodes') or []
+        color = attribute_value(attributes, 'color')
+        size = attribute_value(attributes, 'talla')
+        if color or size:
+            title = escape_xml(' - '.join(
+                [product.get('name') or ''] + [normalize_attribute(v) for v in (color, size) if v]))
+        else:
+            title = escape_xml(variation.get('name'))
+    price = source.get('salePrice') or source.get('price') or source.get('regularPrice')
+
+    parts = [
+        '    <item>\n',
+        f"      <g:id>{escape_xml(str(source.get('databaseId')))}</g:id>\n",
+        f"      <g:title>{title}</g:title>\n",
+        f"      <g:description>{description}</g:description>\n",
+        base['link'],
+        image,
+        f"      <g:price>{format_price(price)}</g:price>\n",
+        f"      <g:availability>{stock_status(source.get('stockStatus'))}</g:availability>\n",
+        '      <g:condition>new</g:condition>\n',
+        f"      <g:brand>{BRAND}</g:brand>\n",
+    ]
+    if sku:
+        parts.append(f"      <g:mpn>{sku}</g:mpn>\n")
+    if item_group_id:
+        parts.append(f"      <g:item_group_id>{escape_xml(str(item_group_id))}</g:item_group_id>\n")
+    if color:
+        parts.append(f"      <g:color>{escape_xml(normalize_attribute(color))}</g:color>\n")
+    if size:
+        parts.append(f"      <g:size>{escape_xml(normalize_attribute(size))}</g:size>\n")
+    parts.append('    </item>\n')
+    return ''.join(parts)
+
+
+def product_items(product):
+    # El enlace siempre apunta al producto padre
+    link = f"{SITE_URL}/producto/{product.get('slug')}"
+    base = {
+        'name': escape_xml(product.get('name')),
+        'sku': escape_xml(product.get('sku')),
+        'image': image_link(product.get('image')),
+        'description': escape_xml(clean_description(product.get('description'))),
+        'link': f"      <g:link>{escape_xml(link)}</g:link>\n",
+    }
+    variations = (product.get('variations') or {}).get('nodes') or []
+    if product.get('type') == 'VARIABLE' and variations:
+        for variation in variations:
+            yield feed_item(product, base, variation, product.get('databaseId'))
+    else:
+        yield feed_item(product, base)
+
+
+def item_ids(product):
+    # g:id de los items que genera un producto (ver product_items)
+    variations = (product.get('variations') or {}).get('nodes') or []
+    if product.get('type') == 'VARIABLE' and variations:
+        return [variation.get('databaseId') for variation in variations]
+    return [product.get('databaseId')]
+
+
+def removed_item(item_id):
+    # Un feed suplementario no puede borrar productos: se marcan sin stock
+    # hasta que el siguiente feed completo deje de incluirlos
+    return ('    <item>\n'
+            f"      <g:id>{escape_xml(str(item_id))}</g:id>\n"
+            '      <g:availability>out of stock</g:availability>\n'
+            '    </item>\n')
+
+
+class FeedWriter:
+    """Escribe el feed item a item en un temporal (gzip si la salida acaba en .gz)
+    y lo renombra sobre el destino al cerrarse."""
+
+    def __init__(self, path, compresslevel=6):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=directory, prefix='.feed-', suffix='.tmp')
+        self._raw = os.fdopen(fd, 'wb', buffering=1 << 20)
+        if path.endswith('.gz'):
+            self._file = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=compresslevel, mtime=0)
+        else:
+            self._file = self._raw
+        self.items = 0
+        self.products = 0
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds')
+        self._file.write(FEED_OPEN.format(now=now.replace('+00:00', 'Z')).encode('utf-8'))
+
+    def add_product(self, product):
+        chunk = list(product_items(product))
+        self._file.write(''.join(chunk).encode('utf-8'))
+        self.products += 1
+        self.items += len(chunk)
+        count('items', len(chunk))
+
+    def add_removed(self, ids):
+        self._file.write(''.join(removed_item(item_id) for item_id in ids).encode('utf-8'))
+        self.items += len(ids)
+        count('removed_items', len(ids))
+
+    def close(self):
+        try:
+            self._file.write(FEED_CLOSE.encode('utf-8'))
+            self._file.close()
+            if self._raw is not self._file:
+                self._raw.close()
+            os.chmod(self._tmp_path, 0o644)
+            os.replace(self._tmp_path, self.path)
+        except BaseException:
+            self.abort()
+            raise
+        count('files_written')
+        count('bytes_out', os.path.getsize(self.path))
+
+    def abort(self):
+        self._raw.close()
+        if os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+
+
+def write_feed(products, output):
+    writer = FeedWriter(output)
+    try:
+        for product in products:
+            with span('render'):
+                writer.add_product(product)
+    except BaseException:
+        writer.abort()
+        raise
+    with span('write'):
+        writer.close()
+    return writer
+
+
+def write_delta(store, baseline, output):
+    # Solo se leen los productos que han cambiado: el coste es proporcional al
+    # cambio, no al tamaño del catálogo
+    with span('diff'):
+        changes = store.changes_since(baseline.path)
+    log = {key: [] for key in changes}
+    writer = FeedWriter(output)
+    try:
+        for key in ('added', 'changed', 'removed'):
+            for product_id in changes[key]:
+                with span('render'):
+                    old = baseline.product_by_id(product_id) if key != 'added' else None
+                    new = store.product_by_id(product_id) if key != 'removed' else None
+                    if new is not None:
+                        writer.add_product(new)
+                    if old is not None:
+                        current = set(item_ids(new)) if new is not None else set()
+                        writer.add_removed([i for i in item_ids(old) if i not in current])
+                log[key].append({'id': product_id, 'slug': (new or old).get('slug')})
+    except BaseException:
+        writer.abort()
+        raise
+    with span('write'):
+        writer.close()
+    return writer, log
+
+
+def save_baseline(snapshot, baseline):
+    directory = os.path.dirname(os.path.abspath(baseline))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.baseline-', suffix='.tmp')
+    os.close(fd)
+    try:
+        shutil.copyfile(snapshot, tmp_path)
+        os.replace(tmp_path, baseline)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def append_changelog(path, entry):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def generate_delta(args):
+    start = time.perf_counter()
+    output = args.output or DELTA_FILE
+    snapshot = args.catalog or SNAPSHOT_FILE
+    if not os.path.exists(args.delta):
+        # Primera ejecución: el feed completo hace de delta
+        print(f"No baseline at {args.delta}: writing every product")
+        with CatalogStore(snapshot) as store:
+            writer = write_feed(store.iter_products(), output)
+        log = None
+    else:
+        with CatalogStore(snapshot) as store, CatalogStore(args.delta) as baseline:
+            writer, log = write_delta(store, baseline, output)
+            entry = {
+                'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                'baseline': baseline.meta().get('created'),
+                'snapshot': store.meta().get('created'),
+                'output': output,
+                'items': writer.items,
+                **log,
+            }
+        append_changelog(args.changelog, entry)
+    if not args.keep_baseline:
+        save_baseline(snapshot, args.delta)
+    summary = ', '.join(f"{len(ids)} {key}" for key, ids in log.items()) if log else 'full'
+    print(f"Supplemental feed: {summary} products, {writer.items} items -> {output} "
+          f"({time.perf_counter() - start:.2f}s)")
+
+
+def generate(args):
+    if args.delta:
+        return generate_delta(args)
+    start = time.perf_counter()
+    args.output = args.output or FEED_FILE
+    if args.catalog:
+        with CatalogStore(args.catalog) as store:
+            writer = write_feed(store.iter_products(), args.output)
+    else:
+        writer = write_feed(iter_products(args.products), args.output)
+    print(f"Merchant feed: {writer.items} items from {writer.products} products -> {args.output} "
+          f"({time.perf_counter() - start:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream the Google Merchant Center RSS feed to a static file')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--products', action='append',
+                        help='GraphQL product dump with variations (JSON/NDJSON file or directory, repeatable)')
+    source.add_argument('--catalog', nargs='?', const=SNAPSHOT_FILE, default=None, metavar='SNAPSHOT',
+                        help=f"Read products from the SQLite catalog snapshot (default: {SNAPSHOT_FILE})")
+    parser.add_argument('--output', help=f"Feed path, gzip if it ends in .gz (default: {FEED_FILE}, "
+                                          f"or {DELTA_FILE} with --delta)")
+    parser.add_argument('--delta', nargs='?', const=BASELINE_FILE, default=None, metavar='BASELINE',
+                        help='Write a supplemental feed with the products added, changed or removed since the '
+                             f"baseline snapshot, then make the current snapshot the baseline (default: {BASELINE_FILE})")
+    parser.add_argument('--keep-baseline', action='store_true', help='With --delta, do not update the baseline')
+    parser.add_argument('--changelog', default=CHANGELOG_FILE, help=f"Change log for --delta runs (default: {CHANGELOG_FILE})")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.delta and args.products:
+        parser.error('--delta compares catalog snapshots; use --catalog')
+
+    with profiling('merchant_feed', args.profile):
+        generate(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from project_paths import data_dir, project_path, project_root, set_project_root
+
+# Punto de entrada único del build (python -m scripts). Cada etapa es un script
+# que se lanza como subproceso con IMPACTO33_ROOT apuntando a la raíz del
+# proyecto; las etapas sin dependencias pendientes se ejecutan a la vez.
+# Los scripts pesados (PIL) solo se cargan en el subproceso de su etapa.
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SCRIPTS_DIR)
+
+
+def stages():
+    # Se construye tras fijar la raíz: las rutas dependen de --root.
+    # requires: entrada sin la cual la etapa se omite (no es un error)
+    return {
+        'json': {
+            'script': os.path.join(SCRIPTS_DIR, 'generate_json.py'),
+            'help': 'categorias.txt -> seo-sitemap.json + dynamic-blocks.json',
+            'deps': [],
+            'requires': project_path('categorias.txt'),
+        },
+        'seo-pages': {
+            'script': os.path.join(REPO_DIR, 'split_seo_data.py'),
+            'help': 'seo-data.json -> categories/*.json',
+            'deps': [],
+            'requires': data_dir('seo-data.json'),
+        },
+        # Escribe en el mismo directorio y la misma tabla de rutas que seo-pages
+        'category-pages': {
+            'script': os.path.join(SCRIPTS_DIR, 'generate_category_pages.py'),
+            'help': 'category_pages/*.json -> categories/*.json + category-routes.json',
+            'deps': ['seo-pages'],
+        },
+        'bundles': {
+            'script': os.path.join(SCRIPTS_DIR, 'category_bundles.py'),
+            'help': 'categories/*.json -> category-bundles/',
+            'deps': ['seo-pages', 'category-pages'],
+        },
+        'validate': {
+            'script': os.path.join(SCRIPTS_DIR, 'validate_category_pages.py'),
+            'help': 'categories/*.json -> schema + parent_slug / siblings_intents check',
+            'deps': ['json', 'seo-pages', 'category-pages', 'category-index'],
+        },
+        'category-index': {
+            'script': os.path.join(SCRIPTS_DIR, 'category_index.py'),
+            'help': 'real_categories.json + all_categories_full.json -> category-index.json',
+            'deps': [],
+            'requires': project_path('real_categories.json'),
+        },
+        'search': {
+            'script': os.path.join(SCRIPTS_DIR, 'search_index.py'),
+            'help': 'seo-sitemap.json + categories/ + category-index.json -> search-index.json',
+            'deps': ['json', 'seo-pages', 'category-pages', 'category-index'],
+        },
+        'sitemaps': {
+            'script': os.path.join(SCRIPTS_DIR, 'build_sitemaps.py'),
+            'help': 'seo-sitemap.json + categories/ -> sitemap shards + sitemap-index.xml',
+            'deps': ['json', 'seo-pages', 'category-pages'],
+        },
+        'catalog': {
+            'script': os.path.join(SCRIPTS_DIR, 'catalog_store.py'),
+            'help': 'catalog-dump/ (GraphQL pages) -> .build-cache/catalog.sqlite',
+            'deps': [],
+            'args': [project_path('catalog-dump')],
+            'requires': project_path('catalog-dump'),
+        },
+        'feed': {
+            'script': os.path.join(SCRIPTS_DIR, 'merchant_feed.py'),
+            'help': 'catalog snapshot -> client/public/feeds/google-merchant.xml.gz',
+            'deps': ['catalog'],
+            'args': ['--catalog'],
+            'requires': project_path('.build-cache', 'catalog.sqlite'),
+        },
+        # Después de todo lo que escribe texto en client/public
+        'compress': {
+            'script': os.path.join(SCRIPTS_DIR, 'precompress.py'),
+            'help': 'client/public (+ dist/public) text files -> .gz / .br siblings',
+            'deps': ['sitemaps', 'feed'],
+        },
+        'images': {
+            'script': os.path.join(SCRIPTS_DIR, 'generate_responsive_images.py'),
+            'help': 'client/public/images (KEY_IMAGES) -> renditions + responsive-images.json',
+            'deps': [],
+            'requires': project_path('client', 'public', 'images'),
+        },
+    }
+
+
+def check_graph(graph):
+    for name, stage in graph.items():
+        for dep in stage['deps']:
+            if dep not in graph:
+                raise ValueError(f"Stage {name} depends on unknown stage {dep}")
+    # Orden topológico (Kahn); si no se vacía hay un ciclo
+    pending = {name: set(stage['deps']) for name, stage in graph.items()}
+    order = []
+    while pending:
+        ready = sorted(name for name, deps in pending.items() if not deps)
+        if not ready:
+            raise ValueError(f"Dependency cycle between: {', '.join(sorted(pending))}")
+        for name in ready:
+            del pending[name]
+            order.append(name)
+        for deps in pending.values():
+            deps.difference_update(ready)
+    return order
+
+
+def select_stages(graph, names, with_deps=True):
+    if not names:
+        return set(graph)
+    unknown = [name for name in names if name not in graph]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)} (available: {', '.join(graph)})")
+    selected = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in selected:
+            continue
+        selected.add(name)
+        if with_deps:
+            pending.extend(graph[name]['deps'])
+    return selected
+
+
+def run_stage(name, stage, extra_args):
+    command = [sys.executable, stage['script']] + stage.get('args', []) + extra_args
+    env = dict(os.environ, IMPACTO33_ROOT=project_root())
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=project_root(), env=env, capture_output=True, text=True)
+    return result.returncode, result.stdout + result.stderr, time.perf_counter() - start
+
+
+def run(graph, selected, jobs, extra_args, dry_run=False):
+    # Lanza cada etapa en cuanto terminan sus dependencias. Si una falla, las que
+    # dependen de ella no se ejecutan; las demás siguen.
+    status = {}
+    waiting = {name: [dep for dep in graph[name]['deps'] if dep in selected] for name in selected}
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while waiting or running:
+            for name in sorted(waiting):
+                deps = waiting[name]
+                if any(status.get(dep) in ('failed', 'blocked') for dep in deps):
+                    del waiting[name]
+                    status[name] = 'blocked'
+                    print(f"[{name}] not run: a dependency failed")
+                    continue
+                if any(status.get(dep) is None for dep in deps):
+                    continue
+                del waiting[name]
+                stage = graph[name]
+                if stage.get('requires') and not os.path.exists(stage['requires']):
+                    status[name] = 'skipped'
+                    print(f"[{name}] skipped: {stage['requires']} not found")
+                elif dry_run:
+                    status[name] = 'ok'
+                    print(f"[{name}] would run {os.path.relpath(stage['script'], REPO_DIR)}")
+                else:
+                    print(f"[{name}] started")
+                    running[executor.submit(run_stage, name, stage, extra_args)] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                returncode, output, elapsed = future.result()
+                # La salida de cada etapa se imprime entera al terminar, sin mezclarse
+                for line in output.rstrip().splitlines():
+                    print(f"[{name}] {line}")
+                status[name] = 'ok' if returncode == 0 else 'failed'
+                print(f"[{name}] {'done' if returncode == 0 else f'FAILED (exit {returncode})'} in {elapsed:.2f}s")
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m scripts', description='Run the content and asset build')
+    parser.add_argument('stages', nargs='*', help='Stages to run, with their dependencies (default: all)')
+    parser.add_argument('--root', help='Project root (default: $IMPACTO33_ROOT or the repository)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Stages to run at the same time')
+    parser.add_argument('--no-deps', action='store_true', help='Run only the named stages')
+    parser.add_argument('--list', action='store_true', help='List the stages and their dependencies')
+    parser.add_argument('--dry-run', action='store_true', help='Show what would run, in order')
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='DIR',
+                        help='Pass --profile to every stage (see instrumentation.py)')
+    args = parser.parse_args()
+
+    if args.root:
+        set_project_root(args.root)
+    graph = stages()
+    order = check_graph(graph)
+
+    if args.list:
+        for name in order:
+            stage = graph[name]
+            deps = f" (after {', '.join(stage['deps'])})" if stage['deps'] else ''
+            print(f"{name:<16} {stage['help']}{deps}")
+        return
+
+    try:
+        selected = select_stages(graph, args.stages, with_deps=not args.no_deps)
+    except ValueError as e:
+        parser.error(str(e))
+
+    extra_args = []
+    if args.profile is not None:
+        extra_args = ['--profile'] + ([os.path.abspath(args.profile)] if args.profile else [])
+
+    print(f"Project root: {project_root()}")
+    start = time.perf_counter()
+    status = run(graph, selected, max(1, args.jobs), extra_args, args.dry_run)
+    failed = sorted(name for name, result in status.items() if result in ('failed', 'blocked'))
+    print(f"Build finished in {time.perf_counter() - start:.2f}s"
+          + (f"; failed: {', '.join(failed)}" if failed else ''))
+    if failed:
+        sys.exit(1)
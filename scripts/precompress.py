@@ -0,0 +1,188 @@
+import argparse
+import gzip
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from incremental_output import atomic_write, file_hash
+from instrumentation import add_profile_argument, collect, count, merge, profiling, span
+from project_paths import project_path
+
+try:
+    import brotli
+except ImportError:  # Brotli es opcional: sin él solo se generan los .gz
+    brotli = None
+
+# Variantes precomprimidas (.gz y, si está el módulo brotli, .br) de los
+# archivos de texto servidos como estáticos: sitemaps, feeds, robots.txt y,
+# tras `vite build`, los chunks de dist/public (donde acaban los JSON de
+# client/src/data). El servidor envía estos bytes tal cual, sin comprimir
+# en cada petición (ver server/_core/precompressed.ts).
+DEFAULT_ROOTS = [project_path('client', 'public'), project_path('dist', 'public')]
+EXTENSIONS = ('.xml', '.json', '.txt', '.html', '.js', '.mjs', '.css', '.svg', '.webmanifest')
+# Por debajo de esto la cabecera de compresión no compensa
+MIN_SIZE = 1024
+# Solo se guarda la variante si ahorra al menos un 5 %
+MAX_RATIO = 0.95
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+MANIFEST_FILE = project_path('.build-cache', 'precompress.json')
+MANIFEST_VERSION = 1
+
+
+def encoders():
+    # {extensión: función}; forma parte de la clave de caché
+    available = {'.gz': lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        available['.br'] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+    return available
+
+
+def discover(roots):
+    found = []
+    for root in roots:
+        if not os.path.isdir(root):
+            continue
+        for directory, dirs, files in os.walk(root):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.startswith('.') or not filename.lower().endswith(EXTENSIONS):
+                    continue
+                path = os.path.join(directory, filename)
+                if os.path.getsize(path) >= MIN_SIZE:
+                    found.append(os.path.abspath(path))
+    return found
+
+
+def compress_file(path, extensions):
+    # Devuelve (ruta, {extensión: bytes}); las variantes que no ahorran se descartan
+    with open(path, 'rb') as f:
+        data = f.read()
+    written = {}
+    available = encoders()
+    for ext in extensions:
+        with span(f"compress{ext.replace('.', '_')}"):
+            compressed = available[ext](data)
+        if len(compressed) <= len(data) * MAX_RATIO:
+            atomic_write(path + ext, compressed)
+            written[ext] = len(compressed)
+            count('files_written')
+            count('bytes_out', len(compressed))
+    count('bytes_in', len(data))
+    return path, written
+
+
+def load_manifest(settings):
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('settings') != settings:
+        return {}
+    return manifest.get('files', {})
+
+
+def save_manifest(files, settings):
+    manifest = {'version': MANIFEST_VERSION, 'settings': settings, 'files': dict(sorted(files.items()))}
+    atomic_write(MANIFEST_FILE, json.dumps(manifest, indent=2).encode('utf-8'))
+
+
+def source_state(path, entry):
+    # Tamaño + mtime como atajo; el hash solo se recalcula si han cambiado
+    st = os.stat(path)
+    if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+        digest = entry['sha256']
+    else:
+        digest = file_hash(path)
+    return {'sha256': digest, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def is_fresh(path, entry, state):
+    if not entry or entry['sha256'] != state['sha256']:
+        return False
+    return all(os.path.exists(path + ext) for ext in entry['variants'])
+
+
+def remove_variants(path, extensions):
+    for ext in extensions:
+        if os.path.exists(path + ext):
+            os.unlink(path + ext)
+            count('files_deleted')
+
+
+def run_tasks(paths, extensions, jobs):
+    if jobs <= 1 or len(paths) <= 1:
+        return [compress_file(path, extensions) for path in paths]
+    results = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+        futures = [executor.submit(collect, compress_file, path, extensions) for path in paths]
+        for future in futures:
+            result, timings = future.result()
+            merge(timings)
+            results.append(result)
+    return results
+
+
+def generate(args):
+    available = encoders()
+    extensions = sorted(available)
+    settings = {'encoders': extensions, 'gzip': GZIP_LEVEL, 'brotli': BROTLI_QUALITY if brotli else None,
+                'min_size': MIN_SIZE, 'max_ratio': MAX_RATIO}
+    files = {} if args.force else load_manifest(settings)
+
+    with span('scan'):
+        paths = discover(args.root or DEFAULT_ROOTS)
+
+    # Fuentes que ya no existen o han bajado de MIN_SIZE: fuera sus variantes
+    current = set(paths)
+    for path in sorted(set(files) - current):
+        remove_variants(path, files.pop(path)['variants'])
+        print(f"Removed variants of {path}")
+
+    pending = []
+    states = {}
+    for path in paths:
+        entry = files.get(path)
+        state = source_state(path, entry)
+        if is_fresh(path, entry, state):
+            entry.update(state)
+            count('files_skipped')
+            continue
+        states[path] = state
+        pending.append(path)
+
+    for path, written in run_tasks(pending, extensions, args.jobs):
+        previous = files.get(path, {}).get('variants', {})
+        # Variantes de una versión anterior que esta vez no compensan
+        remove_variants(path, set(previous) - set(written))
+        files[path] = dict(states[path], variants=written)
+        sizes = ', '.join(f"{ext} {size / 1024:.1f} KB" for ext, size in sorted(written.items()))
+        print(f"Compressed {os.path.relpath(path)} ({states[path]['size'] / 1024:.1f} KB -> {sizes or 'not worth it'})")
+
+    save_manifest(files, settings)
+    original = sum(entry['size'] for entry in files.values())
+    totals = ', '.join(
+        f"{sum(entry['variants'].get(ext, entry['size']) for entry in files.values()) / 1024:.0f} KB {ext}"
+        for ext in extensions)
+    print(f"{len(pending)} compressed, {len(paths) - len(pending)} up to date; {original / 1024:.0f} KB -> {totals}"
+          + ('' if brotli is not None else ' (brotli module not installed: no .br)'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write .gz (and .br) siblings for the static text artifacts')
+    parser.add_argument('--root', action='append',
+                        help=f"Directory to scan (repeatable, default: {' '.join(DEFAULT_ROOTS)})")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: one per core)')
+    parser.add_argument('--force', action='store_true', help='Recompress everything, ignoring the manifest')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profiling('precompress', args.profile):
+        generate(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import os
+
+# Raíz del proyecto: por defecto el directorio padre de scripts/.
+# Se puede sobrescribir con la variable de entorno IMPACTO33_ROOT.
+_project_root = os.environ.get('IMPACTO33_ROOT') or os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)
+
+
+def project_root():
+    return _project_root
+
+
+def set_project_root(path):
+    global _project_root
+    _project_root = os.path.abspath(path)
+
+
+def project_path(*parts):
+    return os.path.join(_project_root, *parts)
+
+
+def data_dir(*parts):
+    return project_path('client', 'src', 'data', *parts)
+
+
+def categories_dir():
+    return data_dir('categories')
@@ -0,0 +1,278 @@
+import functools
+import heapq
+import math
+import unicodedata
+from collections import Counter
+
+from instrumentation import span
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usa un índice invertido en Python puro
+    np = None
+
+# Categorías relacionadas por similitud de texto: vectores TF-IDF de palabras y
+# trigramas de caracteres (sin tildes) del nombre y la intención de búsqueda, similitud coseno
+# entre todas las categorías y las k más parecidas de cada una. Las categorías
+# del mismo padre reciben un pequeño extra para desempatar a su favor.
+# Con NumPy los vectores se construyen como arrays y solo se puntúan los pares
+# que pueden superar MIN_SCORE (ver _split_prefix); el resultado es el mismo que
+# con el índice invertido en Python puro.
+NGRAM = 3
+GROUP_BONUS = 0.1
+# Por debajo de esta puntuación (similitud + extra) no se considera relacionada.
+# Tiene que ser mayor que GROUP_BONUS: el extra solo no basta (ver _split_prefix)
+MIN_SCORE = 0.15
+# Las puntuaciones se comparan redondeadas a 1e-9: las dos implementaciones suman
+# en distinto orden, y así los empates exactos (p. ej. "Hija 12" y "Hija 13") se
+# resuelven igual, por índice
+SCALE = 10 ** 9
+# Con NumPy, entradas del índice invertido que se expanden a la vez, tamaño
+# máximo de las matrices densas de un bloque (filas x términos o x filas) y de
+# la matriz completa (filas x términos)
+PAIR_BUDGET = 1 << 22
+DENSE_BUDGET = 1 << 22
+MATRIX_BUDGET = 1 << 24
+# Coste de expandir una entrada del índice invertido y de filtrar una puntuación,
+# en multiplicaciones-suma de la matriz densa (medido con OpenBLAS en un núcleo)
+EXPANSION_COST = 4000
+SCORE_COST = 125
+
+
+def fold(text):
+    # "Camisetas Técnicas" -> "camisetas tecnicas"
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+@functools.lru_cache(maxsize=65536)
+def word_terms(word):
+    # La palabra completa (w:...) y sus trigramas: los trigramas emparejan
+    # variantes (bordado/bordadas), las palabras pesan las coincidencias exactas
+    padded = f" {word} "
+    return (f"w:{word}",) + tuple(padded[i:i + NGRAM] for i in range(max(1, len(padded) - NGRAM + 1)))
+
+
+def ngrams(text):
+    counts = Counter()
+    for word in fold(text).split():
+        counts.update(word_terms(word))
+    return counts
+
+
+def weighted_vectors(texts):
+    # TF sublineal x IDF, normalizados a norma 1 (lo que aparece en todos los
+    # textos pesa 0). Solo se devuelven los términos presentes en al menos dos
+    # textos: los demás no aportan a ningún producto escalar, pero sí cuentan
+    # en la norma.
+    counts = [ngrams(text) for text in texts]
+    df = Counter(gram for doc in counts for gram in doc)
+    n = len(texts)
+    idf = {gram: math.log((1 + n) / (1 + d)) for gram, d in df.items()}
+    vectors = []
+    for doc in counts:
+        weights = {gram: (1 + math.log(tf)) * idf[gram] for gram, tf in doc.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        vectors.append({gram: w / norm for gram, w in weights.items() if df[gram] > 1})
+    return vectors
+
+
+def _top_k(scores, k):
+    # (score, -índice) para desempatar siempre igual
+    rounded = ((round(score * SCALE) / SCALE, -j) for j, score in scores.items())
+    best = heapq.nlargest(k, (key for key in rounded if key[0] > MIN_SCORE))
+    return [-j for _, j in best]
+
+
+def _related_python(vectors, groups, k):
+    postings = {}
+    for i, vector in enumerate(vectors):
+        for gram, weight in vector.items():
+            postings.setdefault(gram, []).append((i, weight))
+    members = {}
+    for i, group in enumerate(groups or ()):
+        members.setdefault(group, []).append(i)
+
+    related = []
+    for i, vector in enumerate(vectors):
+        scores = Counter()
+        for gram, weight in vector.items():
+            for j, other in postings[gram]:
+                scores[j] += weight * other
+        if groups:
+            for j in members[groups[i]]:
+                scores[j] += GROUP_BONUS
+        scores.pop(i, None)
+        related.append(_top_k(scores, k))
+    return related
+
+
+def weighted_arrays(texts):
+    # Lo mismo que weighted_vectors en arrays: (fila, término, peso) de cada
+    # entrada, ordenadas por fila, y la frecuencia documental de cada término
+    vocabulary = {}
+    word_ids = {}
+    ids, lengths = [], []
+    for text in texts:
+        before = len(ids)
+        for word in fold(text).split():
+            if word not in word_ids:
+                word_ids[word] = [vocabulary.setdefault(gram, len(vocabulary)) for gram in word_terms(word)]
+            ids.extend(word_ids[word])
+        lengths.append(len(ids) - before)
+    n = len(texts)
+    # TF de cada (fila, término): se ordenan las claves y se cuentan los tramos iguales
+    size = max(1, len(vocabulary))
+    keys = np.repeat(np.arange(n, dtype=np.int64), lengths) * size + np.array(ids, dtype=np.int64)
+    keys.sort()
+    first = np.flatnonzero(np.diff(keys, prepend=-1))
+    tfs = np.diff(np.append(first, len(keys)))
+    rows, terms = np.divmod(keys[first], size)
+    df = np.bincount(terms, minlength=len(vocabulary))
+    weights = (1 + np.log(tfs)) * np.log((1 + n) / (1 + df[terms]))
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n))
+    norms[norms == 0] = 1.0
+    weights /= norms[rows]
+    shared = df[terms] > 1
+    # Los términos compartidos se renumeran de forma compacta (columnas de la matriz densa)
+    columns = np.cumsum(df > 1) - 1
+    return rows[shared], columns[terms[shared]], weights[shared], df[df > 1]
+
+
+def _split_prefix(rows, terms, weights, df, threshold):
+    # Filtro de prefijo: en cada fila se apartan a la "cola" los términos más
+    # comunes mientras su norma acumulada quede por debajo de `threshold`. Si dos
+    # filas no comparten ningún término de la cabeza de una de ellas, su coseno es
+    # menor que esa norma, así que basta indexar las cabezas para encontrar todos
+    # los pares que pueden superar el umbral
+    order = np.lexsort((terms, -df[terms], rows))
+    squared = np.cumsum(weights[order] ** 2)
+    lengths = np.bincount(rows)
+    starts = np.cumsum(lengths) - lengths
+    before = np.concatenate(([0.0], squared))[starts[rows[order]]]
+    in_head = np.zeros(len(rows), dtype=bool)
+    in_head[order] = squared - before >= threshold * threshold * (1 - 1e-9)
+    return np.flatnonzero(in_head), np.flatnonzero(~in_head)
+
+
+def _expand(counts):
+    # Para cada elemento con `counts[i]` expansiones: (elemento, desplazamiento 0..counts[i]-1)
+    owners = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, offsets
+
+
+def _sparse_blocks(rows, terms, weights, df, group_ids, head, tail):
+    # Puntuaciones (bloque, consulta, candidato, puntuación) de los pares que
+    # comparten algún término de la cabeza del candidato
+    n = len(group_ids)
+    row_starts = np.searchsorted(rows, np.arange(n + 1))
+    by_term = head[np.argsort(terms[head], kind='stable')]
+    posting_rows, posting_weights = rows[by_term], weights[by_term]
+    posting_starts = np.searchsorted(terms[by_term], np.arange(len(df) + 1))
+    postings = np.diff(posting_starts)
+    tail_starts = np.searchsorted(rows[tail], np.arange(n + 1))
+    tail_norms = np.sqrt(np.bincount(rows[tail], weights=weights[tail] ** 2, minlength=n))
+
+    # Bloques de filas consecutivas acotados por expansiones y por matriz densa
+    expansions = np.cumsum(np.bincount(rows, weights=postings[terms], minlength=n))
+    max_rows = max(1, DENSE_BUDGET // max(1, len(df)))
+    start = 0
+    while start < n:
+        done = expansions[start - 1] if start else 0
+        end = int(np.searchsorted(expansions, done + PAIR_BUDGET, side='right'))
+        end = min(n, start + max_rows, max(end, start + 1))
+        lo, hi = row_starts[start], row_starts[end]
+
+        # Candidatos: filas con algún término de la consulta en su cabeza, con el
+        # producto escalar parcial sobre esos términos
+        entries, offsets = _expand(postings[terms[lo:hi]])
+        entries += lo
+        postings_at = posting_starts[terms[entries]] + offsets
+        pairs = (rows[entries] - start) * n + posting_rows[postings_at]
+        # Estable: los candidatos de cada consulta llegan en tramos ya ordenados
+        order = np.argsort(pairs, kind='stable')
+        pairs = pairs[order]
+        first = np.flatnonzero(np.diff(pairs, prepend=-1))
+        scores = np.add.reduceat((weights[entries] * posting_weights[postings_at])[order], first) \
+            if len(pairs) else np.zeros(0)
+        queries, candidates = np.divmod(pairs[first], n)
+        scores[group_ids[queries + start] == group_ids[candidates]] += GROUP_BONUS
+
+        # La cola del candidato aporta como mucho su norma: si ni así se llega al
+        # umbral, el par se descarta sin calcular el resto
+        keep = (queries + start != candidates) & (scores + tail_norms[candidates] > MIN_SCORE)
+        queries, candidates, scores = queries[keep], candidates[keep], scores[keep]
+        dense = np.zeros((end - start, len(df)))
+        dense[rows[lo:hi] - start, terms[lo:hi]] = weights[lo:hi]
+        pair_ids, offsets = _expand(tail_starts[candidates + 1] - tail_starts[candidates])
+        other = tail[tail_starts[candidates[pair_ids]] + offsets]
+        scores += np.bincount(pair_ids, weights=dense[queries[pair_ids], terms[other]] * weights[other],
+                              minlength=len(queries))
+        yield start, queries, candidates, scores
+        start = end
+
+
+def _dense_blocks(rows, terms, weights, df, group_ids):
+    # Lo mismo con la matriz completa, bloque de filas contra todas las filas
+    n = len(group_ids)
+    matrix = np.zeros((n, len(df)))
+    matrix[rows, terms] = weights
+    size = max(1, DENSE_BUDGET // n)
+    for start in range(0, n, size):
+        end = min(n, start + size)
+        scores = matrix[start:end] @ matrix.T
+        scores[group_ids[start:end, None] == group_ids] += GROUP_BONUS
+        queries, candidates = np.nonzero(scores > MIN_SCORE)
+        keep = queries + start != candidates
+        queries, candidates = queries[keep], candidates[keep]
+        yield start, queries, candidates, scores[queries, candidates]
+
+
+def _related_numpy(texts, groups, k):
+    n = len(texts)
+    rows, terms, weights, df = weighted_arrays(texts)
+    index = {}
+    group_ids = np.array([index.setdefault(group, len(index)) for group in groups] if groups
+                         else range(n))
+
+    # Con el filtro de prefijo se expanden pocos pares si los términos frecuentes
+    # pesan poco (lo normal con TF-IDF); si aun así salen más que con la matriz
+    # densa (vocabulario pequeño y muy repetido), se multiplica la matriz
+    threshold = MIN_SCORE - GROUP_BONUS if groups else MIN_SCORE
+    head, tail = _split_prefix(rows, terms, weights, df, threshold)
+    expansions = np.bincount(terms[head], minlength=len(df))[terms].sum()
+    if n * len(df) <= MATRIX_BUDGET and n * n * (len(df) + SCORE_COST) < expansions * EXPANSION_COST:
+        blocks = _dense_blocks(rows, terms, weights, df, group_ids)
+    else:
+        blocks = _sparse_blocks(rows, terms, weights, df, group_ids, head, tail)
+
+    related = [[] for _ in range(n)]
+    for start, queries, candidates, scores in blocks:
+        # Las k mejores de cada consulta: por puntuación y, a igualdad, por índice
+        # (los pares ya vienen ordenados por consulta y candidato: basta un orden estable)
+        scores = np.rint(scores * SCALE).astype(np.int64)
+        keep = scores > round(MIN_SCORE * SCALE)
+        queries, candidates, scores = queries[keep], candidates[keep], scores[keep]
+        order = np.argsort(queries * (2 * SCALE) - scores, kind='stable')
+        queries, candidates = queries[order], candidates[order]
+        ranks = np.arange(len(queries)) - np.searchsorted(queries, queries)
+        keep = ranks < k
+        for query, candidate in zip(queries[keep].tolist(), candidates[keep].tolist()):
+            related[query + start].append(candidate)
+    return related
+
+
+def related_categories(texts, groups=None, k=5):
+    """Índices de las `k` categorías más parecidas a cada texto, de más a menos.
+
+    ``groups`` (opcional, uno por texto, p. ej. el slug del padre) da un extra
+    de GROUP_BONUS a las categorías del mismo grupo. Solo se devuelven las que
+    superan MIN_SCORE, así que puede haber menos de `k`.
+    """
+    if len(texts) < 2 or k < 1:
+        return [[] for _ in texts]
+    with span('related'):
+        if np is not None:
+            return _related_numpy(texts, groups, k)
+        return _related_python(weighted_vectors(texts), groups, k)
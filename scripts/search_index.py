@@ -0,0 +1,219 @@
+import argparse
+import bisect
+import glob
+import json
+import os
+import re
+from collections import Counter
+
+from catalog_store import SNAPSHOT_FILE, CatalogStore
+from category_index import index_file as category_index_file
+from incremental_output import atomic_write
+from instrumentation import add_profile_argument, count, profiling, span
+from project_paths import categories_dir, data_dir
+from related_categories import fold
+
+# Índice estático para el buscador (autocompletado sin ir a WooCommerce):
+#   - terms: todas las palabras (sin tildes) ordenadas; un prefijo es un rango
+#     contiguo que se encuentra con dos búsquedas binarias
+#   - postings[t]: documentos que contienen el término t
+#   - trigrams: trigrama -> términos, para tolerar erratas ("camistea")
+# Los documentos son listas paralelas (labels, urls, kinds), como en category-index.json.
+INDEX_VERSION = 1
+
+KINDS = ['category', 'woo_category', 'product']
+STOPWORDS = frozenset('a al con de del el en la las los o para por sin su un una y'.split())
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Puntuación de cada palabra de la consulta según cómo encaja con el término
+EXACT, PREFIX = 3.0, 2.0
+# Erratas: fracción mínima de trigramas de la palabra presentes en el término
+FUZZY_MIN = 0.5
+
+
+def index_file():
+    return data_dir('search-index.json')
+
+
+def tokens(text):
+    return [token for token in TOKEN_RE.findall(fold(text or '')) if token not in STOPWORDS]
+
+
+def trigrams(token):
+    # Relleno solo a la izquierda: lo que se está escribiendo es un prefijo
+    padded = f" {token}"
+    return {padded[i:i + 3] for i in range(max(1, len(padded) - 2))}
+
+
+class DocumentSet:
+    # Documentos únicos por clave (URL o slug) con los textos que los describen
+    def __init__(self):
+        self.keys = {}
+        self.labels = []
+        self.urls = []
+        self.kinds = []
+        self.texts = []
+
+    def add(self, key, kind, label, url, *texts):
+        index = self.keys.get(key)
+        if index is None:
+            index = self.keys[key] = len(self.labels)
+            self.labels.append(label)
+            self.urls.append(url)
+            self.kinds.append(KINDS.index(kind))
+            self.texts.append([])
+        self.texts[index].extend(text for text in (label,) + texts if text)
+        count('documents_in')
+        return index
+
+
+def normalize_url(url):
+    return '/' + url.strip('/')
+
+
+def add_category_pages(documents, seo_sitemap_file, pages_dir):
+    # Las páginas SEO (seo-sitemap.json) y las de categories/*.json se juntan por URL
+    if os.path.exists(seo_sitemap_file):
+        with open(seo_sitemap_file, 'r', encoding='utf-8') as f:
+            for entry in json.load(f):
+                url = normalize_url(entry['url'])
+                documents.add(url, 'category', entry['anchor'], url, entry['slug'], entry.get('search_intent'))
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            page = json.load(f)
+        url = normalize_url(page['url'])
+        # "Camisetas Manga Larga | Ropa Personalizada | IMPACTO33" -> "Camisetas Manga Larga"
+        label = page.get('h1') or (page.get('meta_title') or page['search_intent']).split(' | ')[0]
+        documents.add(url, 'category', label, url, page['slug'], page.get('search_intent'))
+
+
+def add_woo_categories(documents, category_index):
+    # Categorías de WooCommerce (category-index.json): sin página propia, se
+    # identifican por slug y el nombre desambiguado ("Abrigos (coats)") como etiqueta
+    with open(category_index, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for slug, name, label in zip(data['slugs'], data['names'], data['labels']):
+        documents.add(f"woo:{slug}", 'woo_category', label, None, name, slug.replace('_', ' '))
+
+
+def add_products(documents, snapshot):
+    with CatalogStore(snapshot) as store:
+        for product in store.iter_products(with_variations=False):
+            url = f"/producto/{product['slug']}"
+            documents.add(url, 'product', product['name'], url, product['slug'], product.get('sku'))
+
+
+def build_index(documents):
+    postings = {}
+    for index, texts in enumerate(documents.texts):
+        for token in set(token for text in texts for token in tokens(text)):
+            postings.setdefault(token, []).append(index)
+    terms = sorted(postings)
+    tri = {}
+    for term_id, term in enumerate(terms):
+        for gram in trigrams(term):
+            tri.setdefault(gram, []).append(term_id)
+    return {
+        'version': INDEX_VERSION,
+        'kinds': KINDS,
+        'labels': documents.labels,
+        'urls': documents.urls,
+        'docKinds': documents.kinds,
+        'terms': terms,
+        'postings': [postings[term] for term in terms],
+        'trigrams': dict(sorted(tri.items())),
+    }
+
+
+class SearchIndex:
+    # Misma búsqueda que client/src/lib/searchIndex.ts
+    def __init__(self, data):
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version: {data.get('version')}")
+        self.data = data
+        self.terms = data['terms']
+
+    @classmethod
+    def load(cls, path=None):
+        with open(path or index_file(), 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def matching_terms(self, token):
+        # {id de término: puntuación}: prefijo (o exacto) y, si no hay, erratas
+        start = bisect.bisect_left(self.terms, token)
+        end = bisect.bisect_left(self.terms, token + '\uffff', start)
+        matches = {term_id: EXACT if self.terms[term_id] == token else PREFIX for term_id in range(start, end)}
+        if matches or len(token) < 3:
+            return matches
+        grams = trigrams(token)
+        shared = Counter(term_id for gram in grams for term_id in self.data['trigrams'].get(gram, ()))
+        return {term_id: hits / len(grams) for term_id, hits in shared.items()
+                if hits / len(grams) >= FUZZY_MIN and len(self.terms[term_id]) >= len(token) - 2}
+
+    def search(self, query, limit=10):
+        # Primero los documentos que encajan con más palabras de la consulta;
+        # luego por puntuación, tipo (páginas antes que productos) y etiqueta más corta
+        scores = {}
+        for token in dict.fromkeys(tokens(query)):
+            best = {}
+            for term_id, score in self.matching_terms(token).items():
+                for doc in self.data['postings'][term_id]:
+                    if score > best.get(doc, 0):
+                        best[doc] = score
+            for doc, score in best.items():
+                matched, total = scores.get(doc, (0, 0.0))
+                scores[doc] = (matched + 1, total + score)
+        if not scores:
+            return []
+        most = max(matched for matched, _ in scores.values())
+        labels, kinds = self.data['labels'], self.data['docKinds']
+        ranked = sorted((doc for doc, (matched, _) in scores.items() if matched == most),
+                        key=lambda doc: (-scores[doc][1], kinds[doc], len(labels[doc]), doc))
+        return [{'label': labels[doc], 'url': self.data['urls'][doc], 'kind': self.data['kinds'][kinds[doc]]}
+                for doc in ranked[:limit]]
+
+
+def build(args):
+    documents = DocumentSet()
+    with span('parse'):
+        add_category_pages(documents, args.seo_sitemap, args.categories_dir)
+        if os.path.exists(args.category_index):
+            add_woo_categories(documents, args.category_index)
+        if args.catalog:
+            add_products(documents, args.catalog)
+    with span('render'):
+        index = build_index(documents)
+    output = args.output or index_file()
+    with span('serialize'):
+        data = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with span('write'):
+        atomic_write(output, data)
+    count('files_written')
+    count('bytes_out', len(data))
+    print(f"Índice de búsqueda: {len(index['labels'])} documentos, {len(index['terms'])} términos, "
+          f"{len(data) / 1024:.1f} KB en {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compila nombres, slugs y search_intent en un índice de búsqueda estático')
+    parser.add_argument('--seo-sitemap', default=data_dir('seo-sitemap.json'))
+    parser.add_argument('--categories-dir', default=categories_dir())
+    parser.add_argument('--category-index', default=category_index_file())
+    parser.add_argument('--catalog', nargs='?', const=SNAPSHOT_FILE, default=None, metavar='SNAPSHOT',
+                        help=f"Also index products from the SQLite catalog snapshot (default: {SNAPSHOT_FILE})")
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--query', help='Search the existing index instead of building it')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    if args.query:
+        for result in SearchIndex.load(args.output).search(args.query):
+            print(f"{result['kind']:<13} {result['label']}  {result['url'] or ''}")
+        return
+
+    with profiling('search_index', args.profile):
+        build(args)
+
+
+if __name__ == "__main__":
+    main()
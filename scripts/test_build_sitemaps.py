@@ -0,0 +1,49 @@
+import argparse
+import gzip
+import os
+
+from build_sitemaps import SitemapWriter, build, existing_shards
+
+
+def test_plain_sitemap_shards_ignore_variants(tmp_path):
+    def write_shards(urls):
+        writer = SitemapWriter(str(tmp_path), 'products', compress=False, max_urls=2)
+        for i in range(urls):
+            writer.add(f"https://impacto33.com/p/{i}")
+        return writer.close()
+
+    assert write_shards(4) == ['sitemap-products-1.xml', 'sitemap-products-2.xml']
+    for name in ('sitemap-products-1.xml', 'sitemap-products-2.xml'):
+        (tmp_path / f"{name}.gz").write_bytes(b'gz')
+        (tmp_path / f"{name}.br").write_bytes(b'br')
+    assert existing_shards(str(tmp_path), 'products', compress=False) == ['sitemap-products-1.xml',
+                                                                          'sitemap-products-2.xml']
+
+    # El shard 2 sobra: se borra; la variante .gz del shard 1 se queda (la .br es cosa de precompress)
+    assert write_shards(2) == ['sitemap-products-1.xml']
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        'sitemap-products-1.xml', 'sitemap-products-1.xml.br', 'sitemap-products-1.xml.gz',
+        'sitemap-products-2.xml.br']
+
+
+def test_index_skips_listed_urls_and_keeps_mtimes(tmp_path):
+    (tmp_path / 'sitemap.xml').write_text(
+        '<urlset><url><loc>https://impacto33.com/</loc></url>'
+        '<url><loc>https://impacto33.com/camisetas-personalizadas</loc></url></urlset>', encoding='utf-8')
+    (tmp_path / 'seo-sitemap.json').write_text(
+        '[{"url": "/camisetas-personalizadas/"}, {"url": "/tazas-personalizadas/"}]', encoding='utf-8')
+    args = argparse.Namespace(base_url='https://impacto33.com', no_gzip=False, extra_sitemap=None,
+                              output_dir=str(tmp_path), seo_sitemap=str(tmp_path / 'seo-sitemap.json'),
+                              categories_dir=str(tmp_path / 'categories'), products=[], catalog=None)
+
+    build(args)
+    # La categoría que ya está en sitemap.xml (con o sin barra final) no se repite
+    shard = gzip.decompress((tmp_path / 'sitemap-categories-1.xml.gz').read_bytes()).decode('utf-8')
+    assert '/tazas-personalizadas/' in shard and 'camisetas' not in shard
+
+    # Un shard sin cambios conserva su mtime, y el índice usa el de cada archivo
+    for name in ('sitemap.xml', 'sitemap-categories-1.xml.gz'):
+        os.utime(tmp_path / name, (1704153600, 1704153600))  # 2024-01-02
+    build(args)
+    index = (tmp_path / 'sitemap-index.xml').read_text(encoding='utf-8')
+    assert index.count('<lastmod>2024-01-02</lastmod>') == 2
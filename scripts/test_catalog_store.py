@@ -0,0 +1,50 @@
+import json
+
+from catalog_store import CatalogStore, ingest
+
+
+def write_fixture_dump(directory):
+    # Volcado mínimo: una página de productos, otra de variaciones y otra de categorías
+    products = {"data": {"products": {"nodes": [
+        {"databaseId": 10, "slug": "camiseta-basica", "name": "Camiseta básica", "type": "VARIABLE",
+         "modified": "2025-01-10T00:00:00",
+         "productCategories": {"nodes": [{"slug": "camisetas"}]},
+         "variations": {"nodes": [{"databaseId": 101, "sku": "CB-R-M"}]}},
+        {"databaseId": 11, "slug": "taza-blanca", "name": "Taza blanca", "type": "SIMPLE",
+         "modified": "2025-03-01T00:00:00", "sku": "TB",
+         "productCategories": {"nodes": [{"slug": "tazas"}]}},
+    ]}}}
+    variations = {"data": {"product": {"databaseId": 10, "variations": {"nodes": [
+        {"databaseId": 101, "sku": "CB-R-M"},
+        {"databaseId": 102, "sku": "CB-R-L"},
+    ]}}}}
+    categories = {"data": {"productCategories": {"nodes": [
+        {"slug": "textil", "name": "Textil", "children": {"nodes": [{"slug": "camisetas", "name": "Camisetas"}]}},
+        {"slug": "camisetas", "name": "Camisetas"},
+    ]}}}
+    for name, page in (('products-1.json', products), ('variations-10.json', variations),
+                       ('categories.json', categories)):
+        (directory / name).write_text(json.dumps(page), encoding='utf-8')
+
+
+def test_snapshot_queries(tmp_path):
+    dump = tmp_path / 'dump'
+    dump.mkdir()
+    write_fixture_dump(dump)
+    output = ingest([str(dump)], str(tmp_path / 'catalog.sqlite'))
+
+    with CatalogStore(output) as store:
+        assert store.count('products') == 2
+        # La página de variaciones sustituye a las que venían con el producto
+        assert [v['sku'] for v in store.variations(10)] == ['CB-R-M', 'CB-R-L']
+        assert store.product('taza-blanca')['sku'] == 'TB'
+        assert store.product('no-existe') is None
+        assert [p['slug'] for p in store.in_category('camisetas')] == ['camiseta-basica']
+        assert [p['slug'] for p in store.modified_since('2025-02-01')] == ['taza-blanca']
+        # El padre conocido por el árbol se conserva aunque la categoría se repita como raíz
+        assert {'slug': 'camisetas', 'name': 'Camisetas', 'parent_slug': 'textil'} in store.categories()
+
+        products = list(store.iter_products())
+        assert [p['slug'] for p in products] == ['camiseta-basica', 'taza-blanca']
+        assert len(products[0]['variations']['nodes']) == 2
+        assert 'variations' not in products[1]
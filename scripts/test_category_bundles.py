@@ -0,0 +1,33 @@
+import json
+
+import project_paths
+from category_bundles import write_bundles
+
+
+def test_changed_pages_repack_only_their_sections(tmp_path, monkeypatch):
+    monkeypatch.setattr(project_paths, '_project_root', str(tmp_path))
+    pages = tmp_path / 'categories'
+    pages.mkdir()
+    bundles = tmp_path / 'bundles'
+    index_file = tmp_path / 'index.json'
+
+    def write_page(slug, url):
+        (pages / f"{slug}.json").write_text(json.dumps({"url": url, "slug": slug}), encoding='utf-8')
+
+    write_page('ceramica', '/tazas/ceramica')
+    write_page('aluminio', '/botellas/aluminio')
+    write_page('polar', '/ropa/polar')
+    write_bundles(str(pages), str(bundles), str(index_file))
+    assert sorted(p.name for p in bundles.iterdir()) == ['botellas.json', 'ropa.json', 'tazas.json']
+
+    # Un bundle que no está afectado no se vuelve a escribir aunque esté desfasado
+    (bundles / 'ropa.json').write_text('{}', encoding='utf-8')
+    # aluminio pasa de botellas a tazas: botellas se queda vacío y se borra
+    write_page('aluminio', '/tazas/aluminio')
+    report = write_bundles(str(pages), str(bundles), str(index_file), changed=['aluminio.json'])
+    assert sorted(report['written']) == ['index.json', 'tazas.json']
+    assert report['deleted'] == ['botellas.json']
+    assert (bundles / 'ropa.json').read_text(encoding='utf-8') == '{}'
+    assert set(json.loads((bundles / 'tazas.json').read_text(encoding='utf-8'))['pages']) == {'ceramica', 'aluminio'}
+    assert json.loads(index_file.read_text(encoding='utf-8')) == {
+        'aluminio': 'tazas', 'ceramica': 'tazas', 'polar': 'ropa'}
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from category_routes import RouteCollisionError, write_redirect_table
+from generate_category_pages import definition_redirects
+
+
+def test_redirects_point_to_existing_pages(tmp_path):
+    pages = tmp_path / 'categories'
+    pages.mkdir()
+    (pages / 'taza-sublimacion.json').write_text(json.dumps({"url": "/tazas-personalizadas/taza-sublimacion"}),
+                                                 encoding='utf-8')
+    (pages / 'ceramica.json').write_text(json.dumps({"url": "/tazas-botellas/tazas/ceramica/"}), encoding='utf-8')
+    definition = {"prefix": "tazas-botellas", "redirects": [["sublimacion", "tazas", "taza-sublimacion"]]}
+
+    report = write_redirect_table(definition_redirects([definition]), str(pages))
+    assert report['written'] == ['category-redirects.json']
+    assert json.loads((tmp_path / 'category-redirects.json').read_text(encoding='utf-8')) == {
+        '/tazas-botellas/tazas/sublimacion': '/tazas-personalizadas/taza-sublimacion'}
+
+    # La ruta antigua no puede tener página propia ni apuntar a una que no existe
+    with pytest.raises(RouteCollisionError, match='es la ruta de ceramica.json'):
+        write_redirect_table({'/tazas-botellas/tazas/ceramica/': 'taza-sublimacion'}, str(pages))
+    with pytest.raises(RouteCollisionError, match='bolsa-botella.json no existe'):
+        write_redirect_table({'/bolsas-mochilas/bolsas/bolsas-para-botellas/': 'bolsa-botella'}, str(pages))
@@ -0,0 +1,87 @@
+import time
+
+from generate_json import build_structures, parse_lines
+
+
+def synthetic_lines(n, children_per_parent=50):
+    # categorias.txt sintético: una madre cada `children_per_parent` líneas
+    lines = []
+    for i in range(n):
+        parent = i // children_per_parent
+        if i % children_per_parent == 0:
+            lines.append(f"Categoría {parent} https://impacto33.com/madre-{parent}/\n")
+        else:
+            lines.append(f"Hija {i} https://impacto33.com/madre-{parent}/hija-{i}/\n")
+    return lines
+
+
+def quadratic_reference(items):
+    # Implementación original: reescanea `items` para cada categoría
+    seo_sitemap = []
+    for item in items:
+        if item['parent_slug']:
+            siblings = [s['name'].lower() for s in items if s['parent_slug'] == item['parent_slug'] and s['slug'] != item['slug']]
+        else:
+            siblings = [s['name'].lower() for s in items if not s['parent_slug'] and s['slug'] != item['slug']]
+        entry = {
+            "url": item['url'],
+            "slug": item['slug'],
+            "parent_slug": item['parent_slug'],
+            "search_intent": item['name'].lower(),
+            "siblings_intents": siblings[:5],
+            "tipo": item['tipo'],
+            "anchor": item['name'],
+        }
+        if item['tipo'] == 'categoria_madre':
+            children = [{"url": c['url'], "anchor": c['name']} for c in items if c['parent_slug'] == item['slug']]
+            if children:
+                entry['children'] = children
+        if item['tipo'] == 'categoria_hija':
+            entry['parent'] = f"/{item['parent_slug']}/"
+        seo_sitemap.append(entry)
+    return seo_sitemap
+
+
+def test_matches_original_output():
+    lines = synthetic_lines(600, children_per_parent=7)
+    lines.insert(3, "línea sin url\n")
+    items = list(parse_lines(lines))
+    seo_sitemap, dynamic_blocks = build_structures(items, 'first')
+    assert seo_sitemap == quadratic_reference(items)
+    assert len(dynamic_blocks) == len(items) == 600
+
+
+def test_scaling_is_linear():
+    def best_time(n):
+        lines = synthetic_lines(n)
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            build_structures(parse_lines(lines), 'first')
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    small = best_time(10_000)
+    large = best_time(100_000)
+    # 10x más líneas: lineal ~10x, cuadrático ~100x
+    assert large / small < 25
+    assert large < 5
+
+
+def test_related_siblings():
+    lines = [
+        "Camisetas https://impacto33.com/textil/camisetas/\n",
+        "Camisetas técnicas https://impacto33.com/deporte/camisetas-tecnicas/\n",
+        "Polos https://impacto33.com/textil/polos/\n",
+        "Tazas https://impacto33.com/hogar/tazas/\n",
+        "Tazas de cerámica https://impacto33.com/hogar/tazas-ceramica/\n",
+        "Bolígrafos https://impacto33.com/oficina/boligrafos/\n",
+    ]
+    seo_sitemap, _ = build_structures(parse_lines(lines))
+    by_slug = {entry['slug']: entry for entry in seo_sitemap}
+    # Primero la más parecida aunque sea de otro padre; nada sin relación
+    assert by_slug['camisetas']['siblings_intents'][0] == 'camisetas técnicas'
+    assert 'bolígrafos' not in by_slug['camisetas']['siblings_intents']
+    assert by_slug['tazas']['related'][0] == {"url": "/hogar/tazas-ceramica/",
+                                              "anchor": "Tazas de cerámica"}
+    assert 'related' not in by_slug['boligrafos']
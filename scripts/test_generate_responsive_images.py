@@ -0,0 +1,159 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Pico de memoria del proceso hijo tras generar las renditions de una imagen.
+# VmHWM es el pico del espacio de memoria actual, que empieza de cero con el
+# exec; ru_maxrss en cambio arrastra el pico del fork de pytest.
+PEAK_RSS_SNIPPET = """
+import sys
+import generate_responsive_images as g
+_, info, error = g.process_image(sys.argv[1], sys.argv[2], sys.argv[3], low_memory=sys.argv[4] == '1')
+assert error is None, error
+with open('/proc/self/status') as f:
+    print(next(line.split()[1] for line in f if line.startswith('VmHWM:')))
+"""
+
+
+def peak_rss_mb(tmp_path, image_path, low_memory):
+    output_dir = tmp_path / 'out'
+    result = subprocess.run(
+        [sys.executable, '-c', PEAK_RSS_SNIPPET, image_path, str(tmp_path), str(output_dir), '1' if low_memory else '0'],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True,
+        env=dict(os.environ, IMPACTO33_ROOT=str(tmp_path)),
+    )
+    # VmHWM está en kB
+    return int(result.stdout.strip()) / 1024
+
+
+LARGE_SOURCES_SNIPPET = """
+import os, sys
+from PIL import Image
+img = Image.linear_gradient('L').resize((8000, 8000)).convert('RGB')
+img.save(os.path.join(sys.argv[1], 'huge.jpg'), quality=85)
+img.convert('RGBA').save(os.path.join(sys.argv[1], 'huge.png'))
+"""
+
+
+@pytest.fixture(scope='module')
+def large_sources(tmp_path_factory):
+    # 8000x8000 RGB = 192 MB decodificada entera; se crean en otro proceso
+    # para no inflar la memoria de pytest
+    tmp_path = tmp_path_factory.mktemp('sources')
+    subprocess.run([sys.executable, '-c', LARGE_SOURCES_SNIPPET, str(tmp_path)], check=True)
+    return tmp_path
+
+
+@pytest.mark.skipif(sys.platform != 'linux', reason='VmHWM de /proc solo en Linux')
+def test_large_jpeg_peak_memory(large_sources):
+    # draft() decodifica a 1/4 (2000x2000), así que el pico queda muy por debajo de 192 MB
+    assert peak_rss_mb(large_sources, 'huge.jpg', low_memory=True) < 120
+
+
+@pytest.mark.skipif(sys.platform != 'linux', reason='VmHWM de /proc solo en Linux')
+def test_large_png_low_memory_peak(large_sources):
+    # El PNG se decodifica entero (256 MB en RGBA); con low_memory se reduce por
+    # franjas y el original se libera antes del LANCZOS
+    normal = peak_rss_mb(large_sources, 'huge.png', low_memory=False)
+    low = peak_rss_mb(large_sources, 'huge.png', low_memory=True)
+    assert low < normal
+    assert low < 400
+
+
+def test_renditions_from_large_jpeg(large_sources):
+    import generate_responsive_images as g
+
+    _, info, error = g.process_image('huge.jpg', str(large_sources), str(large_sources / 'renditions'), low_memory=True)
+    assert error is None
+    assert (info['width'], info['height']) == (8000, 8000)
+    widths = sorted({r['width'] for r in info['renditions']})
+    assert widths == sorted(g.SIZES.values())
+
+
+def test_small_transparent_png_not_upscaled(tmp_path):
+    import generate_responsive_images as g
+
+    # Icono de 64 px: una sola rendición a su tamaño, con el fondo aún transparente
+    icon = Image.new('RGBA', (64, 40), (0, 0, 0, 0))
+    icon.paste((200, 0, 0, 255), (10, 10, 30, 30))
+    icon.convert('P').save(tmp_path / 'icono.png', transparency=0)
+
+    _, info, error = g.process_image('icono.png', str(tmp_path), str(tmp_path / 'out'))
+    assert error is None
+    assert [(r['file'], r['width'], r['height']) for r in info['renditions']] == [
+        ('icono-mobile.png', 64, 40), ('icono-mobile.webp', 64, 40)]
+    for item in info['renditions']:
+        with Image.open(tmp_path / 'out' / item['file']) as rendition:
+            assert rendition.mode == 'RGBA'
+            assert rendition.getpixel((0, 0))[3] == 0 and rendition.getpixel((20, 20))[3] == 255
+
+
+def test_dedupe_groups_resized_copies(tmp_path, monkeypatch):
+    import image_dedupe
+
+    monkeypatch.setattr(image_dedupe, 'HASH_CACHE_FILE', str(tmp_path / 'hashes.json'))
+    photo = Image.radial_gradient('L').resize((1200, 900)).convert('RGB')
+    photo.save(tmp_path / 'producto.jpg', quality=90)
+    # La misma foto subida otra vez más pequeña y recomprimida, y otra distinta
+    photo.resize((600, 450)).save(tmp_path / 'producto-copia.jpg', quality=60)
+    Image.linear_gradient('L').resize((1200, 900)).convert('RGB').save(tmp_path / 'otra.jpg')
+
+    hashes = image_dedupe.hash_images(str(tmp_path), ['otra.jpg', 'producto-copia.jpg', 'producto.jpg'])
+    clusters = image_dedupe.find_clusters(hashes)
+    assert clusters == [['producto.jpg', 'producto-copia.jpg']]
+    assert image_dedupe.canonical_map(clusters) == {'producto-copia.jpg': 'producto.jpg'}
+
+
+def test_adaptive_encoding_meets_target_and_budget():
+    import adaptive_encoding as a
+
+    # Ilustración plana: aguanta calidades bajas sin perder fidelidad
+    img = Image.radial_gradient('L').resize((480, 360)).convert('RGB')
+    settings = a.adaptive_settings('psnr', 48)
+    data, record = a.encode_adaptive(img, 'webp', settings, baseline_quality=85)
+    assert record['target_met'] and record['psnr'] >= 48
+    assert record['quality'] < 85 and len(data) == record['bytes'] < record['baseline_bytes']
+
+    # Con un presupuesto menor, manda el presupuesto aunque no se llegue a la métrica
+    smallest = len(a.encode(img, 'webp', a.MIN_QUALITY))
+    budget = (smallest + record['bytes']) // 2
+    data, record = a.encode_adaptive(img, 'webp', settings, budget, baseline_quality=85)
+    assert record['within_budget'] and not record['target_met'] and len(data) <= budget
+
+    if a.np is not None:
+        assert a.ssim(img, img) == 1.0
+
+
+def test_placeholder_from_same_decode(tmp_path):
+    import base64
+    import io
+
+    import generate_responsive_images as g
+    from image_placeholders import write_placeholders
+
+    # Fondo rojo con una franja azul: el color dominante es el rojo, no la mezcla
+    img = Image.new('RGB', (900, 600), (200, 30, 30))
+    img.paste((20, 40, 220), (0, 0, 900, 150))
+    img.save(tmp_path / 'banner.jpg', quality=95)
+
+    _, info, error = g.process_image('banner.jpg', str(tmp_path), str(tmp_path / 'out'))
+    assert error is None
+    placeholder = info['placeholder']
+    assert placeholder['aspect'] == 1.5
+    red, green, blue = (int(placeholder['color'][i:i + 2], 16) for i in (1, 3, 5))
+    assert red > 150 and green < 80 and blue < 80
+    header, encoded = placeholder['lqip'].split(',', 1)
+    assert header == 'data:image/webp;base64'
+    with Image.open(io.BytesIO(base64.b64decode(encoded))) as thumb:
+        assert thumb.size == (16, 11)
+
+    images = {'banner.jpg': dict(info, sha256='x')}
+    data = write_placeholders(images, str(tmp_path / 'placeholders.json'), canonical={'copia.jpg': 'banner.jpg'})
+    assert data['/images/copia.jpg'] == data['/images/banner.jpg']
+    assert data['/images/banner.jpg']['width'] == 900
@@ -0,0 +1,70 @@
+import gzip
+import json
+import xml.etree.ElementTree as ET
+
+from catalog_store import CatalogStore, ingest
+from merchant_feed import format_price, write_delta, write_feed
+
+G = '{http://base.google.com/ns/1.0}'
+
+
+def test_format_price_matches_service():
+    assert format_price('4,50&nbsp;€') == '4.50 EUR'
+    assert format_price('1,50&nbsp;€ - 3,00&nbsp;€') == '1.50 EUR'
+    assert format_price('') == '0.00 EUR'
+    assert format_price('consultar') == '0.00 EUR'
+
+
+def test_one_item_per_variation(tmp_path):
+    products = [
+        {"databaseId": 1, "slug": "camiseta", "name": "Camiseta <básica>", "type": "VARIABLE", "sku": "CAM",
+         "description": "<p>Algodón&nbsp;100%</p>", "image": {"sourceUrl": "https://x/1.jpg"},
+         "variations": {"nodes": [
+             {"databaseId": 11, "sku": "CAM-R", "price": "5,00&nbsp;€", "stockStatus": "OUT_OF_STOCK",
+              "attributes": {"nodes": [{"name": "pa_color", "value": "azul-marino"},
+                                       {"name": "pa_talla", "value": "xl"}]}},
+             {"databaseId": 12, "price": "5,00&nbsp;€", "salePrice": "4,00&nbsp;€"},
+         ]}},
+        {"databaseId": 2, "slug": "taza", "name": "Taza", "type": "SIMPLE", "price": "3,00&nbsp;€"},
+    ]
+    output = str(tmp_path / 'feed.xml.gz')
+    writer = write_feed(iter(products), output)
+    assert (writer.products, writer.items) == (2, 3)
+
+    with gzip.open(output) as f:
+        items = ET.parse(f).findall('channel/item')
+    first, second, simple = [{child.tag[len(G):]: child.text for child in item} for item in items]
+    assert first['title'] == 'Camiseta <básica> - Azul Marino - Xl'
+    assert first['description'] == 'Algodón 100%'
+    assert first['link'] == 'https://impacto33.com/producto/camiseta'
+    assert (first['price'], first['availability'], first['mpn']) == ('5.00 EUR', 'out of stock', 'CAM-R')
+    assert (first['item_group_id'], first['color'], first['size']) == ('1', 'Azul Marino', 'Xl')
+    # Sin SKU ni imagen propios, la variación hereda los del producto
+    assert (second['mpn'], second['image_link'], second['price']) == ('CAM', 'https://x/1.jpg', '4.00 EUR')
+    assert 'item_group_id' not in simple and simple['price'] == '3.00 EUR'
+
+
+def test_delta_feed(tmp_path):
+    def snapshot(name, products):
+        path = tmp_path / f"{name}.ndjson"
+        path.write_text(''.join(json.dumps(p) + '\n' for p in products), encoding='utf-8')
+        return ingest([str(path)], str(tmp_path / f"{name}.sqlite"))
+
+    def variable(product_id, modified, variation_ids):
+        return {"databaseId": product_id, "slug": f"p-{product_id}", "name": f"P{product_id}", "type": "VARIABLE",
+                "modified": modified, "variations": {"nodes": [{"databaseId": v} for v in variation_ids]}}
+
+    old = snapshot('old', [variable(1, '2025-01-01', [11, 12]), variable(2, '2025-01-01', [21, 22]),
+                           variable(3, '2025-01-01', [31])])
+    # 1 sin cambios, 2 pierde una variación sin tocar `modified`, 3 se elimina, 4 es nuevo
+    new = snapshot('new', [variable(1, '2025-01-01', [11, 12]), variable(2, '2025-01-01', [21]),
+                           variable(4, '2025-02-01', [41])])
+
+    with CatalogStore(new) as store, CatalogStore(old) as baseline:
+        writer, log = write_delta(store, baseline, str(tmp_path / 'delta.xml'))
+    assert {key: [p['id'] for p in products] for key, products in log.items()} == \
+        {'added': [4], 'changed': [2], 'removed': [3]}
+
+    items = ET.parse(str(tmp_path / 'delta.xml')).findall('channel/item')
+    availability = {item.find(f'{G}id').text: item.find(f'{G}availability').text for item in items}
+    assert availability == {'41': 'in stock', '21': 'in stock', '22': 'out of stock', '31': 'out of stock'}
@@ -0,0 +1,31 @@
+import argparse
+import gzip
+
+import precompress
+
+
+def run(root):
+    precompress.generate(argparse.Namespace(root=[str(root)], jobs=1, force=False))
+
+
+def test_variants_are_incremental(tmp_path, monkeypatch):
+    monkeypatch.setattr(precompress, 'MANIFEST_FILE', str(tmp_path / 'manifest.json'))
+    root = tmp_path / 'public'
+    (root / 'feeds').mkdir(parents=True)
+    sitemap = root / 'sitemap.xml'
+    sitemap.write_text('<url><loc>https://impacto33.com/</loc></url>\n' * 200, encoding='utf-8')
+    (root / 'feeds' / 'google.xml').write_text('<item>camiseta</item>\n' * 500, encoding='utf-8')
+    (root / 'robots.txt').write_text('User-agent: *\n', encoding='utf-8')  # < MIN_SIZE
+    (root / 'logo.png').write_bytes(b'\x89PNG' * 1000)
+
+    run(root)
+    assert gzip.decompress((root / 'sitemap.xml.gz').read_bytes()) == sitemap.read_bytes()
+    assert (root / 'feeds' / 'google.xml.gz').exists()
+    assert not (root / 'robots.txt.gz').exists() and not (root / 'logo.png.gz').exists()
+
+    # Sin cambios no se reescribe nada; si la fuente desaparece, sus variantes tampoco quedan
+    mtime = (root / 'sitemap.xml.gz').stat().st_mtime_ns
+    (root / 'feeds' / 'google.xml').unlink()
+    run(root)
+    assert (root / 'sitemap.xml.gz').stat().st_mtime_ns == mtime
+    assert not (root / 'feeds' / 'google.xml.gz').exists()
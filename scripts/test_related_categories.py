@@ -0,0 +1,35 @@
+import pytest
+
+import related_categories
+from generate_json import parse_lines
+from related_categories import weighted_vectors
+from test_generate_json import synthetic_lines
+
+pytest.importorskip('numpy')
+
+
+def python_related(texts, groups, k=5):
+    return related_categories._related_python(weighted_vectors(texts), groups, k)
+
+
+def test_numpy_matches_pure_python(monkeypatch):
+    # Nombres con muchos empates exactos ("Hija 12" y "Hija 13") y grupos
+    items = list(parse_lines(synthetic_lines(400, children_per_parent=9)))
+    texts = [item['name'] for item in items]
+    groups = [item['parent_slug'] for item in items]
+    words = ['camisetas', 'técnicas', 'tazas', 'cerámica', 'bordadas', 'térmicas', 'bolsas', 'algodón']
+    texts += [f"{words[i % 8]} {words[i * 3 % 7]} {words[i * 5 % 8]}" for i in range(200)]
+    groups += [words[i % 3] for i in range(200)]
+
+    expected = python_related(texts, groups)
+    expected_ungrouped = python_related(texts, None, 3)
+    assert related_categories._related_numpy(texts, groups, 5) == expected
+    assert related_categories._related_numpy(texts, None, 3) == expected_ungrouped
+    # Índice invertido (en bloques pequeños) y matriz densa, cada uno por separado
+    monkeypatch.setattr(related_categories, 'EXPANSION_COST', 0)
+    monkeypatch.setattr(related_categories, 'PAIR_BUDGET', 500)
+    assert related_categories._related_numpy(texts, groups, 5) == expected
+    assert related_categories._related_numpy(texts, None, 3) == expected_ungrouped
+    monkeypatch.setattr(related_categories, 'EXPANSION_COST', 10 ** 12)
+    monkeypatch.setattr(related_categories, 'DENSE_BUDGET', 5000)
+    assert related_categories._related_numpy(texts, groups, 5) == expected
@@ -0,0 +1,35 @@
+import json
+
+from search_index import DocumentSet, SearchIndex, add_category_pages, build_index
+
+
+def test_prefix_accents_and_typos(tmp_path):
+    pages = tmp_path / 'categories'
+    pages.mkdir()
+    (pages / 'beisbol.json').write_text(json.dumps({
+        "url": "/gorras-personalizadas/beisbol", "slug": "beisbol", "search_intent": "gorras de béisbol bordadas",
+        "meta_title": "Gorras de Béisbol | Gorras Personalizadas | IMPACTO33"}), encoding='utf-8')
+    sitemap = tmp_path / 'seo-sitemap.json'
+    sitemap.write_text(json.dumps([
+        {"url": "/camisetas-personalizadas/", "slug": "camisetas-personalizadas", "anchor": "Camisetas personalizadas",
+         "search_intent": "camisetas personalizadas"},
+        {"url": "/camisetas-personalizadas/camisetas-tecnicas/", "slug": "camisetas-tecnicas",
+         "anchor": "Camisetas técnicas", "search_intent": "camisetas técnicas"},
+        # Misma URL que la página de categories/: un solo documento
+        {"url": "/gorras-personalizadas/beisbol/", "slug": "beisbol", "anchor": "Gorras béisbol",
+         "search_intent": "gorras béisbol"},
+    ]), encoding='utf-8')
+
+    documents = DocumentSet()
+    add_category_pages(documents, str(sitemap), str(pages))
+    index = SearchIndex(json.loads(json.dumps(build_index(documents))))
+
+    def labels(query):
+        return [result['label'] for result in index.search(query)]
+
+    assert labels('Béisbol') == labels('beisbol') == ['Gorras béisbol']
+    assert labels('cami') == ['Camisetas técnicas', 'Camisetas personalizadas']
+    # Todas las palabras cuentan; "de" se ignora
+    assert labels('camisetas de tecn') == ['Camisetas técnicas']
+    assert labels('camistea') == ['Camisetas técnicas', 'Camisetas personalizadas']
+    assert labels('zz') == []
@@ -0,0 +1,60 @@
+import json
+
+import project_paths
+import validate_category_pages
+from validate_category_pages import PAGE_SCHEMA, compile_schema, validate, validate_page
+
+
+def page(slug, parent_slug, url, siblings):
+    return {
+        "url": url, "slug": slug, "parent_slug": parent_slug, "search_intent": f"{slug} personalizadas",
+        "siblings_intents": siblings, "hero_tituloPrincipal": slug.title(), "hero_intro": "Intro",
+        "hub_subcategorias_texto": "", "ventajasEmpresa": {"titulo": "Ventajas", "items": ["Rápido"]},
+        "casosUso": [{"titulo": "Eventos", "descripcion": "Ferias", "image_alt": "Feria"}],
+        "faq": [{"pregunta": "¿Mínimo?", "respuesta": "Una unidad"}],
+        "texto_final_refuerzo": "Pide ya", "cta_textoCta": "Presupuesto",
+        "meta_title": f"{slug} | IMPACTO33", "meta_description": "Descripción",
+    }
+
+
+def test_schema_errors_have_paths():
+    check = compile_schema(PAGE_SCHEMA)
+    good = page('tazas', '', '/tazas/', [])
+    assert validate_page(good, check) == []
+
+    review = {"text": "Genial", "author": "Ana", "company": "", "rating": "5", "date": "2024-05-01"}
+    bad = dict(good, url='/menaje/vasos/tazas/', faq=[{"pregunta": "¿Plazo?"}], featured_review=review)
+    del bad['meta_title']
+    assert validate_page(bad, check) == [
+        "$.featured_review.rating: se esperaba number, hay string",
+        "$.faq[0].respuesta: falta",
+        "$.meta_title: falta",
+        "$.url: '/menaje/vasos/tazas/' no cuelga de parent_slug ''",
+    ]
+
+
+def test_cross_references_and_incremental(tmp_path, monkeypatch):
+    monkeypatch.setattr(project_paths, '_project_root', str(tmp_path))
+    monkeypatch.setattr(validate_category_pages, 'MANIFEST_FILE', str(tmp_path / 'manifest.json'))
+    monkeypatch.setattr(validate_category_pages, 'load_definitions', lambda: [])
+    pages = tmp_path / 'categories'
+    pages.mkdir()
+    for name, data in {
+        'tazas': page('tazas', '', '/tazas/', ['Botellas Térmicas']),
+        'ceramica': page('ceramica', 'tazas', '/tazas/ceramica/', ['tazas metálicas']),
+        'botellas-termicas': page('botellas-termicas', 'botellas', '/botellas/botellas-termicas/', []),
+    }.items():
+        (pages / f"{name}.json").write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+    errors, warnings, validated, total = validate(str(pages))
+    assert (validated, total) == (3, 3)
+    assert errors == {'botellas-termicas.json': ["$.parent_slug: 'botellas' no existe"]}
+    assert warnings == {'ceramica.json': ["$.siblings_intents[0]: 'tazas metálicas' no existe"]}
+
+    # Sin cambios no se vuelve a abrir ninguna página, pero los cruces siguen
+    # viéndose: el padre que faltaba aparece en otra página
+    (pages / 'botellas.json').write_text(json.dumps(page('botellas', '', '/botellas/', [])), encoding='utf-8')
+    errors, warnings, validated, total = validate(str(pages))
+    assert (validated, total) == (1, 4)
+    assert errors == {}
+    assert list(warnings) == ['ceramica.json']
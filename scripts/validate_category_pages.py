@@ -0,0 +1,407 @@
+import argparse
+import glob
+import json
+import os
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+from category_index import index_file as category_index_file
+from generate_category_pages import load_definitions
+from incremental_output import atomic_write, content_hash, file_hash
+from instrumentation import add_profile_argument, collect, count, merge, profiling, span
+from project_paths import categories_dir, data_dir, project_path
+
+# Validación de los JSON de categorías antes de que lleguen al navegador.
+# El esquema es el de SeoCategoryData (shared/types.ts), la estructura común de
+# create_category_data y create_service_data. Se compila una vez en funciones
+# de comprobación (como compile_template en generate_category_pages.py) y las
+# páginas se reparten en bloques entre procesos. Después se comprueba que
+# existen los destinos de parent_slug y siblings_intents, con los resúmenes de
+# todas las páginas. Las páginas sin cambios salen del manifiesto sin abrirlas.
+TEXT = 'text'      # cadena no vacía
+NUMBER = 'number'
+SLUG = 'slug'
+
+
+class Optional:
+    def __init__(self, spec):
+        self.spec = spec
+
+    def __repr__(self):
+        return f"Optional({self.spec!r})"
+
+
+# hub_subcategorias_texto puede ir vacío (CategoryPage pone un título por defecto);
+# las páginas escritas a mano con el formato ampliado (boligrafo.json) llevan
+# related_categories en lugar de siblings_intents
+PAGE_SCHEMA = {
+    'url': TEXT,
+    'slug': SLUG,
+    'parent_slug': str,
+    'search_intent': TEXT,
+    'siblings_intents': Optional([TEXT]),
+    'hero_tituloPrincipal': TEXT,
+    'hero_intro': TEXT,
+    'subcategories': Optional([{'title': TEXT, 'url': TEXT, 'description': str}]),
+    'hub_subcategorias_texto': str,
+    'ventajasEmpresa': {'titulo': TEXT, 'items': [TEXT]},
+    'casosUso': [{'titulo': TEXT, 'descripcion': TEXT, 'image_alt': TEXT}],
+    'featured_review': Optional({'text': TEXT, 'author': TEXT, 'company': str, 'rating': NUMBER, 'date': TEXT}),
+    'faq': [{'pregunta': TEXT, 'respuesta': TEXT}],
+    'texto_final_refuerzo': TEXT,
+    'cta_textoCta': TEXT,
+    'filters_seo': Optional({str: [TEXT]}),
+    'meta_title': TEXT,
+    'meta_description': TEXT,
+}
+
+SLUG_RE = re.compile(r'[a-z0-9]+(?:-[a-z0-9]+)*')
+KEY_RE = re.compile(r'[^a-z0-9]+')
+# "tazas cerámica personalizadas" también responde a "tazas cerámica"
+SUFFIX_RE = re.compile(r'-personalizad[oa]s?$')
+
+MANIFEST_FILE = project_path('.build-cache', 'validate-category-pages.json')
+MANIFEST_VERSION = 1
+# Con menos páginas pendientes no compensa arrancar procesos
+PARALLEL_MIN = 200
+
+
+def type_name(value):
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, (int, float)):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, list):
+        return 'array'
+    return 'object'
+
+
+def compile_schema(spec):
+    # Devuelve check(value, path, errors), que añade a `errors` los problemas
+    # encontrados. El recorrido del esquema se hace aquí, una sola vez.
+    if spec is str:
+        def check(value, path, errors):
+            if not isinstance(value, str):
+                errors.append(f"{path}: se esperaba string, hay {type_name(value)}")
+        return check
+
+    if spec == TEXT:
+        def check(value, path, errors):
+            if not isinstance(value, str):
+                errors.append(f"{path}: se esperaba string, hay {type_name(value)}")
+            elif not value.strip():
+                errors.append(f"{path}: vacío")
+        return check
+
+    if spec == SLUG:
+        def check(value, path, errors):
+            if not isinstance(value, str) or not SLUG_RE.fullmatch(value):
+                errors.append(f"{path}: slug no válido {value!r}")
+        return check
+
+    if spec == NUMBER:
+        def check(value, path, errors):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                errors.append(f"{path}: se esperaba number, hay {type_name(value)}")
+        return check
+
+    if isinstance(spec, list):
+        check_item = compile_schema(spec[0])
+
+        def check(value, path, errors):
+            if not isinstance(value, list):
+                errors.append(f"{path}: se esperaba array, hay {type_name(value)}")
+                return
+            for index, item in enumerate(value):
+                check_item(item, f"{path}[{index}]", errors)
+        return check
+
+    if isinstance(spec, dict) and str in spec:
+        # Diccionario de claves libres ({str: spec})
+        check_value = compile_schema(spec[str])
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path}: se esperaba object, hay {type_name(value)}")
+                return
+            for key, item in value.items():
+                check_value(item, f"{path}.{key}", errors)
+        return check
+
+    if isinstance(spec, dict):
+        fields = [(key, isinstance(field, Optional), compile_schema(getattr(field, 'spec', field)))
+                  for key, field in spec.items()]
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path}: se esperaba object, hay {type_name(value)}")
+                return
+            # Las claves de más se permiten (algunas páginas llevan canonical, h1...)
+            for key, optional, check_field in fields:
+                if key in value:
+                    check_field(value[key], f"{path}.{key}", errors)
+                elif not optional:
+                    errors.append(f"{path}.{key}: falta")
+        return check
+
+    raise ValueError(f"Unknown schema node: {spec!r}")
+
+
+def schema_fingerprint(schema=PAGE_SCHEMA):
+    # Parte de la clave del manifiesto: si cambia el esquema se revalida todo
+    return content_hash(repr(schema).encode('utf-8'))
+
+
+def check_url(page, errors):
+    # El último segmento de la URL es el slug y, si hay más, el anterior es el padre
+    url, slug = page.get('url'), page.get('slug')
+    if not isinstance(url, str) or not isinstance(slug, str):
+        return
+    if not url.startswith('/'):
+        errors.append(f"$.url: debe empezar por / ({url!r})")
+    segments = url.strip('/').split('/')
+    if segments[-1] != slug:
+        errors.append(f"$.url: {url!r} no termina en el slug {slug!r}")
+    elif len(segments) > 1 and segments[-2] != page.get('parent_slug'):
+        errors.append(f"$.url: {url!r} no cuelga de parent_slug {page.get('parent_slug')!r}")
+
+
+def summary(page):
+    # Lo necesario para las comprobaciones cruzadas (se guarda en el manifiesto)
+    if not isinstance(page, dict):
+        return None
+    def text(field):
+        value = page.get(field)
+        return value if isinstance(value, str) else None
+
+    siblings = page.get('siblings_intents')
+    return {
+        'slug': text('slug'),
+        'parent_slug': text('parent_slug'),
+        'url': text('url'),
+        'search_intent': text('search_intent'),
+        'title': text('hero_tituloPrincipal'),
+        'siblings_intents': [s for s in siblings if isinstance(s, str)] if isinstance(siblings, list) else [],
+    }
+
+
+def validate_page(page, check=None):
+    errors = []
+    (check or compile_schema(PAGE_SCHEMA))(page, '$', errors)
+    if isinstance(page, dict):
+        check_url(page, errors)
+    return errors
+
+
+def validate_files(paths):
+    # Devuelve [(ruta, errores, resumen)]; el esquema se compila una vez por bloque
+    check = compile_schema(PAGE_SCHEMA)
+    results = []
+    for path in paths:
+        try:
+            with span('parse'), open(path, 'r', encoding='utf-8') as f:
+                page = json.load(f)
+        except ValueError as e:
+            results.append((path, [f"JSON no válido: {e}"], None))
+            continue
+        with span('schema'):
+            errors = validate_page(page, check)
+        count('pages_validated')
+        results.append((path, errors, summary(page)))
+    return results
+
+
+def validate_parallel(paths, jobs):
+    if jobs <= 1 or len(paths) < PARALLEL_MIN:
+        return validate_files(paths)
+    size = max(1, len(paths) // (jobs * 4))
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(collect, validate_files, paths[start:start + size])
+                   for start in range(0, len(paths), size)]
+        for future in futures:
+            result, timings = future.result()
+            merge(timings)
+            results.extend(result)
+    return results
+
+
+def key(text):
+    # "Tazas Cerámica" / "tazas-ceramica" -> "tazas-ceramica"
+    # Como fold(), pero sin recorrer carácter a carácter: tras NFKD las tildes
+    # son caracteres aparte y se quedan fuera al pasar a ASCII
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return KEY_RE.sub('-', text.lower()).strip('-')
+
+
+def load_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def reference_targets(summaries, sitemap=None, category_index=None, definitions=()):
+    # (padres conocidos, claves a las que puede apuntar siblings_intents)
+    parents = set()
+    siblings = set()
+
+    def add_sibling(text):
+        if isinstance(text, str) and text:
+            target = key(text)
+            siblings.add(target)
+            siblings.add(SUFFIX_RE.sub('', target))
+
+    for page in summaries:
+        parents.add(page['slug'])
+        for text in (page['slug'], page['search_intent'], page['title']):
+            add_sibling(text)
+    for entry in sitemap or []:
+        parents.add(entry.get('slug'))
+        for text in (entry.get('slug'), entry.get('search_intent'), entry.get('anchor')):
+            add_sibling(text)
+    for name in (category_index or {}).get('names', []):
+        add_sibling(name)
+    # Las verticales y sus grupos (tazas, botellas...) son padres aunque no tengan página propia
+    for definition in definitions:
+        parents.add(definition['prefix'])
+        parents.update(entry[2] for entry in definition['categories'])
+    parents.discard(None)
+    return parents, siblings
+
+
+def cross_check(summaries, parents, siblings):
+    # {nombre de archivo: [errores]}, {nombre de archivo: [avisos]}
+    errors, warnings = {}, {}
+    for filename, page in summaries.items():
+        parent = page['parent_slug']
+        if parent and parent not in parents:
+            errors.setdefault(filename, []).append(f"$.parent_slug: {parent!r} no existe")
+        for index, intent in enumerate(page['siblings_intents']):
+            target = key(intent)
+            if target not in siblings and SUFFIX_RE.sub('', target) not in siblings:
+                warnings.setdefault(filename, []).append(f"$.siblings_intents[{index}]: {intent!r} no existe")
+    return errors, warnings
+
+
+def load_manifest(fingerprint, input_dir):
+    manifest = load_json(MANIFEST_FILE, {})
+    if (manifest.get('version') != MANIFEST_VERSION or manifest.get('schema') != fingerprint
+            or manifest.get('input_dir') != input_dir):
+        return {}
+    return manifest.get('files', {})
+
+
+def save_manifest(files, fingerprint, input_dir):
+    manifest = {'version': MANIFEST_VERSION, 'schema': fingerprint, 'input_dir': input_dir,
+                'files': dict(sorted(files.items()))}
+    atomic_write(MANIFEST_FILE, json.dumps(manifest, ensure_ascii=False).encode('utf-8'))
+
+
+def source_state(path, entry):
+    # Tamaño + mtime como atajo; el hash solo se recalcula si han cambiado
+    st = os.stat(path)
+    if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+        digest = entry['sha256']
+    else:
+        digest = file_hash(path)
+    return {'sha256': digest, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def print_problems(label, problems, limit):
+    shown = 0
+    for filename in sorted(problems):
+        for message in problems[filename]:
+            if limit is None or shown < limit:
+                print(f"{label} {filename}: {message}")
+            shown += 1
+    if limit is not None and shown > limit:
+        print(f"... y {shown - limit} más")
+
+
+def validate(input_dir, jobs=1, force=False):
+    """Valida los JSON de `input_dir` y devuelve (errores, avisos, validadas, total).
+
+    Errores y avisos son {nombre de archivo: [mensajes]}. Solo se abren las
+    páginas que han cambiado desde la última vez; las comprobaciones cruzadas
+    se repiten siempre, con los resúmenes guardados en el manifiesto.
+    """
+    input_dir = os.path.abspath(input_dir)
+    fingerprint = schema_fingerprint()
+    files = {} if force else load_manifest(fingerprint, input_dir)
+
+    with span('scan'):
+        paths = sorted(glob.glob(os.path.join(input_dir, '*.json')))
+    names = {os.path.basename(path): path for path in paths}
+    files = {filename: entry for filename, entry in files.items() if filename in names}
+
+    pending = []
+    states = {}
+    for filename, path in names.items():
+        entry = files.get(filename)
+        state = source_state(path, entry)
+        if entry and entry['sha256'] == state['sha256']:
+            entry.update(state)
+            count('pages_skipped')
+            continue
+        states[path] = state
+        pending.append(path)
+
+    for path, errors, page in validate_parallel(pending, jobs):
+        files[os.path.basename(path)] = dict(states[path], errors=errors, page=page)
+
+    with span('cross_check'):
+        summaries = {filename: entry['page'] for filename, entry in files.items() if entry['page']}
+        parents, siblings = reference_targets(summaries.values(), load_json(data_dir('seo-sitemap.json'), []),
+                                              load_json(category_index_file(), {}), load_definitions())
+        reference_errors, warnings = cross_check(summaries, parents, siblings)
+    save_manifest(files, fingerprint, input_dir)
+
+    errors = {filename: entry['errors'] + reference_errors.get(filename, [])
+              for filename, entry in files.items() if entry['errors'] or filename in reference_errors}
+    return errors, warnings, len(pending), len(files)
+
+
+def generate(args):
+    errors, warnings, validated, total = validate(args.input_dir or categories_dir(), args.jobs, args.force)
+    if args.strict:
+        for filename, messages in warnings.items():
+            errors.setdefault(filename, []).extend(messages)
+        warnings = {}
+    print_problems('Error', errors, None)
+    print_problems('Aviso', warnings, None if args.verbose else args.max_warnings)
+
+    total_errors = sum(len(messages) for messages in errors.values())
+    total_warnings = sum(len(messages) for messages in warnings.values())
+    print(f"{total} páginas ({validated} validadas, {total - validated} sin cambios): "
+          f"{total_errors} errores, {total_warnings} avisos")
+    if total_errors:
+        raise SystemExit(f"Error: {len(errors)} páginas no superan la validación")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Valida los JSON de categorías contra el esquema de SeoCategoryData')
+    parser.add_argument('--input-dir', default=None, help='Directorio de los JSON (por defecto, categories/)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help=f"Número de procesos (solo con {PARALLEL_MIN} páginas pendientes o más)")
+    parser.add_argument('--force', action='store_true', help='Revalida todas las páginas, ignorando el manifiesto')
+    parser.add_argument('--strict', action='store_true',
+                        help='Trata como errores los siblings_intents que no corresponden a ninguna categoría')
+    parser.add_argument('--max-warnings', type=int, default=20, help='Avisos a mostrar (por defecto 20)')
+    parser.add_argument('--verbose', action='store_true', help='Muestra todos los avisos')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    with profiling('validate_category_pages', args.profile):
+        generate(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,507 @@
+import argparse
+import ctypes
+import ctypes.util
+import glob
+import json
+import os
+import select
+import struct
+import sys
+import time
+
+from category_bundles import bundles_client_pages, write_bundles
+from category_routes import RouteCollisionError, check_routes, write_redirect_table, write_route_table
+from generate_category_pages import DEFINITIONS_DIR, definition_redirects, render_pages, with_related_siblings
+from generate_json import INPUT_FILE, build_structures, parse_lines
+from incremental_output import IncrementalWriter, atomic_write, print_report
+from project_paths import categories_dir, data_dir, project_path
+from validate_category_pages import validate
+
+# Modo watch: vigila las fuentes y regenera solo las salidas que dependen del
+# archivo que ha cambiado (una página de categoría, las renditions de una imagen).
+#   seo-data.json               -> categories/<clave>.json de las entradas modificadas
+#   categorias.txt              -> seo-sitemap.json + dynamic-blocks.json
+#   category_pages/<vertical>   -> las páginas que cambian (siblings_intents depende de todas)
+#   client/public/images/<img>  -> <img>-{mobile,tablet,desktop}.{ext,webp}
+# Cuando cambian páginas se reempaquetan los bundles de sus secciones y se validan
+# (solo las modificadas, ver validate_category_pages.py).
+# Al arrancar solo se sincronizan las imágenes del manifiesto y KEY_IMAGES; con
+# --all-images se recorre todo client/public/images.
+# Usa inotify en Linux (vía ctypes, sin dependencias) y si no, sondeo por mtime.
+
+POLL_INTERVAL = 0.25
+# Los editores guardan en varios pasos: se agrupan los eventos de esta ventana
+DEBOUNCE = 0.05
+
+
+def walk(directory, recursive):
+    if recursive:
+        yield from os.walk(directory)
+    else:
+        names = os.listdir(directory)
+        yield directory, [], [n for n in names if os.path.isfile(os.path.join(directory, n))]
+
+
+class PollingWatcher:
+    # directories: [(directorio, recursivo)]
+    def __init__(self, directories, interval=POLL_INTERVAL):
+        self.directories = directories
+        self.interval = interval
+        self.state = self._scan()
+
+    def _scan(self):
+        state = {}
+        for directory, recursive in self.directories:
+            for root, dirs, files in walk(directory, recursive):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    state[path] = (st.st_size, st.st_mtime_ns)
+        return state
+
+    def wait(self):
+        while True:
+            time.sleep(self.interval)
+            state = self._scan()
+            changed = {path for path in state.keys() | self.state.keys() if state.get(path) != self.state.get(path)}
+            self.state = state
+            if changed:
+                return changed
+
+
+class InotifyWatcher:
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, directories):
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        self.paths = {}
+        self.recursive = {}
+        for directory, recursive in directories:
+            for root, dirs, _ in walk(directory, recursive):
+                self._add(root, recursive)
+
+    def _add(self, directory, recursive):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch {directory}')
+        self.paths[wd] = directory
+        self.recursive[wd] = recursive
+
+    def _read(self):
+        changed = set()
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if wd not in self.paths:
+                continue
+            path = os.path.join(self.paths[wd], name)
+            if mask & self.IN_ISDIR:
+                if self.recursive[wd] and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    # Directorio nuevo: vigilarlo y tratar lo que ya tenga dentro como cambiado
+                    for root, _, files in os.walk(path):
+                        self._add(root, True)
+                        changed.update(os.path.join(root, f) for f in files)
+                continue
+            # IN_CREATE sin IN_CLOSE_WRITE es un archivo a medio escribir
+            if mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_DELETE):
+                changed.add(path)
+        return changed
+
+    def wait(self):
+        while True:
+            select.select([self.fd], [], [])
+            changed = self._read()
+            deadline = time.monotonic() + DEBOUNCE
+            while (remaining := deadline - time.monotonic()) > 0:
+                if select.select([self.fd], [], [], remaining)[0]:
+                    changed |= self._read()
+            if changed:
+                return changed
+
+
+def open_watcher(directories, polling=False):
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError) as e:
+            print(f"inotify no disponible ({e}), se usa sondeo")
+    return PollingWatcher(directories)
+
+
+def is_temporary(path):
+    # Temporales de atomic_write y de los editores (.foo.tmp, foo~, .foo.swp)
+    name = os.path.basename(path)
+    return name.startswith('.') or name.endswith(('~', '.tmp', '.swp'))
+
+
+class SeoDataTarget:
+    """seo-data.json -> categories/<clave>.json (mismo productor que split_seo_data.py)."""
+
+    def __init__(self, source, pages_dir):
+        self.source = os.path.abspath(source)
+        self.pages_dir = pages_dir
+        self.entries = {}
+
+    def inputs(self):
+        return [self.source]
+
+    def outputs(self):
+        return {self.source: [f"{slug}.json" for slug in self.entries]}
+
+    def update(self, changed_paths, initial=False):
+        try:
+            with open(self.source, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            # Guardado a medias o JSON inválido mientras se edita: se espera al siguiente
+            print(f"seo-data.json no es JSON válido: {e}")
+            return None
+
+        changed = {slug: content for slug, content in entries.items()
+                   if initial or self.entries.get(slug) != content}
+        removed = [slug for slug in self.entries if slug not in entries]
+
+        check_routes(self.pages_dir, [(slug, c.get('url', '')) for slug, c in changed.items() if c.get('url')],
+                     'seo-data')
+        writer = IncrementalWriter('seo-data', self.pages_dir)
+        for slug, content in changed.items():
+            writer.write_json(f"{slug}.json", content, indent=2)
+        for slug in removed:
+            writer.delete(f"{slug}.json")
+        self.entries = entries
+        return writer.finish(prune=initial)
+
+
+class CategoriasTarget:
+    """categorias.txt -> seo-sitemap.json + dynamic-blocks.json (como generate_json.py)."""
+
+    def __init__(self, source, seo_sitemap_file, dynamic_blocks_file):
+        self.source = os.path.abspath(source)
+        self.files = [seo_sitemap_file, dynamic_blocks_file]
+
+    def inputs(self):
+        return [self.source]
+
+    def outputs(self):
+        return {self.source: list(self.files)}
+
+    def update(self, changed_paths, initial=False):
+        if not os.path.exists(self.source):
+            return None
+        with open(self.source, 'r') as f:
+            structures = build_structures(parse_lines(f))
+        report = {'written': [], 'skipped': [], 'deleted': []}
+        for path, data in zip(self.files, structures):
+            text = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+            try:
+                with open(path, 'rb') as f:
+                    unchanged = f.read() == text
+            except OSError:
+                unchanged = False
+            if unchanged:
+                report['skipped'].append(path)
+            else:
+                atomic_write(path, text)
+                report['written'].append(path)
+        return report
+
+
+class DefinitionsTarget:
+    """category_pages/*.json -> las páginas de categoría (como generate_category_pages.py)."""
+
+    def __init__(self, definitions_dir, pages_dir):
+        self.definitions_dir = os.path.abspath(definitions_dir)
+        self.pages_dir = pages_dir
+        self.rendered = {}
+
+    def inputs(self):
+        return [self.definitions_dir]
+
+    def outputs(self):
+        return {path: sorted(pages) for path, pages in self.rendered.items()}
+
+    def _load(self):
+        definitions = {}
+        invalid = set()
+        for path in sorted(glob.glob(os.path.join(self.definitions_dir, '*.json'))):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    definitions[path] = json.load(f)
+            except ValueError as e:
+                print(f"{os.path.basename(path)}: definición no válida ({e})")
+                invalid.add(path)
+        return definitions, invalid
+
+    def update(self, changed_paths, initial=False):
+        # siblings_intents sale de las páginas más parecidas de todas las verticales
+        # (como generate_category_pages.py por defecto): se renderizan todas y solo
+        # se escriben las páginas que cambian
+        definitions, invalid = self._load()
+        try:
+            definitions = dict(zip(definitions, with_related_siblings(list(definitions.values()))))
+        except (KeyError, TypeError, IndexError) as e:
+            print(f"Definiciones no válidas ({e})")
+            return None
+        changed = {}
+        removed = []
+        rendered = {}
+        for path in set(self.rendered) - set(definitions) - invalid:
+            removed.extend(self.rendered[path])
+            rendered[path] = None
+        for path, definition in definitions.items():
+            previous = self.rendered.get(path, {})
+            try:
+                pages = {filename: (url, text) for filename, url, text in render_pages([definition])}
+            except (ValueError, KeyError, TypeError, IndexError) as e:
+                print(f"{os.path.basename(path)}: definición no válida ({e})")
+                continue
+            changed.update({f: page for f, page in pages.items() if initial or previous.get(f) != page})
+            removed.extend(f for f in previous if f not in pages)
+            rendered[path] = pages
+
+        check_routes(self.pages_dir, [(os.path.splitext(f)[0], url) for f, (url, _) in changed.items()],
+                     'category-pages')
+        writer = IncrementalWriter('category-pages', self.pages_dir)
+        for filename, (_, text) in changed.items():
+            writer.write_text(filename, text)
+        for filename in removed:
+            writer.delete(filename)
+        for path, pages in rendered.items():
+            if pages is None:
+                self.rendered.pop(path, None)
+            else:
+                self.rendered[path] = pages
+        report = writer.finish(prune=initial)
+        try:
+            redirects = write_redirect_table(definition_redirects(definitions.values()), self.pages_dir)
+        except RouteCollisionError as e:
+            print(e)
+        else:
+            if redirects['written']:
+                print("Redirecciones:")
+                print_report(redirects)
+        return report
+
+
+class ImagesTarget:
+    """client/public/images/<img> -> sus renditions y marcadores (como generate_responsive_images.py)."""
+
+    def __init__(self, images_dir, srcset_manifest, placeholders_file, low_memory=False, all_images=False):
+        # PIL solo se importa si se vigilan imágenes
+        import generate_responsive_images as images
+        self.images = images
+        self.input_dir = os.path.abspath(images_dir)
+        self.srcset_manifest = srcset_manifest
+        self.placeholders_file = placeholders_file
+        self.low_memory = low_memory
+        self.all_images = all_images
+        self.settings = images.settings_key()
+        self.manifest = images.load_manifest(self.input_dir, self.input_dir)
+
+    def inputs(self):
+        return [self.input_dir]
+
+    def outputs(self):
+        return {entry['source']: entry['outputs'] for entry in self.manifest.values()}
+
+    def _relpath(self, path):
+        rel_path = os.path.relpath(path, self.input_dir).replace(os.sep, '/')
+        if rel_path.startswith('..') or self.images.is_rendition(rel_path):
+            return None
+        if not any(rel_path.lower().endswith(ext[1:]) for ext in self.images.DEFAULT_INCLUDE):
+            return None
+        return rel_path
+
+    def update(self, changed_paths, initial=False):
+        images = self.images
+        if initial and self.all_images:
+            rel_paths = images.discover_images(self.input_dir, images.DEFAULT_INCLUDE, images.DEFAULT_EXCLUDE)
+        elif initial:
+            rel_paths = sorted(set(images.KEY_IMAGES) | set(self.manifest))
+        else:
+            rel_paths = sorted({r for r in map(self._relpath, changed_paths) if r})
+        report = {'written': [], 'skipped': [], 'deleted': images.prune_deleted(self.manifest, self.input_dir)}
+
+        for rel_path in rel_paths:
+            full_path = os.path.join(self.input_dir, rel_path)
+            if not os.path.exists(full_path):
+                continue
+            entry = self.manifest.get(rel_path)
+            state = images.source_state(full_path, entry)
+            if images.is_fresh(entry, state, self.settings, self.input_dir):
+                entry.update(state)
+                report['skipped'].append(rel_path)
+                continue
+            _, info, error = images.process_image(rel_path, self.input_dir, self.input_dir, self.low_memory)
+            if error:
+                print(f"Error processing {rel_path}: {error}")
+                continue
+            generated = [item['file'] for item in info['renditions']]
+            for name in set((entry or {}).get('outputs', [])) - set(generated):
+                path = os.path.join(self.input_dir, name)
+                if os.path.exists(path):
+                    os.unlink(path)
+                    report['deleted'].append(name)
+            report['written'].extend(generated)
+            self.manifest[rel_path] = dict(state, source=full_path, settings=self.settings, outputs=generated, **info)
+
+        if report['written'] or report['deleted']:
+            images.save_manifest(self.manifest, self.input_dir, self.input_dir)
+            srcset = images.build_srcset_manifest(self.manifest, self.input_dir, images.PUBLIC_PREFIX)
+            atomic_write(self.srcset_manifest, json.dumps(srcset, indent=2, ensure_ascii=False).encode('utf-8'))
+            images.write_placeholders(self.manifest, self.placeholders_file, images.PUBLIC_PREFIX)
+        return report
+
+
+def dependency_map(targets):
+    # {entrada: [salidas]} de todos los destinos
+    deps = {}
+    for target in targets:
+        deps.update(target.outputs())
+    return deps
+
+
+def target_for(path, targets):
+    for target in targets:
+        for source in target.inputs():
+            if path == source or path.startswith(source + os.sep):
+                return target
+    return None
+
+
+def run_update(target, paths, initial=False):
+    name = type(target).__name__.replace('Target', '')
+    start = time.perf_counter()
+    try:
+        report = target.update(paths, initial)
+    except RouteCollisionError as e:
+        print(f"{name}: {e}")
+        return None
+    if report is None:
+        return None
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{name} ({elapsed:.0f} ms):")
+    print_report(report)
+    return report
+
+
+def changed_pages(target, report):
+    # Páginas de categoría escritas o borradas por una actualización
+    if report is None or not isinstance(target, (SeoDataTarget, DefinitionsTarget)):
+        return []
+    return report['written'] + report['deleted']
+
+
+def refresh_pages(pages_dir, changed):
+    write_route_table(pages_dir)
+    if bundles_client_pages(pages_dir):
+        print("Bundles:")
+        print_report(write_bundles(pages_dir, changed=changed))
+
+
+def report_validation(pages_dir):
+    start = time.perf_counter()
+    errors, warnings, validated, _ = validate(pages_dir)
+    elapsed = (time.perf_counter() - start) * 1000
+    for filename in sorted(errors):
+        for message in errors[filename]:
+            print(f"  Error {filename}: {message}")
+    print(f"Validación ({elapsed:.0f} ms): {validated} páginas, {len(errors)} con errores, "
+          f"{sum(len(m) for m in warnings.values())} avisos")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenera solo las salidas afectadas cuando cambia una fuente')
+    parser.add_argument('--seo-data', default=data_dir('seo-data.json'))
+    parser.add_argument('--categorias', default=INPUT_FILE, help='categorias.txt (se omite si no existe)')
+    parser.add_argument('--definitions-dir', default=DEFINITIONS_DIR)
+    parser.add_argument('--images-dir', default=project_path('client', 'public', 'images'))
+    parser.add_argument('--pages-dir', default=None)
+    parser.add_argument('--no-images', action='store_true', help='No vigilar client/public/images')
+    parser.add_argument('--all-images', action='store_true',
+                        help='Al arrancar, procesa todas las imágenes y no solo las del manifiesto y KEY_IMAGES')
+    parser.add_argument('--low-memory', action='store_true', help='Ver generate_responsive_images.py')
+    parser.add_argument('--polling', action='store_true', help='Usar sondeo por mtime aunque haya inotify')
+    parser.add_argument('--print-deps', action='store_true', help='Muestra el mapa entrada -> salidas y termina')
+    args = parser.parse_args()
+
+    pages_dir = args.pages_dir or categories_dir()
+    data = os.path.dirname(os.path.abspath(pages_dir))
+    targets = [
+        SeoDataTarget(args.seo_data, pages_dir),
+        DefinitionsTarget(args.definitions_dir, pages_dir),
+    ]
+    if os.path.exists(args.categorias):
+        targets.append(CategoriasTarget(args.categorias, os.path.join(data, 'seo-sitemap.json'),
+                                        os.path.join(data, 'dynamic-blocks.json')))
+    if not args.no_images and os.path.isdir(args.images_dir):
+        try:
+            targets.append(ImagesTarget(args.images_dir, os.path.join(data, 'responsive-images.json'),
+                                        os.path.join(data, 'image-placeholders.json'), args.low_memory,
+                                        args.all_images))
+        except ImportError as e:
+            print(f"Sin imágenes: {e}")
+
+    # Sincronización inicial (solo escribe lo que no está al día) y mapa de dependencias
+    pages_changed = []
+    for target in targets:
+        pages_changed += changed_pages(target, run_update(target, [], initial=True))
+    if pages_changed:
+        refresh_pages(pages_dir, pages_changed)
+    report_validation(pages_dir)
+
+    deps = dependency_map(targets)
+    if args.print_deps:
+        for source, outputs in sorted(deps.items()):
+            print(f"{source}: {', '.join(outputs)}")
+        return
+    print(f"{len(deps)} entradas, {sum(len(o) for o in deps.values())} salidas")
+
+    # Los archivos sueltos se vigilan por su directorio (sin recursión), porque los
+    # editores suelen guardar con renombrado atómico
+    directories = sorted({(p, True) if os.path.isdir(p) else (os.path.dirname(p), False)
+                          for target in targets for p in target.inputs()})
+    watcher = open_watcher(directories, args.polling)
+    print(f"Vigilando {', '.join(d for d, _ in directories)} ({type(watcher).__name__}). Ctrl+C para salir.")
+    try:
+        while True:
+            changed = {os.path.abspath(p) for p in watcher.wait() if not is_temporary(p)}
+            by_target = {}
+            for path in changed:
+                target = target_for(path, targets)
+                if target is not None:
+                    by_target.setdefault(target, set()).add(path)
+            pages_changed = []
+            for target, paths in by_target.items():
+                pages_changed += changed_pages(target, run_update(target, paths))
+            if pages_changed:
+                refresh_pages(pages_dir, pages_changed)
+                report_validation(pages_dir)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import { appRouter } from "../routers";
 import { createContext } from "./context";
 import { serveStatic, setupVite } from "./vite";
 import merchantFeedRouter from "../routes/merchantFeed";
+import categoryRedirectsRouter from "../routes/categoryRedirects";
 
 function isPortAvailable(port: number): Promise<boolean> {
   return new Promise(resolve => {
@@ -46,6 +47,8 @@ async function startServer() {
       createContext,
     })
   );
+  // URLs antiguas de categorías duplicadas -> página canónica
+  app.use(categoryRedirectsRouter);
   // development mode uses Vite, production mode uses static files
   if (process.env.NODE_ENV === "development") {
     await setupVite(app, server);
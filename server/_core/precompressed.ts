@@ -0,0 +1,54 @@
+import type { NextFunction, Request, Response } from "express";
+import fs from "node:fs";
+import path from "node:path";
+
+/**
+ * Sirve las variantes .br / .gz generadas por scripts/precompress.py en vez
+ * de comprimir en cada petición. Solo se usa una variante si es al menos tan
+ * reciente como el original (si no, está desactualizada y se sirve el original).
+ */
+const ENCODINGS: Array<[encoding: string, extension: string]> = [
+  ["br", ".br"],
+  ["gzip", ".gz"],
+];
+
+function acceptsEncoding(header: string, encoding: string): boolean {
+  return header.split(",").some(part => {
+    const [name, ...params] = part.trim().split(";");
+    if (name.trim() !== encoding) return false;
+    const q = params.map(p => p.trim()).find(p => p.startsWith("q="));
+    return !q || Number(q.slice(2)) > 0;
+  });
+}
+
+export function servePrecompressed(root: string) {
+  const base = path.resolve(root);
+  return (req: Request, res: Response, next: NextFunction) => {
+    if ((req.method !== "GET" && req.method !== "HEAD") || req.path.endsWith("/")) return next();
+    const accepted = String(req.headers["accept-encoding"] ?? "");
+    if (!accepted) return next();
+
+    let file: string;
+    try {
+      file = path.join(base, decodeURIComponent(req.path));
+    } catch {
+      return next();
+    }
+    if (!file.startsWith(base + path.sep)) return next();
+
+    const source = fs.statSync(file, { throwIfNoEntry: false });
+    if (!source?.isFile()) return next();
+    for (const [encoding, extension] of ENCODINGS) {
+      if (!acceptsEncoding(accepted, encoding)) continue;
+      const variant = fs.statSync(file + extension, { throwIfNoEntry: false });
+      if (!variant?.isFile() || variant.mtimeMs < source.mtimeMs) continue;
+      res.setHeader("Content-Encoding", encoding);
+      res.setHeader("Vary", "Accept-Encoding");
+      // El tipo es el del original, no application/gzip
+      res.type(path.extname(file));
+      return res.sendFile(file + extension, err => err && next(err));
+    }
+    res.setHeader("Vary", "Accept-Encoding");
+    next();
+  };
+}
@@ -5,6 +5,7 @@ import { nanoid } from "nanoid";
 import path from "path";
 import { createServer as createViteServer } from "vite";
 import viteConfig from "../../vite.config";
+import { servePrecompressed } from "./precompressed";
 
 export async function setupVite(app: Express, server: Server) {
   const serverOptions = {
@@ -58,6 +59,7 @@ export function serveStatic(app: Express) {
     );
   }
 
+  app.use(servePrecompressed(distPath));
   app.use(express.static(distPath));
 
   // fall through to index.html if the file doesn't exist
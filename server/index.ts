@@ -2,6 +2,7 @@ import express from "express";
 import { createServer } from "http";
 import path from "path";
 import { fileURLToPath } from "url";
+import { servePrecompressed } from "./_core/precompressed";
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -16,6 +17,8 @@ async function startServer() {
       ? path.resolve(__dirname, "public")
       : path.resolve(__dirname, "..", "dist", "public");
 
+  // Variantes .br/.gz de scripts/precompress.py antes que el original
+  app.use(servePrecompressed(staticPath));
   app.use(express.static(staticPath));
 
   // Handle client-side routing - serve index.html for all routes
@@ -0,0 +1,24 @@
+/**
+ * Redirecciones 301 de las URLs de categorías que duplicaban una página existente
+ * (client/src/data/category-redirects.json, generado por scripts/generate_category_pages.py).
+ * El cliente hace lo mismo con <Redirect>; aquí los buscadores reciben el 301.
+ */
+
+import { Router } from 'express';
+import rawRedirects from '../../client/src/data/category-redirects.json';
+
+const redirects = rawRedirects as Record<string, string>;
+
+const router = Router();
+
+router.get('*', (req, res, next) => {
+  const route = '/' + req.path.replace(/^\/+|\/+$/g, '');
+  const target = redirects[route];
+  if (!target) {
+    return next();
+  }
+  const query = req.originalUrl.indexOf('?');
+  res.redirect(301, query === -1 ? target : target + req.originalUrl.slice(query));
+});
+
+export default router;
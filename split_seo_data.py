@@ -1,28 +1,63 @@
+import argparse
 import json
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from category_bundles import bundles_client_pages, write_bundles
+from category_routes import check_routes, write_route_table
+from incremental_output import IncrementalWriter, print_report, save_report
+from instrumentation import add_profile_argument, profiling, span
+from project_paths import categories_dir, data_dir
 
 # Paths
-source_file = '/home/ubuntu/impacto33-mvp/client/src/data/seo-data.json'
-output_dir = '/home/ubuntu/impacto33-mvp/client/src/data/categories'
+source_file = data_dir('seo-data.json')
+output_dir = categories_dir()
+
+parser = argparse.ArgumentParser(description='Split seo-data.json into one JSON file per category')
+parser.add_argument('--source', default=source_file, help='seo-data.json to split')
+parser.add_argument('--output-dir', default=output_dir, help='Directory for the per-category JSON files')
+parser.add_argument('--report', help='Write the written/skipped/deleted report as JSON')
+parser.add_argument('--verbose', action='store_true', help='Also list unchanged files')
+parser.add_argument('--bundle', action='store_true', help='Also pack the pages into section bundles when writing outside the client categories dir')
+add_profile_argument(parser)
+args = parser.parse_args()
+source_file = args.source
+output_dir = args.output_dir
+
+with profiling('split_seo_data', args.profile):
+    # Read source file
+    try:
+        with span('parse'), open(source_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        print(f"Found {len(data)} categories in seo-data.json")
+
+        # Fail before writing if two pages would end up on the same route
+        check_routes(output_dir, [(slug, content.get('url', '')) for slug, content in data.items() if content.get('url')],
+                     'seo-data')
 
-# Ensure output directory exists
-os.makedirs(output_dir, exist_ok=True)
+        # Write individual files (only the ones whose content changed)
+        writer = IncrementalWriter('seo-data', output_dir)
+        for slug, content in data.items():
+            writer.write_json(f"{slug}.json", content, indent=2)
 
-# Read source file
-try:
-    with open(source_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+        report = writer.finish()
+        print_report(report, verbose=args.verbose)
+        if args.report:
+            save_report(report, args.report)
 
-    print(f"Found {len(data)} categories in seo-data.json")
+        print("Route table:")
+        print_report(write_route_table(output_dir), verbose=args.verbose)
 
-    # Write individual files
-    for slug, content in data.items():
-        output_path = os.path.join(output_dir, f"{slug}.json")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(content, f, indent=2, ensure_ascii=False)
-        print(f"Created {output_path}")
+        # The client reads pages from the bundles, so keep them in step
+        if args.bundle or bundles_client_pages(output_dir):
+            print("Section bundles:")
+            print_report(write_bundles(output_dir), verbose=args.verbose)
 
-    print("Splitting complete.")
+        print("Splitting complete.")
 
-except Exception as e:
-    print(f"Error: {e}")
+    except Exception as e:
+        # Exit non-zero so the pipeline does not run later stages on stale pages
+        sys.exit(f"Error: {e}")